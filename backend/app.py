@@ -3,12 +3,31 @@ from flask import Flask
 from env import load_dotenv
 load_dotenv()
 
+from config import Env
 from middlewares.authorize import Authorize
+from middlewares.access_log import RequestLog, label_request
+from middlewares.metrics import Metrics, label_endpoint
+from middlewares.tracing import Tracing, name_root_span
+from middlewares.profiling import Profiling
+from utils.codec import FastJSONProvider
+from utils.log import setup_logging
 from routes.auth import auth_blueprint
 from routes.projects import projects_blueprint
 
+setup_logging()
+
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 app.wsgi_app = Authorize(app.wsgi_app)
+app.before_request(label_request)
+app.wsgi_app = RequestLog(app.wsgi_app)
+app.before_request(name_root_span)
+app.wsgi_app = Tracing(app.wsgi_app)
+if Env.PROFILING_TOKEN or Env.PROFILING_SAMPLE_RATE > 0:
+    app.wsgi_app = Profiling(app.wsgi_app)
+if Env.METRICS_ENABLED:
+    app.before_request(label_endpoint)
+    app.wsgi_app = Metrics(app.wsgi_app)
 
 app.register_blueprint(auth_blueprint, url_prefix="/api/v1/auth")
 app.register_blueprint(projects_blueprint, url_prefix="/api/v1/projects")
@@ -0,0 +1,41 @@
+from quart import Quart
+
+from env import load_dotenv
+load_dotenv()
+
+from config import Env
+from db import AsyncDatabase
+from middlewares.authorize import AsyncAuthorize
+from middlewares.access_log import AsyncRequestLog, label_async_request
+from middlewares.metrics import AsyncMetrics, label_async_endpoint
+from middlewares.tracing import AsyncTracing, name_async_root_span
+from middlewares.profiling import AsyncProfiling
+from utils.codec import FastJSONProvider
+from utils.log import setup_logging
+from routes.async_auth import async_auth_blueprint
+from routes.async_projects import async_projects_blueprint
+
+setup_logging()
+
+app = Quart(__name__)
+app.json = FastJSONProvider(app)
+app.asgi_app = AsyncAuthorize(app.asgi_app)
+app.before_request(label_async_request)
+app.asgi_app = AsyncRequestLog(app.asgi_app)
+app.before_request(name_async_root_span)
+app.asgi_app = AsyncTracing(app.asgi_app)
+if Env.PROFILING_TOKEN or Env.PROFILING_SAMPLE_RATE > 0:
+    app.asgi_app = AsyncProfiling(app.asgi_app)
+if Env.METRICS_ENABLED:
+    app.before_request(label_async_endpoint)
+    app.asgi_app = AsyncMetrics(app.asgi_app)
+
+app.register_blueprint(async_auth_blueprint, url_prefix="/api/v1/auth")
+app.register_blueprint(async_projects_blueprint, url_prefix="/api/v1/projects")
+
+@app.after_serving
+async def dispose_engine():
+    await AsyncDatabase.dispose()
+
+if __name__=='__main__':
+    app.run(port=8000, debug=True)
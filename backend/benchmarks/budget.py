@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+from sqlalchemy import event, insert
+
+from models import User
+from services.access import membership_cache
+from utils.token import TOKEN_NAME, generate_token
+from benchmarks.dataset import Dataset
+from benchmarks.load import AppClient
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+class QueryRecorder:
+    """
+        Records the statements sent through an engine inside a with block, an executemany is recorded once
+        like it is sent on the wire
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+def check_budget(name: str, statements, budget: int):
+    """
+        Raises QueryBudgetExceeded listing every statement when more than `budget` were sent
+    """
+
+    if len(statements) > budget:
+        listing = "\n".join(f"  {i}. {' '.join(statement.split())}" for i, statement in enumerate(statements, start=1))
+        raise QueryBudgetExceeded(f"{name} sent {len(statements)} statements, its budget is {budget}:\n{listing}")
+
+@dataclass
+class Budget:
+    """
+        Most statements one request to `endpoint` may send, whatever the size of the project. `path(dataset)`
+        and `body(dataset)` build the request, `setup(dataset, engine)` prepares what it needs unmeasured.
+        Requests are sent by the owner of the project, or by a user who isn't a member yet when `joiner` is set
+    """
+
+    endpoint: str
+    method: str
+    path: Callable[[Dataset], str]
+    statements: int
+    body: Optional[Callable[[Dataset], dict]] = None
+    setup: Optional[Callable[[Dataset, object], None]] = None
+    joiner: bool = False
+
+PROJECTS = "/api/v1/projects"
+JOINER_ID = "BUDGET_JOINER"
+
+def _add_joiner(dataset: Dataset, engine):
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{"id": JOINER_ID, "name": "joiner", "email": "joiner@budget.local", "password_hash": "-"}])
+
+def _bulk_operations(dataset: Dataset):
+    task_ids, members = dataset.task_ids, dataset.member_ids
+    return {"operations": [
+        {"op": "create", "name": "bulk", "assignee": dataset.owner_id, "status": "To Do"},
+        {"op": "edit", "task_id": task_ids[0], "name": "bulk edit"},
+        {"op": "assign", "task_id": task_ids[1 % len(task_ids)], "assignee": members[0] if members else dataset.owner_id},
+        {"op": "status", "task_id": task_ids[2 % len(task_ids)], "status": "Completed"},
+    ]}
+
+# requests run in this order on one dataset, the ones deleting rows come last
+BUDGETS = [
+    Budget("auth.get-me", "GET", lambda d: "/api/v1/auth/me", 0),
+    Budget("projects.list-projects", "GET", lambda d: f"{PROJECTS}/", 1),
+    Budget("projects.get-project", "GET", lambda d: f"{PROJECTS}/{d.project_id}", 3),
+    Budget("projects.get-project-members", "GET", lambda d: f"{PROJECTS}/{d.project_id}/members", 2),
+    Budget("projects.get-project-summary", "GET", lambda d: f"{PROJECTS}/{d.project_id}/summary", 3),
+    Budget("projects.list-project-tasks", "GET", lambda d: f"{PROJECTS}/{d.project_id}/tasks/", 2),
+    Budget("projects.list-project-task-changes", "GET", lambda d: f"{PROJECTS}/{d.project_id}/tasks/changes", 3),
+    Budget("projects.get-task", "GET", lambda d: f"{PROJECTS}/{d.project_id}/tasks/{d.task_ids[0]}", 2),
+    Budget("projects.create-project", "POST", lambda d: f"{PROJECTS}/", 4,
+           body=lambda d: {"name": "budget", "description": "", "deadline": "2030-01-01T00:00:00"}),
+    Budget("projects.join-project", "POST", lambda d: f"{PROJECTS}/join/code/{d.project_code}", 3, setup=_add_joiner, joiner=True),
+    Budget("projects.create-project-task", "POST", lambda d: f"{PROJECTS}/{d.project_id}/tasks/", 5,
+           body=lambda d: {"name": "budget", "description": "", "assignee": d.owner_id, "status": "To Do"}),
+    Budget("projects.edit-project-task", "PUT", lambda d: f"{PROJECTS}/{d.project_id}/tasks/{d.task_ids[0]}", 3,
+           body=lambda d: {"name": "edited", "description": ""}),
+    Budget("projects.change-task-status", "PUT", lambda d: f"{PROJECTS}/{d.project_id}/tasks/{d.task_ids[0]}/status", 5,
+           body=lambda d: {"status": "In Progress"}),
+    Budget("projects.change-task-assignee", "PUT", lambda d: f"{PROJECTS}/{d.project_id}/tasks/{d.task_ids[0]}/assign", 5,
+           body=lambda d: {"assignee": d.member_ids[0] if d.member_ids else d.owner_id}),
+    Budget("projects.bulk-project-tasks", "POST", lambda d: f"{PROJECTS}/{d.project_id}/tasks/bulk", 9, body=_bulk_operations),
+    Budget("projects.delete-project-task", "DELETE", lambda d: f"{PROJECTS}/{d.project_id}/tasks/{d.task_ids[-1]}", 6),
+    Budget("projects.delete-project", "DELETE", lambda d: f"{PROJECTS}/{d.project_id}", 6),
+]
+
+@dataclass
+class Measurement:
+    endpoint: str
+    status: int
+    statements: list
+    budget: int
+
+def _cookie(user_id: str, email: str):
+    # signed like the login route does, so measuring doesn't wait on bcrypt
+    return f"{TOKEN_NAME}={generate_token({'id': user_id, 'email': email, 'name': user_id})}"
+
+def measure(app, dataset: Dataset, engine, budgets=BUDGETS):
+    """
+        Sends every budgeted request once with the test client and records its statements. The membership
+        cache is cleared first so every request is measured as if it were the first one of its user
+    """
+
+    client = AppClient(app)
+    owner, joiner = _cookie(dataset.owner_id, dataset.owner_email), _cookie(JOINER_ID, "joiner@budget.local")
+
+    measurements = []
+    for budget in budgets:
+        if budget.setup:
+            budget.setup(dataset, engine)
+
+        membership_cache.clear()
+        with QueryRecorder(engine) as recorder:
+            reply = client.request(budget.method, budget.path(dataset), budget.body(dataset) if budget.body else None,
+                                   cookie=joiner if budget.joiner else owner)
+        measurements.append(Measurement(budget.endpoint, reply.status, recorder.statements, budget.statements))
+
+    return measurements
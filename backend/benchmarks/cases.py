@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+from sqlalchemy import insert
+
+from models import User
+from models.project import TaskStatus
+from services.auth import AuthService
+from services.project import ProjectService
+from validation.payload import BulkTaskOperation
+from benchmarks.dataset import Dataset, PASSWORD, STATUSES
+
+BULK_OPERATIONS = 50
+
+@dataclass
+class Case:
+    """
+        One service call to time. `run(i)` is the measured call of iteration `i`, `setup(i)` prepares
+        what it needs outside of the measurement
+    """
+
+    name: str
+    run: Callable[[int], object]
+    setup: Optional[Callable[[int], None]] = None
+
+def project_cases(dataset: Dataset, engine):
+    service = ProjectService()
+    owner, project_id = dataset.owner_id, dataset.project_id
+    members = [owner] + dataset.member_ids
+    task_ids = dataset.task_ids
+    _, second_page = service.get_tasks(project_id=project_id, user_id=owner)
+    extra = {}
+
+    def add_joining_user(i: int):
+        user_id = f"JOINER_{i:06}"
+        with engine.begin() as connection:
+            connection.execute(insert(User), [{"id": user_id, "name": "joiner", "email": f"joiner{i}@benchmark.local", "password_hash": "-"}])
+        extra["joiner"] = user_id
+
+    def add_task(i: int):
+        extra["task"] = service.create_task(name=f"to delete {i}", description="", assignee=owner, status=TaskStatus.ToDo,
+                                            project_id=project_id, user_id=owner)["id"]
+
+    def add_project(i: int):
+        extra["project"] = service.create_projects(name=f"to delete {i}", description="", deadline=datetime(2030, 1, 1), user_id=owner)["id"]
+
+    def add_bulk_operations(i: int):
+        operations = []
+        for n in range(BULK_OPERATIONS):
+            task_id = task_ids[(i * BULK_OPERATIONS + n) % len(task_ids)]
+            if n % 5 == 0:
+                operations.append(BulkTaskOperation(op="create", name=f"bulk {i} {n}", assignee=members[n % len(members)], status=TaskStatus.ToDo))
+            elif n % 5 == 1:
+                operations.append(BulkTaskOperation(op="edit", task_id=task_id, name=f"bulk edit {i}"))
+            elif n % 5 == 2:
+                operations.append(BulkTaskOperation(op="assign", task_id=task_id, assignee=members[(i + n) % len(members)]))
+            else:
+                operations.append(BulkTaskOperation(op="status", task_id=task_id, status=STATUSES[(i + n) % len(STATUSES)]))
+        extra["operations"] = operations
+
+    return [
+        Case("ProjectService.list_projects", lambda i: service.list_projects(user_id=owner)),
+        Case("ProjectService.get_version", lambda i: service.get_version(project_id=project_id, user_id=owner)),
+        Case("ProjectService.get_project", lambda i: service.get_project(project_id=project_id, user_id=owner)),
+        Case("ProjectService.get_tasks", lambda i: service.get_tasks(project_id=project_id, user_id=owner)),
+        Case("ProjectService.get_tasks (next page)", lambda i: service.get_tasks(project_id=project_id, user_id=owner, cursor=second_page)),
+        Case("ProjectService.get_changes", lambda i: service.get_changes(project_id=project_id, user_id=owner)),
+        Case("ProjectService.get_members", lambda i: service.get_members(project_id=project_id, user_id=owner)),
+        Case("ProjectService.get_summary", lambda i: service.get_summary(project_id=project_id, user_id=owner)),
+        Case("ProjectService.get_task", lambda i: service.get_task(task_id=task_ids[i % len(task_ids)], project_id=project_id, user_id=owner)),
+        Case("ProjectService.create_projects", lambda i: service.create_projects(name=f"benchmark {i}", description="",
+                                                                                 deadline=datetime(2030, 1, 1), user_id=owner)),
+        Case("ProjectService.join_project", lambda i: service.join_project(project_code=dataset.project_code, user_id=extra["joiner"]),
+             setup=add_joining_user),
+        Case("ProjectService.create_task", lambda i: service.create_task(name=f"benchmark {i}", description="", assignee=members[i % len(members)],
+                                                                         status=TaskStatus.ToDo, project_id=project_id, user_id=owner)),
+        Case("ProjectService.edit_task", lambda i: service.edit_task(task_id=task_ids[i % len(task_ids)], name=f"edited {i}", description="",
+                                                                     project_id=project_id, user_id=owner)),
+        Case("ProjectService.change_status", lambda i: service.change_status(task_id=task_ids[i % len(task_ids)], status=STATUSES[i % len(STATUSES)],
+                                                                             project_id=project_id, user_id=owner)),
+        Case("ProjectService.change_assignee", lambda i: service.change_assignee(task_id=task_ids[i % len(task_ids)], assignee=members[i % len(members)],
+                                                                                 project_id=project_id, user_id=owner)),
+        Case("ProjectService.bulk_tasks", lambda i: service.bulk_tasks(operations=extra["operations"], project_id=project_id, user_id=owner),
+             setup=add_bulk_operations),
+        Case("ProjectService.delete_task", lambda i: service.delete_task(task_id=extra["task"], project_id=project_id, user_id=owner),
+             setup=add_task),
+        Case("ProjectService.delete_project", lambda i: service.delete_project(project_id=extra["project"], user_id=owner),
+             setup=add_project),
+    ]
+
+def auth_cases(dataset: Dataset):
+    service = AuthService()
+
+    return [
+        Case("AuthService.register", lambda i: service.register(username=f"registered {i}", email=f"registered{i}@benchmark.local", password=PASSWORD)),
+        Case("AuthService.login", lambda i: service.login(email=dataset.owner_email, password=PASSWORD)),
+    ]
\ No newline at end of file
@@ -0,0 +1,113 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.pool import StaticPool
+
+from models import Base, User, Project, Membership, Task, TaskCounter
+from models.membership import Role
+from models.project import TaskStatus
+from migrations import migrate
+from utils.password import hash_password
+
+PASSWORD = "benchmark-password"
+STATUSES = list(TaskStatus)
+BATCH_SIZE = 5000
+
+@dataclass
+class DatasetSize:
+    users: int = 100
+    projects: int = 10
+    members: int = 20
+    tasks: int = 1000
+
+@dataclass
+class Dataset:
+    """
+        Ids of the seeded rows the benchmark cases work on, `project_id` is owned by `owner_id`
+        and has `members` members and `tasks` tasks
+    """
+
+    size: DatasetSize
+    owner_id: str = ""
+    owner_email: str = ""
+    project_id: str = ""
+    project_code: str = ""
+    member_ids: List[str] = field(default_factory=list)
+    task_ids: List[str] = field(default_factory=list)
+
+def create_database(url: str):
+    """
+        Engine for the benchmark database with the schema in place. An in-memory SQLite database is
+        the embedded stand-in, anything else must be an empty database the migrations can build
+    """
+
+    if url.startswith("sqlite"):
+        engine = create_engine(url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(engine)
+    else:
+        engine = create_engine(url)
+        migrate(engine)
+
+    with engine.connect() as connection:
+        if connection.execute(select(func.count()).select_from(User)).scalar_one():
+            raise ValueError("Benchmarks need an empty database, the one given already has users")
+
+    return engine
+
+def _insert(connection, table, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        connection.execute(insert(table), rows[start:start + BATCH_SIZE])
+
+def seed(engine, size: DatasetSize):
+    """
+        Inserts `size.users` users and `size.projects` projects, every project gets an owner, `size.members`
+        members and `size.tasks` tasks spread over its members and statuses. One password hash is shared
+        by every user so seeding doesn't spend minutes in bcrypt
+    """
+
+    if size.projects < 1 or size.tasks < 1:
+        raise ValueError("'projects' and 'tasks' must be greater than 0")
+    if size.users < size.members + 1:
+        raise ValueError("Every project needs an owner and its members, 'users' must be greater than 'members'")
+
+    password_hash = hash_password(PASSWORD)
+    created_at = datetime(2025, 1, 1)
+    users = [{"id": f"USER_{i:06}", "name": f"user {i}", "email": f"user{i}@benchmark.local",
+              "password_hash": password_hash, "created_at": created_at} for i in range(size.users)]
+
+    projects, memberships, tasks, counters = [], [], [], []
+    for p in range(size.projects):
+        project_id = f"PROJECT_{p:06}"
+        projects.append({"id": project_id, "name": f"project {p}", "description": "", "deadline": created_at + timedelta(days=365),
+                         "created_at": created_at + timedelta(seconds=p), "code": f"B{p:05}", "version": 1})
+
+        member_ids = [users[(p + m) % size.users]["id"] for m in range(size.members + 1)]
+        for m, user_id in enumerate(member_ids):
+            memberships.append({"user_id": user_id, "project_id": project_id, "role": Role.Owner if m == 0 else Role.Member,
+                                "created_at": created_at + timedelta(seconds=m)})
+
+        counts = Counter()
+        for t in range(size.tasks):
+            assignee, status = member_ids[t % len(member_ids)], STATUSES[t % len(STATUSES)]
+            tasks.append({"id": f"TASK_{p:06}_{t:07}", "name": f"task {t}", "description": "", "assignee": assignee, "status": status,
+                          "project_id": project_id, "created_at": created_at + timedelta(seconds=t), "updated_at": created_at, "version": 0})
+            counts[(assignee, status)] += 1
+        counters.extend({"project_id": project_id, "assignee": assignee, "status": status, "count": count}
+                        for (assignee, status), count in counts.items())
+
+    with engine.begin() as connection:
+        _insert(connection, User, users)
+        _insert(connection, Project, projects)
+        _insert(connection, Membership, memberships)
+        _insert(connection, Task, tasks)
+        _insert(connection, TaskCounter, counters)
+
+    return Dataset(size=size,
+                   owner_id=users[0]["id"],
+                   owner_email=users[0]["email"],
+                   project_id=projects[0]["id"],
+                   project_code=projects[0]["code"],
+                   member_ids=[user["id"] for user in users[1:size.members + 1]],
+                   task_ids=[task["id"] for task in tasks[:size.tasks]])
\ No newline at end of file
@@ -0,0 +1,267 @@
+import http.client, json, random, threading, time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from benchmarks.runner import percentile
+from utils.token import TOKEN_NAME
+
+DEFAULT_MIX = {
+    "login": 1,
+    "list_projects": 4,
+    "get_project": 4,
+    "get_members": 2,
+    "create_task": 1,
+    "change_status": 2,
+}
+STATUSES = ["To Do", "In Progress", "Completed"]
+
+class Reply:
+    def __init__(self, status: int, body: bytes, cookies: dict):
+        self.status = status
+        self.body = body
+        self.cookies = cookies
+
+    def json(self):
+        return json.loads(self.body)
+
+def _cookies(set_cookie_headers):
+    cookies = {}
+    for header in set_cookie_headers:
+        name, _, value = header.split(";", 1)[0].partition("=")
+        cookies[name.strip()] = value.strip()
+    return cookies
+
+class AppClient:
+    """
+        Calls the Flask app in this process through its test client, the whole WSGI stack runs
+        including the Authorize middleware
+    """
+
+    def __init__(self, app):
+        self.client = app.test_client(use_cookies=False)
+
+    def request(self, method: str, path: str, body=None, cookie: str = ""):
+        headers = {"Cookie": cookie} if cookie else {}
+        response = self.client.open(path, method=method, data=json.dumps(body) if body is not None else None,
+                                    content_type="application/json", headers=headers)
+        return Reply(response.status_code, response.get_data(), _cookies(response.headers.getlist("Set-Cookie")))
+
+class HttpClient:
+    """
+        Calls a running server over one keep-alive connection, one client per virtual user
+    """
+
+    def __init__(self, base_url: str):
+        url = urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.connection = None
+
+    def request(self, method: str, path: str, body=None, cookie: str = ""):
+        headers = {"Content-Type": "application/json"}
+        if cookie:
+            headers["Cookie"] = cookie
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            try:
+                self.connection.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+                response = self.connection.getresponse()
+                return Reply(response.status, response.read(), _cookies(response.headers.get_all("Set-Cookie") or []))
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # the server closed an idle keep-alive connection, reconnect once
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+
+class Recorder:
+    """
+        Latencies and errors per endpoint of one virtual user, merged after the run so
+        the threads never share a lock while measuring
+    """
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, name: str, elapsed: float, ok: bool):
+        self.latencies[name].append(elapsed)
+        if not ok:
+            self.errors[name] += 1
+
+    def merge(self, other):
+        for name, latencies in other.latencies.items():
+            self.latencies[name].extend(latencies)
+        for name, errors in other.errors.items():
+            self.errors[name] += errors
+
+class VirtualUser:
+    """
+        One signed in user running the traffic mix against a project it owns, the access token is
+        held as a cookie like a browser would
+    """
+
+    def __init__(self, client, email: str, password: str, rng: random.Random):
+        self.client = client
+        self.email = email
+        self.password = password
+        self.rng = rng
+        self.cookie = ""
+        self.project_id = None
+        self.members = []
+        self.tasks = []
+        self.recorder = Recorder()
+
+    def call(self, name: str, method: str, path: str, body=None, ok=(200, 201)):
+        start = time.perf_counter()
+        try:
+            reply = self.client.request(method, path, body=body, cookie=self.cookie)
+        except Exception:
+            self.recorder.record(name, (time.perf_counter() - start) * 1000, ok=False)
+            return None
+
+        self.recorder.record(name, (time.perf_counter() - start) * 1000, ok=reply.status in ok)
+        if reply.status == 401 and name != "login":
+            # the access token expired during a long run
+            self.login()
+        return reply if reply.status in ok else None
+
+    def login(self):
+        reply = self.call("login", "POST", "/api/v1/auth/login", {"email": self.email, "password": self.password})
+        if reply is None or TOKEN_NAME not in reply.cookies:
+            return False
+        self.cookie = f"{TOKEN_NAME}={reply.cookies[TOKEN_NAME]}"
+        return True
+
+    def setup(self):
+        """
+            Signs in and picks the first project the user owns, False when it owns none
+        """
+
+        if not self.login():
+            return False
+        reply = self.call("list_projects", "GET", "/api/v1/projects/?limit=200")
+        owned = [project for project in (reply.json()["data"] if reply else []) if project["role"] == "Owner"]
+        if not owned:
+            return False
+
+        self.project_id = owned[0]["id"]
+        members = self.call("get_members", "GET", f"/api/v1/projects/{self.project_id}/members?limit=200")
+        tasks = self.call("list_tasks", "GET", f"/api/v1/projects/{self.project_id}/tasks/?limit=200")
+        self.members = [member["user_id"] for member in members.json()["members"]] if members else []
+        self.tasks = [task["id"] for task in tasks.json()["tasks"]] if tasks else []
+        self.recorder = Recorder()
+        return bool(self.members)
+
+    def list_projects(self):
+        self.call("list_projects", "GET", "/api/v1/projects/")
+
+    def get_project(self):
+        self.call("get_project", "GET", f"/api/v1/projects/{self.project_id}")
+
+    def get_members(self):
+        self.call("get_members", "GET", f"/api/v1/projects/{self.project_id}/members")
+
+    def create_task(self):
+        reply = self.call("create_task", "POST", f"/api/v1/projects/{self.project_id}/tasks/", {
+            "name": f"load test {self.rng.randrange(1 << 30)}",
+            "description": "",
+            "assignee": self.rng.choice(self.members),
+            "status": "To Do",
+        })
+        if reply is not None:
+            self.tasks.append(reply.json()["task"]["id"])
+
+    def change_status(self):
+        if not self.tasks:
+            return self.create_task()
+        task_id = self.rng.choice(self.tasks)
+        self.call("change_status", "PUT", f"/api/v1/projects/{self.project_id}/tasks/{task_id}/status", {"status": self.rng.choice(STATUSES)})
+
+    def run(self, mix: dict, deadline: float):
+        operations = [getattr(self, name) for name in mix]
+        weights = list(mix.values())
+        while time.perf_counter() < deadline:
+            self.rng.choices(operations, weights)[0]()
+
+def parse_mix(text: str):
+    """
+        'login=1,get_project=4' into {'login': 1, 'get_project': 4}, names are the VirtualUser operations
+    """
+
+    if not text:
+        return dict(DEFAULT_MIX)
+
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation '{name}' in the traffic mix, use {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+def run_stage(make_client, accounts, concurrency: int, duration: float, mix: dict, seed: int):
+    """
+        Runs `concurrency` virtual users for `duration` seconds once all of them are set up, returns the
+        merged recorder and the measured wall time. Accounts that own no project are skipped
+    """
+
+    users, lock = [], threading.Lock()
+    candidates = iter(accounts)
+
+    def prepare(index: int):
+        while True:
+            with lock:
+                account = next(candidates, None)
+            if account is None:
+                return
+            user = VirtualUser(make_client(), *account, rng=random.Random(f"{seed}:{index}"))
+            if user.setup():
+                with lock:
+                    users.append(user)
+                return
+
+    threads = [threading.Thread(target=prepare, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if len(users) < concurrency:
+        raise ValueError(f"Only {len(users)} of {concurrency} virtual users found an account owning a project")
+
+    start = time.perf_counter()
+    deadline = start + duration
+    threads = [threading.Thread(target=user.run, args=(mix, deadline)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    recorder = Recorder()
+    for user in users:
+        recorder.merge(user.recorder)
+    return recorder, elapsed
+
+def format_stage(recorder: Recorder, elapsed: float, concurrency: int):
+    lines = [f"{concurrency} virtual users for {elapsed:.1f}s, latency in ms",
+             f"{'endpoint':<16} {'requests':>9} {'errors':>7} {'error %':>8} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9}"]
+    rows = [(name, recorder.latencies[name], recorder.errors[name]) for name in sorted(recorder.latencies)]
+    rows.append(("total", [latency for _, latencies, _ in rows for latency in latencies], sum(errors for _, _, errors in rows)))
+    for name, latencies, errors in rows:
+        if not latencies:
+            continue
+        lines.append(f"{name:<16} {len(latencies):>9} {errors:>7} {errors / len(latencies):>8.2%} {len(latencies) / elapsed:>9.1f} "
+                     f"{percentile(latencies, 0.50):>9.2f} {percentile(latencies, 0.95):>9.2f} {percentile(latencies, 0.99):>9.2f}")
+    return "\n".join(lines)
+
+def stage_summary(recorder: Recorder, elapsed: float):
+    """
+        Throughput in requests per second, error rate and p95 latency of all the requests of a stage
+    """
+
+    latencies = [latency for values in recorder.latencies.values() for latency in values]
+    if not latencies:
+        return 0.0, 0.0, 0.0
+    return len(latencies) / elapsed, sum(recorder.errors.values()) / len(latencies), percentile(latencies, 0.95)
\ No newline at end of file
@@ -0,0 +1,204 @@
+import csv, enum, io, random
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+
+from models import User, Project, Membership, Task, TaskCounter
+from models.membership import Role
+from models.project import TaskStatus
+
+STATUS_WEIGHTS = {TaskStatus.ToDo: 4, TaskStatus.InProgress: 2, TaskStatus.Completed: 4}
+START = datetime(2024, 1, 1)
+SPAN = timedelta(days=365)
+
+@dataclass
+class Population:
+    """
+        Shape of a generated dataset. Project sizes follow a Pareto distribution with shape `alpha`,
+        a lower alpha gives a longer tail of huge projects. Users join projects with a power-law
+        popularity, a few users are members almost everywhere and most join one or two projects
+    """
+
+    users: int
+    projects: int
+    memberships: int
+    tasks: int
+    alpha: float = 1.16
+    seed: int = 0
+
+    def __post_init__(self):
+        if min(self.users, self.projects) < 1:
+            raise ValueError("'users' and 'projects' must be greater than 0")
+        if self.memberships < self.projects:
+            raise ValueError("Every project needs an owner, 'memberships' can't be less than 'projects'")
+
+    def rng(self, *scope):
+        # every project draws from its own generator, so a pass over memberships and a later pass
+        # over tasks see the same members without keeping them in memory
+        return random.Random(":".join(str(part) for part in (self.seed, *scope)))
+
+    def prefix(self):
+        return f"S{self.seed}"
+
+    def user_id(self, index: int):
+        return f"USER_{self.prefix()}_{index:08}"
+
+    def project_id(self, index: int):
+        return f"PROJECT_{self.prefix()}_{index:07}"
+
+    def shares(self, total: int, minimum: int):
+        """
+            Splits `total` over the projects in proportion to Pareto distributed weights, every project
+            gets at least `minimum`. The weights are the same for every total so the projects with the
+            most tasks also have the most members, largest remainders keep the sum exact
+        """
+
+        rng = self.rng("shares")
+        weights = [rng.paretovariate(self.alpha) for _ in range(self.projects)]
+        spare = max(total - minimum * self.projects, 0)
+        scale = spare / sum(weights)
+        exact = [weight * scale for weight in weights]
+        shares = [int(value) for value in exact]
+        by_remainder = sorted(range(self.projects), key=lambda p: exact[p] - shares[p], reverse=True)
+        for p in by_remainder[:spare - sum(shares)]:
+            shares[p] += 1
+        return [minimum + share for share in shares]
+
+    def members(self, project: int, count: int):
+        """
+            User indexes of a project, the owner first. Low indexes are the popular users
+        """
+
+        count = min(count, self.users)
+        rng = self.rng("members", project)
+        members = [rng.randrange(self.users)]
+        chosen = set(members)
+        attempts = 0
+        while len(members) < count and attempts < count * 4:
+            attempts += 1
+            index = int(self.users * rng.random() ** 3)
+            if index not in chosen:
+                chosen.add(index)
+                members.append(index)
+
+        # a project with most of the users as members, fill it from a random offset
+        offset = rng.randrange(self.users)
+        while len(members) < count:
+            if offset not in chosen:
+                chosen.add(offset)
+                members.append(offset)
+            offset = (offset + 1) % self.users
+        return members
+
+def _timestamp(rng: random.Random):
+    return START + timedelta(seconds=rng.randrange(int(SPAN.total_seconds())))
+
+def user_rows(population: Population, password_hash: str):
+    rng = population.rng("users")
+    for u in range(population.users):
+        yield (population.user_id(u), f"user {u}", f"user{u}.{population.prefix().lower()}@seed.local", password_hash, _timestamp(rng))
+
+def project_rows(population: Population):
+    rng = population.rng("projects")
+    for p in range(population.projects):
+        created_at = _timestamp(rng)
+        yield (population.project_id(p), f"project {p}", "", created_at + SPAN, created_at, f"{population.prefix()}P{p}", 1)
+
+def membership_rows(population: Population, member_counts):
+    for p, count in enumerate(member_counts):
+        rng = population.rng("joined", p)
+        for m, user in enumerate(population.members(p, count)):
+            yield (population.user_id(user), population.project_id(p), Role.Owner if m == 0 else Role.Member, _timestamp(rng))
+
+def task_rows(population: Population, member_counts, task_counts, counters: list):
+    """
+        Tasks of every project, assignees lean towards the first members. The matching task counter
+        rows are appended to `counters` as each project is finished
+    """
+
+    statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    for p, (member_count, task_count) in enumerate(zip(member_counts, task_counts)):
+        rng = population.rng("tasks", p)
+        project_id = population.project_id(p)
+        members = [population.user_id(user) for user in population.members(p, member_count)]
+        counts = Counter()
+        for t in range(task_count):
+            assignee = members[int(len(members) * rng.random() ** 2)]
+            status = rng.choices(statuses, weights)[0]
+            created_at = _timestamp(rng)
+            counts[(assignee, status)] += 1
+            yield (f"TASK_{population.prefix()}_{p:07}_{t:07}", f"task {t}", "", created_at, assignee, status, created_at, 0, project_id)
+        counters.extend((project_id, assignee, status, count) for (assignee, status), count in counts.items())
+
+TABLES = {
+    "users": (User, ("id", "name", "email", "password_hash", "created_at")),
+    "projects": (Project, ("id", "name", "description", "deadline", "created_at", "code", "version")),
+    "memberships": (Membership, ("user_id", "project_id", "role", "created_at")),
+    "tasks": (Task, ("id", "name", "description", "created_at", "assignee", "status", "updated_at", "version", "project_id")),
+    "task_counters": (TaskCounter, ("project_id", "assignee", "status", "count")),
+}
+
+def _csv_value(value):
+    # enum columns store the member name, see the types created by migration 0001
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+class CopyWriter:
+    """
+        Streams rows into PostgreSQL with COPY, `batch_size` rows are buffered as CSV per round trip
+    """
+
+    def __init__(self, connection, batch_size: int):
+        self.connection = connection
+        self.batch_size = batch_size
+
+    def write(self, table: str, rows):
+        _, columns = TABLES[table]
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+        rows = iter(rows)
+        written = 0
+        with self.connection.cursor() as cursor:
+            while True:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                batch = 0
+                for row in rows:
+                    writer.writerow([_csv_value(value) for value in row])
+                    batch += 1
+                    if batch == self.batch_size:
+                        break
+                if not batch:
+                    return written
+
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+                written += batch
+
+class InsertWriter:
+    """
+        Multi-row executemany inserts for databases without COPY, such as SQLite
+    """
+
+    def __init__(self, connection, batch_size: int):
+        self.connection = connection
+        self.batch_size = batch_size
+
+    def write(self, table: str, rows):
+        model, columns = TABLES[table]
+        statement = insert(model)
+        written = 0
+        batch = []
+        for row in rows:
+            batch.append(dict(zip(columns, row)))
+            if len(batch) == self.batch_size:
+                self.connection.execute(statement, batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            self.connection.execute(statement, batch)
+            written += len(batch)
+        return written
\ No newline at end of file
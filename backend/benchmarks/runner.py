@@ -0,0 +1,108 @@
+import json, statistics, time
+from dataclasses import dataclass, asdict
+from sqlalchemy import event
+
+@dataclass
+class Result:
+    name: str
+    iterations: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    statements: int
+
+class StatementCounter:
+    """
+        Counts the statements sent through an engine, an executemany counts once like it does on the wire
+    """
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+def percentile(samples, fraction: float):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def run_case(case, counter: StatementCounter, iterations: int, warmup: int):
+    """
+        Times `iterations` calls of a case after `warmup` untimed ones, latencies are in milliseconds
+        and `statements` is the median number of statements of one call
+    """
+
+    latencies, statements = [], []
+    for i in range(warmup + iterations):
+        if case.setup:
+            case.setup(i)
+
+        before = counter.count
+        start = time.perf_counter()
+        case.run(i)
+        elapsed = (time.perf_counter() - start) * 1000
+        if i >= warmup:
+            latencies.append(elapsed)
+            statements.append(counter.count - before)
+
+    return Result(name=case.name,
+                  iterations=iterations,
+                  mean=statistics.fmean(latencies),
+                  p50=percentile(latencies, 0.50),
+                  p95=percentile(latencies, 0.95),
+                  p99=percentile(latencies, 0.99),
+                  max=max(latencies),
+                  statements=int(statistics.median(statements)))
+
+def format_results(results):
+    lines = [f"{'case':<40} {'n':>5} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'stmts':>6}"]
+    for result in results:
+        lines.append(f"{result.name:<40} {result.iterations:>5} {result.mean:>9.3f} {result.p50:>9.3f} {result.p95:>9.3f} "
+                     f"{result.p99:>9.3f} {result.max:>9.3f} {result.statements:>6}")
+    return "\n".join(lines)
+
+def save_baseline(path: str, results, dialect: str, size):
+    with open(path, "w") as file:
+        json.dump({
+            "dialect": dialect,
+            "dataset": asdict(size),
+            "results": {result.name: asdict(result) for result in results}
+        }, file, indent=2)
+
+def load_baseline(path: str):
+    with open(path) as file:
+        return json.load(file)
+
+def check_baseline(baseline: dict, dialect: str, size):
+    if baseline["dialect"] != dialect or baseline["dataset"] != asdict(size):
+        raise ValueError(f"Baseline was recorded on {baseline['dialect']} with {baseline['dataset']}, "
+                         f"it can't be compared to a run on {dialect} with {asdict(size)}")
+
+def compare(results, baseline: dict, threshold: float):
+    """
+        Lines describing every case against the baseline and whether any of them regressed. A case regresses
+        when its p50 grew by more than `threshold` (0.2 is 20%) or when it sends more statements than before
+    """
+
+    lines, regressed = [], False
+    for result in results:
+        before = baseline["results"].get(result.name)
+        if before is None:
+            lines.append(f"{result.name:<40} new")
+            continue
+
+        change = result.p50 / before["p50"] - 1 if before["p50"] else 0.0
+        status = "ok"
+        if change > threshold or result.statements > before["statements"]:
+            status = "REGRESSION"
+            regressed = True
+        elif change < -threshold or result.statements < before["statements"]:
+            status = "improved"
+
+        lines.append(f"{result.name:<40} p50 {before['p50']:>9.3f} -> {result.p50:>9.3f} ({change:+.1%}) "
+                     f"stmts {before['statements']:>3} -> {result.statements:>3}  {status}")
+
+    return lines, regressed
\ No newline at end of file
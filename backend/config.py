@@ -7,4 +7,57 @@ class Env:
     DB_USER = os.environ['DB_USER']
     DB_PORT = os.environ['DB_PORT']
     DB_PASS = os.environ['DB_PASS']
-    DB_NAME = os.environ['DB_NAME']
\ No newline at end of file
+    DB_NAME = os.environ['DB_NAME']
+
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+    MEMBERSHIP_CACHE_SIZE = int(os.environ.get('MEMBERSHIP_CACHE_SIZE', 10000))
+    MEMBERSHIP_CACHE_TTL = int(os.environ.get('MEMBERSHIP_CACHE_TTL', 60))
+
+    TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 10000))
+    TOKEN_CACHE_TTL = int(os.environ.get('TOKEN_CACHE_TTL', 300))
+
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+    BCRYPT_CONCURRENCY = int(os.environ.get('BCRYPT_CONCURRENCY', os.cpu_count() or 2))
+    BCRYPT_QUEUE_TIMEOUT = float(os.environ.get('BCRYPT_QUEUE_TIMEOUT', 2))
+
+    ACCESS_TOKEN_MINUTES = int(os.environ.get('ACCESS_TOKEN_MINUTES', 15))
+    REFRESH_TOKEN_DAYS = int(os.environ.get('REFRESH_TOKEN_DAYS', 7))
+
+    BULK_MAX_OPERATIONS = int(os.environ.get('BULK_MAX_OPERATIONS', 500))
+
+    EVENT_BROKER = os.environ.get('EVENT_BROKER', 'local')
+    EVENTS_QUEUE_SIZE = int(os.environ.get('EVENTS_QUEUE_SIZE', 100))
+    EVENTS_HEARTBEAT = float(os.environ.get('EVENTS_HEARTBEAT', 15))
+
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+    TRACING_SAMPLE_RATE = float(os.environ.get('TRACING_SAMPLE_RATE', 0))
+    TRACING_EXPORTER = os.environ.get('TRACING_EXPORTER', 'file')
+    TRACING_FILE = os.environ.get('TRACING_FILE', 'traces.jsonl')
+    TRACING_ENDPOINT = os.environ.get('TRACING_ENDPOINT', 'http://localhost:9411/api/v2/spans')
+    TRACING_SERVICE_NAME = os.environ.get('TRACING_SERVICE_NAME', 'collab-backend')
+    TRACING_QUEUE_SIZE = int(os.environ.get('TRACING_QUEUE_SIZE', 1000))
+
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 200))
+    SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG', 'slow_queries.jsonl')
+    SLOW_QUERY_LOG_BYTES = int(os.environ.get('SLOW_QUERY_LOG_BYTES', 10 * 1024 * 1024))
+    SLOW_QUERY_LOG_BACKUPS = int(os.environ.get('SLOW_QUERY_LOG_BACKUPS', 5))
+    SLOW_QUERY_EXPLAIN_RATE = float(os.environ.get('SLOW_QUERY_EXPLAIN_RATE', 0))
+
+    PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN', '')
+    PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0))
+    PROFILING_MODE = os.environ.get('PROFILING_MODE', 'sampling')
+    PROFILING_INTERVAL = float(os.environ.get('PROFILING_INTERVAL', 0.001))
+    PROFILING_DIR = os.environ.get('PROFILING_DIR', 'profiles')
+    PROFILING_KEEP = int(os.environ.get('PROFILING_KEEP', 200))
+
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+    LOG_DUPLICATE_WINDOW = float(os.environ.get('LOG_DUPLICATE_WINDOW', 10))
+    LOG_SUCCESS_SAMPLE_RATE = float(os.environ.get('LOG_SUCCESS_SAMPLE_RATE', 0))
\ No newline at end of file
@@ -1,13 +1,225 @@
-from sqlalchemy import create_engine
+import os, sys, json, random, logging, threading, time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from config import Env
+from utils.tracing import current_span
+
+logger = logging.getLogger(__name__)
 
 class Database:
+    """
+        Process wide engine and session factory, every service shares the same connection pool
+    """
+
+    _engine = None
+    _session = None
+    _lock = threading.Lock()
+
     def __init__(self):
-        engine_string = f"postgresql+psycopg2://{Env.DB_USER}:{Env.DB_PASS}@{Env.DB_HOST}:{Env.DB_PORT}/{Env.DB_NAME}"
-        self.engine = create_engine(engine_string)
+        if Database._engine is None:
+            with Database._lock:
+                if Database._engine is None:
+                    engine_string = f"postgresql+psycopg2://{Env.DB_USER}:{Env.DB_PASS}@{Env.DB_HOST}:{Env.DB_PORT}/{Env.DB_NAME}"
+                    Database._engine = create_engine(engine_string, 
+                                                     pool_size=Env.DB_POOL_SIZE, 
+                                                     max_overflow=Env.DB_MAX_OVERFLOW, 
+                                                     pool_recycle=Env.DB_POOL_RECYCLE, 
+                                                     pool_timeout=Env.DB_POOL_TIMEOUT, 
+                                                     pool_pre_ping=Env.DB_POOL_PRE_PING)
+                    Database._session = sessionmaker(Database._engine)
+                    log_slow_queries(Database._engine)
+
+        self.engine = Database._engine
     
     def get_session(self):
-        session = sessionmaker(self.engine)
-        return session
\ No newline at end of file
+        return Database._session
+
+    @classmethod
+    def use(cls, engine):
+        """
+            Points every service at `engine` instead of the one built from the DB_* settings,
+            used by scripts that run against a database of their own
+        """
+
+        with cls._lock:
+            cls._engine = engine
+            cls._session = sessionmaker(engine)
+            log_slow_queries(engine)
+
+    @classmethod
+    def dispose(cls, close=True):
+        if cls._engine is not None:
+            cls._engine.dispose(close=close)
+
+class AsyncDatabase:
+    """
+        Process wide async engine and session factory used by the ASGI app, same pool settings as Database
+    """
+
+    _engine = None
+    _session = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        if AsyncDatabase._engine is None:
+            with AsyncDatabase._lock:
+                if AsyncDatabase._engine is None:
+                    # imported here so the WSGI app doesn't need the async extras installed
+                    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+                    engine_string = f"postgresql+asyncpg://{Env.DB_USER}:{Env.DB_PASS}@{Env.DB_HOST}:{Env.DB_PORT}/{Env.DB_NAME}"
+                    AsyncDatabase._engine = create_async_engine(engine_string, 
+                                                                pool_size=Env.DB_POOL_SIZE, 
+                                                                max_overflow=Env.DB_MAX_OVERFLOW, 
+                                                                pool_recycle=Env.DB_POOL_RECYCLE, 
+                                                                pool_timeout=Env.DB_POOL_TIMEOUT, 
+                                                                pool_pre_ping=Env.DB_POOL_PRE_PING)
+                    # instances can't lazy load after commit in async code, so they are not expired
+                    AsyncDatabase._session = async_sessionmaker(AsyncDatabase._engine, expire_on_commit=False)
+                    log_slow_queries(AsyncDatabase._engine.sync_engine)
+
+        self.engine = AsyncDatabase._engine
+    
+    def get_session(self):
+        return AsyncDatabase._session
+
+    @classmethod
+    async def dispose(cls):
+        if cls._engine is not None:
+            await cls._engine.dispose()
+
+# bound values longer than this are cut in the slow query log
+MAX_PARAMETER = 200
+# parameters whose name contains one of these are never written to the log
+SECRET_PARAMETERS = ("password", "token", "secret")
+
+_slow_log = None
+_slow_log_lock = threading.Lock()
+
+def _slow_query_logger():
+    global _slow_log
+    if _slow_log is None:
+        with _slow_log_lock:
+            if _slow_log is None:
+                logger = logging.getLogger("collab.slow_queries")
+                logger.propagate = False
+                logger.setLevel(logging.INFO)
+                handler = RotatingFileHandler(Env.SLOW_QUERY_LOG, maxBytes=Env.SLOW_QUERY_LOG_BYTES, 
+                                              backupCount=Env.SLOW_QUERY_LOG_BACKUPS)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger.addHandler(handler)
+                _slow_log = logger
+    return _slow_log
+
+def _loggable(value):
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    value = str(value)
+    return value if len(value) <= MAX_PARAMETER else value[:MAX_PARAMETER] + "..."
+
+def _is_secret(name: str):
+    return any(secret in name.lower() for secret in SECRET_PARAMETERS)
+
+def _parameter_names(context):
+    # bind names in the order positional parameters (qmark, format, numeric) are sent, None when unknown
+    compiled = getattr(context, "compiled", None)
+    return getattr(compiled, "positiontup", None) if compiled is not None and compiled.positional else None
+
+def _loggable_parameters(parameters, names=None):
+    """
+        Bound values with the secret ones redacted, named parameters are checked by their key and positional
+        ones by the bind name at their position. Positional values that can't be named are left out
+    """
+
+    if isinstance(parameters, dict):
+        return {key: "<redacted>" if _is_secret(key) else _loggable(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if not parameters:
+            return []
+        if names is None or len(names) != len(parameters):
+            return None
+        return [("<redacted>" if _is_secret(name) else _loggable(value)) for name, value in zip(names, parameters)]
+    return None
+
+def _service_method():
+    # only walked for slow statements, the outermost frame of a services module is the method a view called
+    origin = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("services."):
+            origin = f"{module}.{frame.f_code.co_qualname}"
+        frame = frame.f_back
+    return origin
+
+def _explain(conn, statement, parameters):
+    # EXPLAIN ANALYZE runs the statement again, only reads are analyzed and writes get their estimated plan,
+    # the savepoint keeps a failing EXPLAIN from aborting the transaction of the request
+    analyze = "(ANALYZE, BUFFERS) " if statement.lstrip()[:6].upper() == "SELECT" else ""
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN {analyze}{statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return f"EXPLAIN failed: {e}"
+    finally:
+        cursor.close()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.slow_query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = (time.perf_counter() - context.slow_query_started) * 1000
+    if elapsed < Env.SLOW_QUERY_MS:
+        return
+
+    try:
+        entry = {
+            "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "duration_ms": round(elapsed, 3),
+            "statement": statement,
+            "parameters": None if executemany else _loggable_parameters(parameters, _parameter_names(context)),
+            "executemany": executemany,
+            "rows": cursor.rowcount,
+            "service": _service_method(),
+        }
+        span = current_span()
+        if span is not None:
+            entry["trace_id"] = span.trace.trace_id
+        if (not executemany and conn.dialect.name == "postgresql" 
+                and Env.SLOW_QUERY_EXPLAIN_RATE > 0 and random.random() < Env.SLOW_QUERY_EXPLAIN_RATE):
+            entry["plan"] = _explain(conn, statement, parameters)
+        _slow_query_logger().info(json.dumps(entry, default=str))
+    except Exception:
+        logger.exception("Writing the slow query log failed")
+
+def log_slow_queries(engine):
+    """
+        Writes every statement of the engine that takes SLOW_QUERY_MS or more to SLOW_QUERY_LOG with its
+        bound parameters, the service method that sent it and, for a SLOW_QUERY_EXPLAIN_RATE share of them
+        on PostgreSQL, its plan. A SLOW_QUERY_MS of 0 turns the log off
+    """
+
+    if Env.SLOW_QUERY_MS <= 0:
+        return
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def _dispose_after_fork():
+    # connections inherited from the parent process must not be used by the child,
+    # drop them from the pool without closing the parent's sockets
+    Database.dispose(close=False)
+    if AsyncDatabase._engine is not None:
+        AsyncDatabase._engine.sync_engine.dispose(close=False)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_after_fork)
@@ -4,4 +4,8 @@ class IncorrectPasswordError(Exception):
 
 class JWTError(Exception):
     def __init__(self, message: str):
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+class HashingOverloadError(Exception):
+    def __init__(self):
+        super().__init__("Too many password checks are in progress")
\ No newline at end of file
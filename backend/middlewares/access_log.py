@@ -0,0 +1,105 @@
+import logging, os, random, re, time
+from flask import request
+
+from config import Env
+from utils.log import RequestContext, bind_request, unbind_request, current_request
+
+logger = logging.getLogger("access")
+
+REQUEST_ID = re.compile(r"^[\w.-]{1,64}$")
+
+def label_request():
+    """
+        before_request hook of the Flask app, adds the matched view and the signed in user to the
+        log records of the request
+    """
+
+    context = current_request()
+    if context is not None:
+        context.endpoint = request.endpoint or "unmatched"
+        user = request.environ.get("user")
+        if user:
+            context.user_id = user.get("id")
+
+def _request_id(header: str):
+    return header if REQUEST_ID.match(header) else os.urandom(8).hex()
+
+class RequestLog:
+    """
+        Gives every request an id, taken from a well formed `X-Request-Id` header or generated, that is sent
+        back on the response and added to every record logged while it is served. Ends every request with
+        an access record: server errors are always logged, client errors at INFO and successful requests
+        only for a LOG_SUCCESS_SAMPLE_RATE share of them
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        request_id = _request_id(environ.get("HTTP_X_REQUEST_ID", ""))
+        context = RequestContext(request_id, environ.get("REQUEST_METHOD", ""), environ.get("PATH_INFO", ""))
+        token = bind_request(context)
+        status = []
+
+        def add_request_id(code, headers, exc_info=None):
+            status.append(int(code[:3]))
+            headers.append(("X-Request-Id", request_id))
+            return start_response(code, headers, exc_info)
+
+        try:
+            return self.app(environ, add_request_id)
+        finally:
+            self.log(context, status[0] if status else 500)
+            unbind_request(token)
+
+    def log(self, context: RequestContext, code: int):
+        latency_ms = round((time.perf_counter() - context.started) * 1000, 3)
+        fields = {"method": context.method, "path": context.path, "status": code, "latency_ms": latency_ms}
+        if code >= 500:
+            logger.error("request failed", extra=fields)
+        elif code >= 400:
+            logger.info("request rejected", extra=fields)
+        elif Env.LOG_SUCCESS_SAMPLE_RATE > 0 and random.random() < Env.LOG_SUCCESS_SAMPLE_RATE:
+            logger.info("request served", extra=fields)
+
+async def label_async_request():
+    """
+        before_request hook of the Quart app, same as label_request
+    """
+
+    # imported here so the WSGI app doesn't need the async extras installed
+    from quart import request as async_request
+
+    context = current_request()
+    if context is not None:
+        context.endpoint = async_request.endpoint or "unmatched"
+        user = async_request.scope.get("user")
+        if user:
+            context.user_id = user.get("id")
+
+class AsyncRequestLog(RequestLog):
+    """
+        ASGI version of the RequestLog middleware
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        header = next((value.decode('latin-1') for name, value in scope["headers"] if name == b"x-request-id"), "")
+        request_id = _request_id(header)
+        context = RequestContext(request_id, scope["method"], scope["path"])
+        token = bind_request(context)
+        status = []
+
+        async def add_request_id(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+                message = {**message, "headers": [*message.get("headers", []), (b"x-request-id", request_id.encode('latin-1'))]}
+            await send(message)
+
+        try:
+            return await self.app(scope, receive, add_request_id)
+        finally:
+            self.log(context, status[0] if status else 500)
+            unbind_request(token)
\ No newline at end of file
@@ -1,26 +1,32 @@
-import json
-from werkzeug.wrappers import Request, Response, ResponseStream
+import json, hashlib, time
+from werkzeug.http import parse_cookie
+from werkzeug.wrappers import Response
 
-from utils.token import validate_token
+from config import Env
+from utils.cache import LRUCache, publish_stats
+from utils.token import validate_token, TOKEN_NAME
+from utils.tracing import span
 from exceptions.auth import JWTError
 
+PUBLIC_ROUTES = ("/api/v1/auth/register", "/api/v1/auth/login", "/api/v1/auth/refresh")
+
 class Authorize:
     """
-        Middleware to authorize users by verifying the tokens
+        Middleware to authorize users by verifying the tokens, 
+        tokens that were verified once are kept (until they expire) so the next requests skip the signature check
     """
 
-    def __init__(self, app):
+    def __init__(self, app, public_routes=PUBLIC_ROUTES):
         self.app = app
+        self.public_routes = frozenset(public_routes)
+        self.token_cache = LRUCache(maxsize=Env.TOKEN_CACHE_SIZE, ttl=Env.TOKEN_CACHE_TTL)
+        publish_stats("token", self.token_cache)
     
     def __call__(self, environ, start_response):
-        request = Request(environ)
-        
-        public_apis = ["/auth/register", "/auth/login"]
-
-        if any([api in request.url for api in public_apis]):
+        if environ.get("PATH_INFO", "") in self.public_routes:
             return self.app(environ, start_response)
         
-        token = request.cookies.get("COLLAB_TOKEN", None)
+        token = parse_cookie(environ.get("HTTP_COOKIE", "")).get(TOKEN_NAME, None)
         if not token:
             res = Response(json.dumps({
                 "message": "Authorization failed", 
@@ -30,8 +36,7 @@ class Authorize:
             return res(environ, start_response)
         
         try:
-            payload = validate_token(token)
-            environ["user"] = payload
+            environ["user"] = self.verify(token)
             return self.app(environ, start_response)
         except JWTError as e:
             res = Response(json.dumps({
@@ -40,3 +45,58 @@ class Authorize:
                 "code": 401
             }), mimetype= 'application/json', status=401)
             return res(environ, start_response)
+
+    def verify(self, token: str):
+        with span("authorize"):
+            key = hashlib.sha256(token.encode('utf-8')).digest()
+            now = time.time()
+
+            cached = self.token_cache.get(key)
+            if cached is not None:
+                expires_at, payload = cached
+                if expires_at > now:
+                    return payload
+                self.token_cache.delete(key)
+
+            with span("jwt.validate"):
+                payload = validate_token(token)
+            expires_at = payload.get("exp", now)
+            if expires_at > now:
+                self.token_cache.set(key, (expires_at, payload), ttl=min(Env.TOKEN_CACHE_TTL, expires_at - now))
+            
+            return payload
+
+
+class AsyncAuthorize(Authorize):
+    """
+        ASGI version of the Authorize middleware, the verified payload is put in scope["user"]
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.public_routes:
+            return await self.app(scope, receive, send)
+        
+        cookie_header = "; ".join(value.decode('latin-1') for name, value in scope["headers"] if name == b"cookie")
+        token = parse_cookie(cookie_header).get(TOKEN_NAME, None)
+        if not token:
+            return await self.reject(send, "No valid token found in the request cookie")
+        
+        try:
+            scope["user"] = self.verify(token)
+        except JWTError as e:
+            return await self.reject(send, str(e))
+        
+        return await self.app(scope, receive, send)
+
+    async def reject(self, send, details: str):
+        body = json.dumps({
+            "message": "Authorization failed", 
+            "details": details, 
+            "code": 401
+        }).encode('utf-8')
+        await send({
+            "type": "http.response.start", 
+            "status": 401, 
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode('latin-1'))], 
+        })
+        await send({"type": "http.response.body", "body": body})
\ No newline at end of file
@@ -0,0 +1,212 @@
+import contextvars, hmac, logging, time
+from flask import request
+from sqlalchemy import event
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import ClosingIterator
+
+from config import Env
+from db import Database, AsyncDatabase
+from utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+METRICS_PATH = "/metrics"
+ENDPOINT_KEY = "metrics.endpoint"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+requests_total = registry.counter("collab_http_requests_total", "Requests served, by endpoint and status code",
+                                  labels=("method", "endpoint", "status"))
+request_seconds = registry.histogram("collab_http_request_duration_seconds", "Time until the whole response was sent, event streams excluded",
+                                     LATENCY_BUCKETS, labels=("method", "endpoint"))
+request_statements = registry.histogram("collab_http_request_sql_statements", "SQL statements sent while serving one request",
+                                        STATEMENT_BUCKETS, labels=("method", "endpoint"))
+request_db_seconds = registry.histogram("collab_http_request_db_seconds", "Time spent waiting on the database while serving one request",
+                                        LATENCY_BUCKETS, labels=("method", "endpoint"))
+statements_total = registry.counter("collab_db_statements_total", "SQL statements sent to the database")
+
+# engine whose pool is reported, the one the Metrics middleware of this process instruments
+_pooled_engine = None
+
+def _pool_stat(name: str):
+    def read():
+        pool = _pooled_engine.pool if _pooled_engine is not None else None
+        return getattr(pool, name)() if hasattr(pool, name) else 0
+    return read
+
+registry.gauge("collab_db_pool_size", "Connections the pool keeps open", _pool_stat("size"))
+registry.gauge("collab_db_pool_checked_out", "Connections in use by requests", _pool_stat("checkedout"))
+registry.gauge("collab_db_pool_overflow", "Connections opened beyond the pool size, negative while the pool isn't full yet", _pool_stat("overflow"))
+
+class RequestStats:
+    __slots__ = ("statements", "db_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.metrics_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.metrics_started
+    statements_total.inc()
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+
+def instrument_engine(engine):
+    """
+        Counts the statements of an engine and the time they take, statements sent while a request
+        is served are added to that request
+    """
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def label_endpoint():
+    """
+        before_request hook of the Flask app, labels the request with the name of the matched view
+        so latency is reported per endpoint and not per URL
+    """
+
+    request.environ[ENDPOINT_KEY] = request.endpoint or "unmatched"
+
+async def label_async_endpoint():
+    """
+        before_request hook of the Quart app, same as label_endpoint
+    """
+
+    # imported here so the WSGI app doesn't need the async extras installed
+    from quart import request as async_request
+
+    async_request.scope[ENDPOINT_KEY] = async_request.endpoint or "unmatched"
+
+def _is_event_stream(content_type: str):
+    return content_type.split(";", 1)[0].strip().lower() == "text/event-stream"
+
+def _observe(method: str, endpoint: str, status: str, elapsed: float, stats: RequestStats, streaming: bool):
+    requests_total.inc(method, endpoint, status)
+    # an event stream stays open as long as the client listens, its duration isn't a latency
+    if streaming:
+        return
+    request_seconds.observe(elapsed, method, endpoint)
+    request_statements.observe(stats.statements, method, endpoint)
+    request_db_seconds.observe(stats.db_seconds, method, endpoint)
+
+def _authorized(authorization: str):
+    if not Env.METRICS_TOKEN:
+        return False
+    return hmac.compare_digest(authorization.encode('latin-1'), f"Bearer {Env.METRICS_TOKEN}".encode('utf-8'))
+
+class Metrics:
+    """
+        Outermost middleware, times every request and serves the collected metrics on /metrics
+        in the Prometheus text format to scrapers sending `Authorization: Bearer <METRICS_TOKEN>`,
+        without a METRICS_TOKEN the path answers 404. Requests rejected before reaching a view are labelled 'none'
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.instrument(Database().engine)
+
+    def instrument(self, engine):
+        global _pooled_engine
+        _pooled_engine = engine
+        instrument_engine(engine)
+        if not Env.METRICS_TOKEN:
+            logger.warning("METRICS_TOKEN is not set, /metrics won't be served")
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO", "") == METRICS_PATH:
+            return self.serve(environ, start_response)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = []
+        streaming = []
+
+        def capture_status(code, headers, exc_info=None):
+            status.append(code[:3])
+            streaming.append(any(name.lower() == "content-type" and _is_event_stream(value) for name, value in headers))
+            return start_response(code, headers, exc_info)
+
+        # the response is timed until the server closes its body, when the last chunk has been sent
+        def finish():
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            method, endpoint = environ.get("REQUEST_METHOD", ""), environ.get(ENDPOINT_KEY, "none")
+            _observe(method, endpoint, status[0] if status else "500", elapsed, stats, streaming[0] if streaming else False)
+
+        start = time.perf_counter()
+        try:
+            body = self.app(environ, capture_status)
+        except BaseException:
+            finish()
+            raise
+        return ClosingIterator(body, finish)
+
+    def serve(self, environ, start_response):
+        if not Env.METRICS_TOKEN:
+            return Response("Not Found\n", status=404, mimetype="text/plain")(environ, start_response)
+        if not _authorized(environ.get("HTTP_AUTHORIZATION", "")):
+            return Response("Unauthorized\n", status=401, mimetype="text/plain")(environ, start_response)
+
+        return Response(registry.render(), content_type=CONTENT_TYPE)(environ, start_response)
+
+class AsyncMetrics(Metrics):
+    """
+        ASGI version of the Metrics middleware, counts the statements of the async engine
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.instrument(AsyncDatabase().engine.sync_engine)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if scope["path"] == METRICS_PATH:
+            return await self.serve_async(scope, send)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = []
+        streaming = []
+
+        async def capture_status(message):
+            if message["type"] == "http.response.start":
+                status.append(str(message["status"]))
+                streaming.append(any(name.lower() == b"content-type" and _is_event_stream(value.decode('latin-1')) for name, value in message.get("headers", [])))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            return await self.app(scope, receive, capture_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            method, endpoint = scope["method"], scope.get(ENDPOINT_KEY, "none")
+            _observe(method, endpoint, status[0] if status else "500", elapsed, stats, streaming[0] if streaming else False)
+
+    async def serve_async(self, scope, send):
+        authorization = next((value.decode('latin-1') for name, value in scope["headers"] if name == b"authorization"), "")
+        if not Env.METRICS_TOKEN:
+            status, content_type, body = 404, b"text/plain", b"Not Found\n"
+        elif not _authorized(authorization):
+            status, content_type, body = 401, b"text/plain", b"Unauthorized\n"
+        else:
+            status, content_type, body = 200, CONTENT_TYPE.encode('latin-1'), registry.render().encode('utf-8')
+
+        await send({
+            "type": "http.response.start", 
+            "status": status, 
+            "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode('latin-1'))], 
+        })
+        await send({"type": "http.response.body", "body": body})
\ No newline at end of file
@@ -0,0 +1,164 @@
+import asyncio, hmac, json, logging, random
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+from config import Env
+from utils.profiling import MODES, create_profiler, profile_name, save_profile, list_profiles, prune_profiles, profile_path
+
+logger = logging.getLogger(__name__)
+
+PROFILES_PATH = "/debug/profiles"
+
+def _has_token(value: str):
+    if not Env.PROFILING_TOKEN:
+        return False
+    return hmac.compare_digest(value.encode('latin-1'), Env.PROFILING_TOKEN.encode('utf-8'))
+
+def _requested_mode(token: str, mode: str):
+    if _has_token(token):
+        return mode if mode in MODES else Env.PROFILING_MODE
+    if Env.PROFILING_SAMPLE_RATE > 0 and random.random() < Env.PROFILING_SAMPLE_RATE:
+        return Env.PROFILING_MODE
+    return None
+
+def _save(profiler, name: str):
+    try:
+        save_profile(profiler, Env.PROFILING_DIR, name)
+        prune_profiles(Env.PROFILING_DIR, Env.PROFILING_KEEP)
+    except Exception:
+        logger.exception("Saving a profile failed")
+
+def _read_profile(name: str):
+    path = profile_path(Env.PROFILING_DIR, name)
+    if path is None:
+        return None
+    with open(path, "rb") as file:
+        return file.read()
+
+class Profiling:
+    """
+        Runs a request under a profiler when it carries `X-Profile-Token: <PROFILING_TOKEN>` (`X-Profile-Mode`
+        picks 'deterministic' or 'sampling') or when it is drawn by PROFILING_SAMPLE_RATE, and saves the profile
+        to PROFILING_DIR, the response names the file in an `X-Profile` header. Profiles are listed on
+        /debug/profiles and downloaded from /debug/profiles/<name>, both require `Authorization: Bearer <PROFILING_TOKEN>`
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path == PROFILES_PATH or path.startswith(PROFILES_PATH + "/"):
+            return self.serve(environ, start_response, path[len(PROFILES_PATH) + 1:])
+
+        mode = self.requested_mode(environ)
+        if mode is None:
+            return self.app(environ, start_response)
+
+        name = profile_name(mode, environ.get("REQUEST_METHOD", ""), path)
+
+        def add_profile_header(status, headers, exc_info=None):
+            headers.append(("X-Profile", name))
+            return start_response(status, headers, exc_info)
+
+        profiler = create_profiler(mode, Env.PROFILING_INTERVAL)
+        try:
+            profiler.enable()
+        except Exception:
+            # e.g. another profiler is already active on this thread, the request is served unprofiled
+            logger.exception("Starting a profiler failed")
+            return self.app(environ, start_response)
+
+        try:
+            return self.app(environ, add_profile_header)
+        finally:
+            profiler.disable()
+            _save(profiler, name)
+
+    def requested_mode(self, environ):
+        return _requested_mode(environ.get("HTTP_X_PROFILE_TOKEN", ""), environ.get("HTTP_X_PROFILE_MODE", Env.PROFILING_MODE))
+
+    def serve(self, environ, start_response, name: str):
+        authorization = environ.get("HTTP_AUTHORIZATION", "")
+        if not authorization.startswith("Bearer ") or not _has_token(authorization[len("Bearer "):]):
+            return Response("Not Found\n", status=404, mimetype="text/plain")(environ, start_response)
+
+        if not name:
+            body = json.dumps({"profiles": list_profiles(Env.PROFILING_DIR)})
+            return Response(body, mimetype="application/json")(environ, start_response)
+
+        path = profile_path(Env.PROFILING_DIR, name)
+        if path is None:
+            return Response("Not Found\n", status=404, mimetype="text/plain")(environ, start_response)
+        response = Response(wrap_file(environ, open(path, "rb")), mimetype="application/octet-stream", direct_passthrough=True)
+        response.headers["Content-Disposition"] = f"attachment; filename={name}"
+        return response(environ, start_response)
+
+class AsyncProfiling(Profiling):
+    """
+        ASGI version of the Profiling middleware. Requests share the event loop thread, so the profiler
+        records everything the loop runs while the request is in flight, other requests included, and
+        only one request is profiled at a time, the others are served unprofiled meanwhile
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._profiling = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        path = scope["path"]
+        if path == PROFILES_PATH or path.startswith(PROFILES_PATH + "/"):
+            return await self.serve_async(scope, send, path[len(PROFILES_PATH) + 1:])
+
+        headers = {name: value.decode('latin-1') for name, value in scope["headers"]}
+        mode = _requested_mode(headers.get(b"x-profile-token", ""), headers.get(b"x-profile-mode", Env.PROFILING_MODE))
+        if mode is None or self._profiling:
+            return await self.app(scope, receive, send)
+
+        name = profile_name(mode, scope["method"], path)
+
+        async def add_profile_header(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile", name.encode('latin-1'))]}
+            await send(message)
+
+        profiler = create_profiler(mode, Env.PROFILING_INTERVAL)
+        try:
+            profiler.enable()
+        except Exception:
+            logger.exception("Starting a profiler failed")
+            return await self.app(scope, receive, send)
+
+        self._profiling = True
+        try:
+            return await self.app(scope, receive, add_profile_header)
+        finally:
+            profiler.disable()
+            self._profiling = False
+            # writing the file is left to a thread so the loop keeps serving
+            await asyncio.get_running_loop().run_in_executor(None, _save, profiler, name)
+
+    async def serve_async(self, scope, send, name: str):
+        authorization = next((value.decode('latin-1') for header, value in scope["headers"] if header == b"authorization"), "")
+        loop = asyncio.get_running_loop()
+        if not authorization.startswith("Bearer ") or not _has_token(authorization[len("Bearer "):]):
+            status, headers, body = 404, [(b"content-type", b"text/plain")], b"Not Found\n"
+        elif not name:
+            profiles = await loop.run_in_executor(None, list_profiles, Env.PROFILING_DIR)
+            status, headers, body = 200, [(b"content-type", b"application/json")], json.dumps({"profiles": profiles}).encode('utf-8')
+        else:
+            body = await loop.run_in_executor(None, _read_profile, name)
+            if body is None:
+                status, headers, body = 404, [(b"content-type", b"text/plain")], b"Not Found\n"
+            else:
+                status, headers = 200, [(b"content-type", b"application/octet-stream"), (b"content-disposition", f"attachment; filename={name}".encode('latin-1'))]
+
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [*headers, (b"content-length", str(len(body)).encode('latin-1'))],
+        })
+        await send({"type": "http.response.body", "body": body})
\ No newline at end of file
@@ -0,0 +1,142 @@
+from flask import request
+from sqlalchemy import event
+from werkzeug.wsgi import ClosingIterator
+
+from db import Database, AsyncDatabase
+from utils.tracing import start_trace, activate, deactivate, current_span, get_exporter, MAX_STATEMENT
+
+SPAN_KEY = "tracing.span"
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = current_span()
+    if parent is not None:
+        context.trace_span = parent.child("sql", kind="CLIENT", tags={
+            "db.system": conn.dialect.name,
+            "db.statement": statement[:MAX_STATEMENT],
+            "db.executemany": str(executemany).lower(),
+        })
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "trace_span", None)
+    if span is not None:
+        span.finish()
+
+def _handle_error(exception_context):
+    span = getattr(exception_context.execution_context, "trace_span", None)
+    if span is not None:
+        span.tag("error", type(exception_context.original_exception).__name__)
+        span.finish()
+
+def instrument_engine(engine):
+    """
+        Gives every statement sent while a sampled request is served a span with its text and duration
+    """
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+def name_root_span():
+    """
+        before_request hook of the Flask app, names the root span after the matched view
+    """
+
+    root = request.environ.get(SPAN_KEY)
+    if root is not None:
+        root.name = f"{request.method} {request.endpoint or 'unmatched'}"
+
+async def name_async_root_span():
+    """
+        before_request hook of the Quart app, same as name_root_span
+    """
+
+    # imported here so the WSGI app doesn't need the async extras installed
+    from quart import request as async_request
+
+    root = async_request.scope.get(SPAN_KEY)
+    if root is not None:
+        root.name = f"{async_request.method} {async_request.endpoint or 'unmatched'}"
+
+class Tracing:
+    """
+        Starts the trace of a request, continuing the one of an incoming `traceparent` header, and
+        exports it when the whole response has been sent. The `traceparent` of the root span is sent back so
+        a slow response can be looked up by its trace id
+    """
+
+    def __init__(self, app):
+        self.app = app
+        instrument_engine(Database().engine)
+
+    def __call__(self, environ, start_response):
+        method = environ.get("REQUEST_METHOD", "")
+        root = start_trace(method, environ.get("HTTP_TRACEPARENT"))
+        if root is None:
+            return self.app(environ, start_response)
+
+        root.tag("http.method", method)
+        root.tag("http.path", environ.get("PATH_INFO", ""))
+        environ[SPAN_KEY] = root
+
+        def add_traceparent(status, headers, exc_info=None):
+            root.tag("http.status_code", status[:3])
+            headers.append(("traceparent", root.traceparent()))
+            return start_response(status, headers, exc_info)
+
+        # the root span ends when the server closes the body, once the last chunk has been sent
+        def finish():
+            deactivate(token)
+            root.finish()
+            get_exporter().export(root.trace)
+
+        token = activate(root)
+        try:
+            body = self.app(environ, add_traceparent)
+        except Exception as e:
+            root.tag("error", type(e).__name__)
+            finish()
+            raise
+        except BaseException:
+            finish()
+            raise
+        return ClosingIterator(body, finish)
+
+class AsyncTracing(Tracing):
+    """
+        ASGI version of the Tracing middleware, statements of the async engine get their spans
+    """
+
+    def __init__(self, app):
+        self.app = app
+        instrument_engine(AsyncDatabase().engine.sync_engine)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        traceparent = next((value.decode('latin-1') for name, value in scope["headers"] if name == b"traceparent"), None)
+        root = start_trace(scope["method"], traceparent)
+        if root is None:
+            return await self.app(scope, receive, send)
+
+        root.tag("http.method", scope["method"])
+        root.tag("http.path", scope["path"])
+        scope[SPAN_KEY] = root
+
+        async def add_traceparent(message):
+            if message["type"] == "http.response.start":
+                root.tag("http.status_code", message["status"])
+                message = {**message, "headers": [*message.get("headers", []), (b"traceparent", root.traceparent().encode('latin-1'))]}
+            await send(message)
+
+        token = activate(root)
+        try:
+            return await self.app(scope, receive, add_traceparent)
+        except Exception as e:
+            root.tag("error", type(e).__name__)
+            raise
+        finally:
+            deactivate(token)
+            root.finish()
+            get_exporter().export(root.trace)
\ No newline at end of file
@@ -0,0 +1,58 @@
+import importlib, pkgutil
+from sqlalchemy import text
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+class Migration:
+    def __init__(self, module):
+        self.revision = module.revision
+        self.description = module.description
+        self.upgrade = module.upgrade
+
+def load_migrations():
+    """
+        Every module named `v<revision>_<name>` in this package is a migration, ordered by revision
+    """
+
+    migrations = []
+    for module_info in pkgutil.iter_modules(__path__):
+        if not module_info.name.startswith("v"):
+            continue
+
+        module = importlib.import_module(f"{__name__}.{module_info.name}")
+        migrations.append(Migration(module))
+
+    migrations.sort(key=lambda migration: migration.revision)
+    return migrations
+
+def applied_revisions(connection):
+    connection.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+            revision VARCHAR(32) PRIMARY KEY, 
+            description VARCHAR(255) NOT NULL, 
+            applied_at TIMESTAMP NOT NULL DEFAULT now()
+        )
+    """))
+    rows = connection.execute(text(f"SELECT revision FROM {MIGRATIONS_TABLE}")).all()
+    return set(row[0] for row in rows)
+
+def pending_migrations(engine):
+    with engine.begin() as connection:
+        applied = applied_revisions(connection)
+    
+    return [migration for migration in load_migrations() if migration.revision not in applied]
+
+def migrate(engine):
+    """
+        Apply pending migrations in order, each one in its own transaction, returns the applied ones
+    """
+
+    applied = []
+    for migration in pending_migrations(engine):
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(text(f"INSERT INTO {MIGRATIONS_TABLE} (revision, description) VALUES (:revision, :description)"), 
+                               {"revision": migration.revision, "description": migration.description})
+        applied.append(migration)
+
+    return applied
@@ -0,0 +1,63 @@
+from sqlalchemy import text
+
+revision = "0001"
+description = "initial schema"
+
+# databases created before migrations existed already have these objects, so every statement is idempotent
+STATEMENTS = [
+    """
+    DO $$ BEGIN
+        CREATE TYPE role AS ENUM ('Member', 'Owner');
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$
+    """, 
+    """
+    DO $$ BEGIN
+        CREATE TYPE taskstatus AS ENUM ('ToDo', 'InProgress', 'Completed');
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$
+    """, 
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id VARCHAR(150) PRIMARY KEY, 
+        name VARCHAR(50) NOT NULL, 
+        email VARCHAR(150) NOT NULL, 
+        password_hash VARCHAR(150) NOT NULL, 
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+    )
+    """, 
+    """
+    CREATE TABLE IF NOT EXISTS projects (
+        id VARCHAR(150) PRIMARY KEY, 
+        name VARCHAR(150) NOT NULL, 
+        description VARCHAR, 
+        deadline TIMESTAMP WITHOUT TIME ZONE NOT NULL, 
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(), 
+        code VARCHAR NOT NULL
+    )
+    """, 
+    """
+    CREATE TABLE IF NOT EXISTS memberships (
+        user_id VARCHAR(150) NOT NULL REFERENCES users (id), 
+        project_id VARCHAR(150) NOT NULL REFERENCES projects (id), 
+        role role NOT NULL, 
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(), 
+        PRIMARY KEY (user_id, project_id)
+    )
+    """, 
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id VARCHAR(150) PRIMARY KEY, 
+        name VARCHAR(150) NOT NULL, 
+        description VARCHAR, 
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(), 
+        assignee VARCHAR(150) NOT NULL REFERENCES users (id), 
+        status taskstatus NOT NULL, 
+        project_id VARCHAR(150) NOT NULL REFERENCES projects (id)
+    )
+    """, 
+]
+
+def upgrade(connection):
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
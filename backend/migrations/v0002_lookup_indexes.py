@@ -0,0 +1,15 @@
+from sqlalchemy import text
+
+revision = "0002"
+description = "unique email and project code, indexes for task and member listing"
+
+STATEMENTS = [
+    "ALTER TABLE users ADD CONSTRAINT uq_users_email UNIQUE (email)", 
+    "ALTER TABLE projects ADD CONSTRAINT uq_projects_code UNIQUE (code)", 
+    "CREATE INDEX IF NOT EXISTS ix_tasks_project_id_created_at ON tasks (project_id, created_at, id)", 
+    "CREATE INDEX IF NOT EXISTS ix_memberships_project_id_created_at ON memberships (project_id, created_at, user_id)", 
+]
+
+def upgrade(connection):
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
@@ -0,0 +1,28 @@
+from sqlalchemy import text
+
+revision = "0003"
+description = "task counters per project, assignee and status for the project summary"
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS task_counters (
+        project_id VARCHAR(150) NOT NULL REFERENCES projects (id) ON DELETE CASCADE, 
+        assignee VARCHAR(150) NOT NULL REFERENCES users (id), 
+        status taskstatus NOT NULL, 
+        count INTEGER NOT NULL DEFAULT 0, 
+        PRIMARY KEY (project_id, assignee, status)
+    )
+    """, 
+    """
+    INSERT INTO task_counters (project_id, assignee, status, count)
+    SELECT project_id, assignee, status, count(*) FROM tasks GROUP BY project_id, assignee, status
+    ON CONFLICT (project_id, assignee, status) DO UPDATE SET count = EXCLUDED.count
+    """, 
+]
+
+def upgrade(connection):
+    # the backfill runs in the same transaction as the table creation, lock the tasks 
+    # so nothing is written between counting them and the services taking over
+    connection.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
@@ -0,0 +1,12 @@
+from sqlalchemy import text
+
+revision = "0004"
+description = "project version used as the ETag of project, task and member reads"
+
+STATEMENTS = [
+    "ALTER TABLE projects ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1", 
+]
+
+def upgrade(connection):
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
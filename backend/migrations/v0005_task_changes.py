@@ -0,0 +1,28 @@
+from sqlalchemy import text
+
+revision = "0005"
+description = "task updated_at and version, task tombstones for the changes feed"
+
+STATEMENTS = [
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITHOUT TIME ZONE", 
+    "UPDATE tasks SET updated_at = created_at WHERE updated_at IS NULL", 
+    "ALTER TABLE tasks ALTER COLUMN updated_at SET DEFAULT now()", 
+    "ALTER TABLE tasks ALTER COLUMN updated_at SET NOT NULL", 
+    # existing tasks get version 0, a client syncing from the start still receives them
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0", 
+    "CREATE INDEX IF NOT EXISTS ix_tasks_project_id_version ON tasks (project_id, version, id)", 
+    """
+    CREATE TABLE IF NOT EXISTS task_tombstones (
+        project_id VARCHAR(150) NOT NULL REFERENCES projects (id) ON DELETE CASCADE, 
+        task_id VARCHAR(150) NOT NULL, 
+        version INTEGER NOT NULL, 
+        deleted_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(), 
+        PRIMARY KEY (project_id, task_id)
+    )
+    """, 
+    "CREATE INDEX IF NOT EXISTS ix_task_tombstones_project_id_version ON task_tombstones (project_id, version, task_id)", 
+]
+
+def upgrade(connection):
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
@@ -6,4 +6,5 @@ class Base(DeclarativeBase):
 
 from models.membership import Membership
 from models.user import User
-from models.project import Project, Task
\ No newline at end of file
+from models.project import Project, Task, TaskTombstone
+from models.task_counter import TaskCounter
\ No newline at end of file
@@ -1,6 +1,6 @@
 import enum
 from datetime import datetime
-from sqlalchemy import func, ForeignKey
+from sqlalchemy import func, ForeignKey, Index
 
 from models import Base, Mapped, mapped_column, DateTime, Enum, String
 
@@ -10,6 +10,10 @@ class Role(enum.Enum):
 
 class Membership(Base):
     __tablename__ = "memberships"
+    # lookups by user_id alone are served by the primary key, its leading column is user_id
+    __table_args__ = (
+        Index("ix_memberships_project_id_created_at", "project_id", "created_at", "user_id"), 
+    )
 
     user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), primary_key=True)
     project_id: Mapped[str] = mapped_column(ForeignKey("projects.id"), primary_key=True)
@@ -1,7 +1,7 @@
 import enum
 from typing import List
 from datetime import datetime
-from sqlalchemy import func, ForeignKey
+from sqlalchemy import func, ForeignKey, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from models import Base, Mapped, mapped_column, String, DateTime, Enum
@@ -9,6 +9,9 @@ from models import Membership
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        UniqueConstraint("code", name="uq_projects_code"), 
+    )
 
     id: Mapped[str] = mapped_column(String(150), primary_key=True)
     name: Mapped[str] = mapped_column(String(150), nullable=False)
@@ -16,6 +19,8 @@ class Project(Base):
     deadline: Mapped[datetime] = mapped_column(DateTime)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     code: Mapped[str] = mapped_column(String, nullable=False)
+    # bumped by every write to the project, its tasks or its members, see services.versions
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
     
     tasks: Mapped[List['Task']] = relationship(back_populates="project")
     memberships: Mapped[List['Membership']] = relationship(cascade="all, delete-orphan")
@@ -34,6 +39,10 @@ class TaskStatus(enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_id_created_at", "project_id", "created_at", "id"), 
+        Index("ix_tasks_project_id_version", "project_id", "version", "id"), 
+    )
 
     id: Mapped[str] = mapped_column(String(150), primary_key=True)
     name: Mapped[str] = mapped_column(String(150), nullable=False)
@@ -41,14 +50,38 @@ class Task(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     assignee: Mapped[str] = mapped_column(ForeignKey("users.id"))
     status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus))
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+    # project version of the write that last changed the task, orders the changes feed in commit order
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     
     project_id: Mapped[str] = mapped_column(ForeignKey("projects.id"))
     project: Mapped['Project'] = relationship(back_populates="tasks")
 
-    def __init__(self, id: str, name: str, description: str, assignee: str, status: TaskStatus, project_id: str):
+    def __init__(self, id: str, name: str, description: str, assignee: str, status: TaskStatus, project_id: str, version: int = 0):
         self.id = id
         self.name = name
         self.description = description
         self.assignee = assignee
         self.status = status
-        self.project_id = project_id
\ No newline at end of file
+        self.project_id = project_id
+        self.version = version
+
+class TaskTombstone(Base):
+    """
+        Marker left by a deleted task so clients syncing changes learn about the deletion
+    """
+
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_project_id_version", "project_id", "version", "task_id"), 
+    )
+
+    project_id: Mapped[str] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    task_id: Mapped[str] = mapped_column(String(150), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    def __init__(self, project_id: str, task_id: str, version: int):
+        self.project_id = project_id
+        self.task_id = task_id
+        self.version = version
\ No newline at end of file
@@ -0,0 +1,23 @@
+from sqlalchemy import ForeignKey, Integer
+
+from models import Base, Mapped, mapped_column, Enum
+from models.project import TaskStatus
+
+class TaskCounter(Base):
+    """
+        Number of tasks per (project, assignee, status), kept in step with the tasks table by every 
+        service method that creates tasks or changes their status or assignee
+    """
+
+    __tablename__ = "task_counters"
+
+    project_id: Mapped[str] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    assignee: Mapped[str] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __init__(self, project_id: str, assignee: str, status: TaskStatus, count: int):
+        self.project_id = project_id
+        self.assignee = assignee
+        self.status = status
+        self.count = count
\ No newline at end of file
@@ -1,6 +1,6 @@
 from typing import List
 from datetime import datetime, timezone
-from sqlalchemy import func
+from sqlalchemy import func, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from models import Base, Mapped, mapped_column, String, DateTime
@@ -8,6 +8,9 @@ from models import Membership
 
 class User(Base):
     __tablename__ = 'users'
+    __table_args__ = (
+        UniqueConstraint("email", name="uq_users_email"), 
+    )
 
     id: Mapped[str] = mapped_column(String(150), primary_key=True)
     name: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -0,0 +1,40 @@
+from quart import Blueprint, request
+
+from services.async_auth import AsyncAuthService
+from routes.views import quart_response
+from routes import auth_views as views
+
+async_auth_blueprint = Blueprint("auth", __name__)
+
+async def register():
+    payload, error = views.read_register_payload(await request.get_data())
+    if error:
+        return await quart_response(error)
+
+    try:
+        user_id = await AsyncAuthService().register(username=payload.username, email=payload.email, password=payload.password)
+        return await quart_response(views.registered_reply(user_id))
+    except Exception as e:
+        return await quart_response(views.register_error(e))
+
+async def login():
+    payload, error = views.read_login_payload(await request.get_data())
+    if error:
+        return await quart_response(error)
+
+    try:
+        user = await AsyncAuthService().login(email=payload.email, password=payload.password)
+        return await quart_response(views.login_reply(user))
+    except Exception as e:
+        return await quart_response(views.login_error(e))
+
+async def refresh():
+    return await quart_response(views.refresh_reply(request.cookies))
+
+async def getMe():
+    return await quart_response(views.me_reply(request.scope.get("user")))
+
+async_auth_blueprint.add_url_rule("/register", endpoint="register", view_func=register, methods=['POST'])
+async_auth_blueprint.add_url_rule("/login", endpoint="login", view_func=login, methods=['POST'])
+async_auth_blueprint.add_url_rule("/refresh", endpoint="refresh", view_func=refresh, methods=['POST'])
+async_auth_blueprint.add_url_rule("/me", endpoint="get-me", view_func=getMe, methods=['GET'])
\ No newline at end of file
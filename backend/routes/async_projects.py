@@ -0,0 +1,285 @@
+from datetime import date
+from quart import Blueprint, Response, request
+
+from services.async_project import AsyncProjectService
+from services.events import subscribe_project_events_async, async_event_stream, EVENT_STREAM_HEADERS
+from routes.views import Reply, quart_response, read_user
+from routes import project_views as views
+from utils.pagination import parse_limit
+from utils.conditional import project_etag
+
+async_projects_blueprint = Blueprint("projects", __name__)
+
+async def list_projects():
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        projects, next_cursor = await AsyncProjectService().list_projects(user_id=user.id, limit=limit, cursor=request.args.get("cursor"))
+        return await quart_response(views.projects_reply(projects, next_cursor))
+    except Exception as e:
+        return await quart_response(views.list_projects_error(e))
+
+async def create_project():
+    payload, error = views.read_project_payload(await request.get_data())
+    if error:
+        return await quart_response(error)
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        project = await AsyncProjectService().create_projects(name=payload.name, description=payload.description, deadline=payload.deadline, user_id=user.id)
+        return await quart_response(views.created_project_reply(project))
+    except Exception as e:
+        return await quart_response(views.create_project_error(e))
+
+async def get_project(project_id: str):
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        service = AsyncProjectService()
+        version, role = await service.get_version(project_id=project_id, user_id=user.id)
+        etag = project_etag(version, role)
+        if request.if_none_match.contains(etag):
+            return await quart_response(Reply(None, 304, etag=etag))
+
+        project = await service.get_project(project_id=project_id, user_id=user.id)
+        tasks, next_cursor = await service.get_tasks(project_id=project_id, user_id=user.id)
+        return await quart_response(views.project_reply(project, tasks, next_cursor, etag))
+    except Exception as e:
+        return await quart_response(views.member_error(e))
+
+async def get_summary(project_id: str):
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        service = AsyncProjectService()
+        version, role = await service.get_version(project_id=project_id, user_id=user.id)
+        etag = project_etag(version, role, day=date.today())
+        if request.if_none_match.contains(etag):
+            return await quart_response(Reply(None, 304, etag=etag))
+
+        summary = await service.get_summary(project_id=project_id, user_id=user.id)
+        return await quart_response(views.summary_reply(summary, etag))
+    except Exception as e:
+        return await quart_response(views.member_error(e))
+
+async def project_events(project_id: str):
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        await AsyncProjectService().get_version(project_id=project_id, user_id=user.id)
+    except Exception as e:
+        return await quart_response(views.member_error(e))
+
+    subscription = subscribe_project_events_async(project_id)
+    response = Response(async_event_stream(subscription), mimetype="text/event-stream", headers=EVENT_STREAM_HEADERS)
+    # the stream stays open until the client leaves, not only for quart's default response timeout
+    response.timeout = None
+    return response
+
+async def get_members(project_id: str):
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        service = AsyncProjectService()
+        version, role = await service.get_version(project_id=project_id, user_id=user.id)
+        etag = project_etag(version, role)
+        if request.if_none_match.contains(etag):
+            return await quart_response(Reply(None, 304, etag=etag))
+
+        members, next_cursor = await service.get_members(project_id=project_id, user_id=user.id, limit=limit, cursor=request.args.get("cursor"))
+        return await quart_response(views.members_reply(members, next_cursor, etag))
+    except Exception as e:
+        return await quart_response(views.page_error(e))
+
+async def delete_project(project_id: str):
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        await AsyncProjectService().delete_project(project_id=project_id, user_id=user.id)
+        return await quart_response(views.deleted_project_reply())
+    except Exception as e:
+        return await quart_response(views.owner_error(e, "User is not the project owner"))
+
+async def join_project(project_code: str):
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        project = await AsyncProjectService().join_project(project_code=project_code, user_id=user.id)
+        return await quart_response(views.joined_project_reply(project))
+    except Exception as e:
+        return await quart_response(views.join_project_error(e))
+
+async def list_tasks(project_id: str):
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        service = AsyncProjectService()
+        version, role = await service.get_version(project_id=project_id, user_id=user.id)
+        etag = project_etag(version, role)
+        if request.if_none_match.contains(etag):
+            return await quart_response(Reply(None, 304, etag=etag))
+
+        tasks, next_cursor = await service.get_tasks(project_id=project_id, user_id=user.id, limit=limit, cursor=request.args.get("cursor"))
+        return await quart_response(views.tasks_reply(tasks, next_cursor, etag))
+    except Exception as e:
+        return await quart_response(views.page_error(e))
+
+async def list_task_changes(project_id: str):
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        changes = await AsyncProjectService().get_changes(project_id=project_id, user_id=user.id, since=request.args.get("since"), limit=limit)
+        return await quart_response(Reply(changes))
+    except Exception as e:
+        return await quart_response(views.page_error(e))
+
+async def create_task(project_id: str):
+    payload, error = views.read_task_payload(await request.get_data())
+    if error:
+        return await quart_response(error)
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        task = await AsyncProjectService().create_task(name=payload.name,
+                                                       description=payload.description,
+                                                       assignee=payload.assignee,
+                                                       status=payload.status,
+                                                       project_id=project_id,
+                                                       user_id=user.id)
+        return await quart_response(views.changed_task_reply("Task created successfully", task, 201))
+    except Exception as e:
+        return await quart_response(views.owner_error(e, "User is not a project owner"))
+
+async def get_task(project_id: str, task_id: str):
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        service = AsyncProjectService()
+        version, role = await service.get_version(project_id=project_id, user_id=user.id)
+        etag = project_etag(version, role)
+        if request.if_none_match.contains(etag):
+            return await quart_response(Reply(None, 304, etag=etag))
+
+        task = await service.get_task(task_id=task_id, project_id=project_id, user_id=user.id)
+        return await quart_response(views.task_reply(task, etag))
+    except Exception as e:
+        return await quart_response(views.member_error(e))
+
+async def edit_task(project_id: str, task_id: str):
+    payload, error = views.read_edit_payload(await request.get_data())
+    if error:
+        return await quart_response(error)
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        task = await AsyncProjectService().edit_task(task_id=task_id,
+                                                     name=payload.name,
+                                                     description=payload.description,
+                                                     project_id=project_id,
+                                                     user_id=user.id)
+        return await quart_response(views.changed_task_reply("Task updated successfully", task))
+    except Exception as e:
+        return await quart_response(views.edit_task_error(e))
+
+async def change_task_status(project_id: str, task_id: str):
+    payload, error = views.read_status_payload(await request.get_data())
+    if error:
+        return await quart_response(error)
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        task = await AsyncProjectService().change_status(task_id=task_id, status=payload.status, project_id=project_id, user_id=user.id)
+        return await quart_response(views.changed_task_reply("Task status updated successfully", task))
+    except Exception as e:
+        return await quart_response(views.edit_task_error(e))
+
+async def change_assignee(project_id: str, task_id: str):
+    payload, error = views.read_assignee_payload(await request.get_data())
+    if error:
+        return await quart_response(error)
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        task = await AsyncProjectService().change_assignee(task_id=task_id, assignee=payload.assignee, project_id=project_id, user_id=user.id)
+        return await quart_response(views.changed_task_reply("Task assignee updated successfully", task))
+    except Exception as e:
+        return await quart_response(views.owner_error(e))
+
+async def delete_task(project_id: str, task_id: str):
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        await AsyncProjectService().delete_task(task_id=task_id, project_id=project_id, user_id=user.id)
+        return await quart_response(views.deleted_task_reply())
+    except Exception as e:
+        return await quart_response(views.owner_error(e))
+
+async def bulk_tasks(project_id: str):
+    payload, error = views.read_bulk_payload(await request.get_data())
+    if error:
+        return await quart_response(error)
+    user, error = read_user(request.scope.get("user"))
+    if error:
+        return await quart_response(error)
+
+    try:
+        results = await AsyncProjectService().bulk_tasks(operations=payload.operations, project_id=project_id, user_id=user.id)
+        return await quart_response(views.bulk_reply(results))
+    except Exception as e:
+        return await quart_response(views.bulk_tasks_error(e))
+
+async_projects_blueprint.add_url_rule("/", endpoint="list-projects", view_func=list_projects, methods=["GET"])
+async_projects_blueprint.add_url_rule("/", endpoint="create-project", view_func=create_project, methods=["POST"])
+async_projects_blueprint.add_url_rule("/<project_id>", endpoint="get-project", view_func=get_project, methods=["GET"])
+async_projects_blueprint.add_url_rule("/<project_id>", endpoint="delete-project", view_func=delete_project, methods=["DELETE"])
+async_projects_blueprint.add_url_rule("/<project_id>/members", endpoint="get-project-members", view_func=get_members, methods=["GET"])
+async_projects_blueprint.add_url_rule("/<project_id>/summary", endpoint="get-project-summary", view_func=get_summary, methods=["GET"])
+async_projects_blueprint.add_url_rule("/<project_id>/events", endpoint="get-project-events", view_func=project_events, methods=["GET"])
+
+async_projects_blueprint.add_url_rule("/join/code/<project_code>", endpoint="join-project", view_func=join_project, methods=["POST"])
+
+async_projects_blueprint.add_url_rule("/<project_id>/tasks/", endpoint="list-project-tasks", view_func=list_tasks, methods=["GET"])
+async_projects_blueprint.add_url_rule("/<project_id>/tasks/changes", endpoint="list-project-task-changes", view_func=list_task_changes, methods=["GET"])
+async_projects_blueprint.add_url_rule("/<project_id>/tasks/", endpoint="create-project-task", view_func=create_task, methods=["POST"])
+async_projects_blueprint.add_url_rule("/<project_id>/tasks/bulk", endpoint="bulk-project-tasks", view_func=bulk_tasks, methods=["POST"])
+async_projects_blueprint.add_url_rule("/<project_id>/tasks/<task_id>", endpoint="get-task", view_func=get_task, methods=["GET"])
+async_projects_blueprint.add_url_rule("/<project_id>/tasks/<task_id>", endpoint="edit-project-task", view_func=edit_task, methods=["PUT"])
+async_projects_blueprint.add_url_rule("/<project_id>/tasks/<task_id>", endpoint="delete-project-task", view_func=delete_task, methods=["DELETE"])
+async_projects_blueprint.add_url_rule("/<project_id>/tasks/<task_id>/status", endpoint="change-task-status", view_func=change_task_status, methods=["PUT"])
+async_projects_blueprint.add_url_rule("/<project_id>/tasks/<task_id>/assign", endpoint="change-task-assignee", view_func=change_assignee, methods=["PUT"])
\ No newline at end of file
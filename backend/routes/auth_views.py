@@ -0,0 +1,129 @@
+import logging
+import pydantic
+
+from routes.views import Reply, read_payload, read_user, error_reply, not_found
+from utils.token import generate_token, validate_token, token_expiry, TOKEN_NAME, REFRESH_TOKEN_NAME, ACCESS_TOKEN, REFRESH_TOKEN
+from validation.payload import UserCreatePayload, UserLoginPayload
+from validation.user import User
+from exceptions import BadPayloadError, DBOverloadError, NotFoundError, AlreadyExistError
+from exceptions.auth import IncorrectPasswordError, JWTError, HashingOverloadError
+
+logger = logging.getLogger(__name__)
+
+# parsing, replies and error mapping of the auth views, shared by the Flask and the Quart blueprint
+
+def read_register_payload(body: bytes):
+    payload, error = read_payload(UserCreatePayload, body)
+    if error:
+        return None, error
+
+    for field in ["username", "email", "password"]:
+        if not getattr(payload, field):
+            return None, error_reply("Invalid value in the input field", f"Field '{field}' can't be empty", "BAD_REQUEST", 400)
+    return payload, None
+
+def read_login_payload(body: bytes):
+    return read_payload(UserLoginPayload, body)
+
+def registered_reply(user_id: str):
+    return Reply({
+        "message": "User registered successfully",
+        "user_id": user_id
+    }, 201)
+
+def login_reply(user: dict):
+    """
+        Reply of a successful login, with the access and the refresh token cookies
+    """
+
+    response = Reply({
+        "user": user
+    })
+    access_expires = token_expiry(ACCESS_TOKEN)
+    jwt_token = generate_token(user, token_type=ACCESS_TOKEN, expires=access_expires)
+    response.set_cookie(TOKEN_NAME, jwt_token, expires=access_expires, httponly=True, secure=True)
+
+    refresh_expires = token_expiry(REFRESH_TOKEN)
+    refresh_token = generate_token(user, token_type=REFRESH_TOKEN, expires=refresh_expires)
+    response.set_cookie(REFRESH_TOKEN_NAME, refresh_token, expires=refresh_expires, path="/api/v1/auth/refresh", httponly=True, secure=True)
+    return response
+
+def refresh_reply(cookies):
+    """
+        Reply of the refresh view, a new access token cookie if the refresh token cookie is valid
+    """
+
+    token = cookies.get(REFRESH_TOKEN_NAME, None)
+    if not token:
+        return error_reply("Authorization failed", "No valid refresh token found in the request cookie", "UNAUTHORIZED", 401)
+
+    try:
+        payload = validate_token(token, token_type=REFRESH_TOKEN)
+        user = User(**payload)
+    except JWTError as e:
+        return error_reply("Authorization failed", str(e), "UNAUTHORIZED", 401)
+    except pydantic.ValidationError:
+        return error_reply("Invalid user data", "User data saved in the refresh token is corrupted", "UNAUTHORIZED", 401)
+
+    try:
+        user_details = {
+            "id": user.id,
+            "email": user.email,
+            "name": user.name,
+        }
+        response = Reply({
+            "user": user_details
+        })
+        access_expires = token_expiry(ACCESS_TOKEN)
+        jwt_token = generate_token(user_details, token_type=ACCESS_TOKEN, expires=access_expires)
+        response.set_cookie(TOKEN_NAME, jwt_token, expires=access_expires, httponly=True, secure=True)
+        return response
+    except Exception as e:
+        return auth_error(e)
+
+def me_reply(user: dict):
+    user_payload, error = read_user(user)
+    if error:
+        return error
+
+    return Reply({
+        "user": {
+            "id": user_payload.id,
+            "name": user_payload.name,
+            "email": user_payload.email
+        }
+    })
+
+def auth_error(e: Exception):
+    if isinstance(e, HashingOverloadError):
+        return error_reply("Server is busy", str(e), "SERVER_BUSY", 503, {"Retry-After": "1"})
+    if isinstance(e, JWTError):
+        return error_reply("Failed to create JWT token", str(e), "TOKEN_ERROR", 500)
+
+    logger.error("Unhandled error", exc_info=e)
+    return Reply({
+        "message": "Server failed to process the request",
+        "details": "Something bad happened in the server, please try again later",
+        "code": "SERVER_FAILURE"
+    }, 500)
+
+def register_error(e: Exception):
+    if isinstance(e, BadPayloadError):
+        return error_reply("Invalid input value", str(e), "BAD_REQUEST", 400)
+    if isinstance(e, AlreadyExistError):
+        return error_reply("User already exists", str(e), "BAD_REQUEST", 409)
+    if isinstance(e, DBOverloadError):
+        logger.warning("Database is overloaded: %s", e)
+        return Reply({
+            "message": "Database failed",
+            "details": "There are too many requests, please try again later",
+            "code": "DB_FAILURE"
+        }, 500)
+    return auth_error(e)
+
+def login_error(e: Exception):
+    if isinstance(e, NotFoundError):
+        return not_found(e)
+    if isinstance(e, IncorrectPasswordError):
+        return error_reply("Password is incorrect", str(e), "WRONG_PASSWORD", 400)
+    return auth_error(e)
\ No newline at end of file
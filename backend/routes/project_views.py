@@ -0,0 +1,214 @@
+import logging
+
+from validation.payload import CreateProjectPayload, CreateTaskPayload, EditTaskPayload, ChangeStatusPayload, ChangeAssigneePayload, BulkTasksPayload
+from routes.views import Reply, read_payload, error_reply, not_found, server_failure
+from config import Env
+from exceptions import BadPayloadError, DBOverloadError, DBIntegrityError, AlreadyExistError, NotFoundError
+from exceptions.project import NotProjectMemberError, NotProjectOwner, NotTaskAssigneeError
+
+logger = logging.getLogger(__name__)
+
+# parsing, replies and error mapping of the project views, shared by the Flask and the Quart blueprint
+
+def read_project_payload(body: bytes):
+    payload, error = read_payload(CreateProjectPayload, body)
+    if error:
+        return None, error
+
+    if not payload.name:
+        return None, error_reply("Invalid project name", "Field 'name' in project can't be empty", "BAD_REQUEST", 400)
+    if not payload.deadline:
+        return None, error_reply("Invalid project deadline", "Field 'deadline' in project can't be empty", "BAD_REQUEST", 400)
+    return payload, None
+
+def read_task_payload(body: bytes):
+    payload, error = read_payload(CreateTaskPayload, body)
+    if error:
+        return None, error
+
+    if not payload.name:
+        return None, error_reply("Invalid task name", "Field 'name' in task can't be empty", "BAD_REQUEST", 400)
+    if not payload.status:
+        return None, error_reply("Invalid task status", "Field 'status' in task can't be empty", "BAD_REQUEST", 400)
+    if not payload.assignee:
+        return None, error_reply("Invalid task assignee", "Field 'assignee' in task can't be empty", "BAD_REQUEST", 400)
+    return payload, None
+
+def read_edit_payload(body: bytes):
+    payload, error = read_payload(EditTaskPayload, body, "BAD_REQUEST")
+    if error:
+        return None, error
+
+    if not payload.name and not payload.description:
+        return None, error_reply("Invalid edit request", "Atleadt one field among 'name' and 'description' need to be present", "BAD_REQUEST", 400)
+    return payload, None
+
+def read_status_payload(body: bytes):
+    payload, error = read_payload(ChangeStatusPayload, body, "BAD_REQUEST")
+    if error:
+        return None, error
+
+    if not payload.status:
+        return None, error_reply("Invalid parameter to change status request", "Field required 'status'", "BAD_REQUEST", 422)
+    return payload, None
+
+def read_assignee_payload(body: bytes):
+    payload, error = read_payload(ChangeAssigneePayload, body, "BAD_REQUEST")
+    if error:
+        return None, error
+
+    if not payload.assignee:
+        return None, error_reply("Invalid parameters to change assignment request", "Field required 'assignee'", "BAD_REQUEST", 422)
+    return payload, None
+
+def read_bulk_payload(body: bytes):
+    payload, error = read_payload(BulkTasksPayload, body)
+    if error:
+        return None, error
+
+    if not payload.operations:
+        return None, error_reply("Invalid bulk request", "Field 'operations' can't be empty", "BAD_REQUEST", 400)
+    if len(payload.operations) > Env.BULK_MAX_OPERATIONS:
+        return None, error_reply("Invalid bulk request", f"At most {Env.BULK_MAX_OPERATIONS} operations can be sent in one request", "BAD_REQUEST", 400)
+    return payload, None
+
+def projects_reply(projects: list, next_cursor: str):
+    return Reply({
+        "message": "fetched all projects",
+        "data": projects,
+        "next_cursor": next_cursor
+    })
+
+def created_project_reply(project: dict):
+    return Reply({
+        "message": "Project created successfully",
+        "project": project,
+    }, 201)
+
+def project_reply(project: dict, tasks: list, next_cursor: str, etag: str):
+    return Reply({
+        "project": project,
+        "tasks": tasks,
+        "tasks_next_cursor": next_cursor
+    }, etag=etag)
+
+def summary_reply(summary: dict, etag: str):
+    return Reply({
+        "summary": summary
+    }, etag=etag)
+
+def members_reply(members: list, next_cursor: str, etag: str):
+    return Reply({
+        "members": members,
+        "next_cursor": next_cursor
+    }, etag=etag)
+
+def deleted_project_reply():
+    return Reply({
+        "message": "Project deleted successfully"
+    })
+
+def joined_project_reply(project: dict):
+    return Reply({
+        "message": "Successfully joined project",
+        "project": project
+    })
+
+def tasks_reply(tasks: list, next_cursor: str, etag: str):
+    return Reply({
+        "tasks": tasks,
+        "next_cursor": next_cursor
+    }, etag=etag)
+
+def task_reply(task: dict, etag: str):
+    return Reply({
+        "task": task
+    }, etag=etag)
+
+def changed_task_reply(message: str, task: dict, status: int = 200):
+    return Reply({
+        "message": message,
+        "task": task
+    }, status)
+
+def deleted_task_reply():
+    return Reply({
+        "message": "Task deleted successfully"
+    })
+
+def bulk_reply(results: list):
+    succeeded = len([result for result in results if result["ok"]])
+    return Reply({
+        "message": "Bulk operations processed",
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results
+    })
+
+def not_member(e: Exception):
+    return error_reply("User is not a project member", str(e), "NOT_MEMBER", 403)
+
+def bad_pagination(e: Exception):
+    return error_reply("Invalid pagination parameter", str(e), "BAD_REQUEST", 400)
+
+def list_projects_error(e: Exception):
+    if isinstance(e, BadPayloadError):
+        return bad_pagination(e)
+    if isinstance(e, DBOverloadError):
+        return server_failure(e)
+
+    logger.error("Unhandled error", exc_info=e)
+    return error_reply("Unknown server error occured", "We are working on the server, please try again later", "SERVER_FAILURE", 500)
+
+def create_project_error(e: Exception):
+    if isinstance(e, NotFoundError):
+        return not_found(e)
+    if isinstance(e, DBIntegrityError):
+        return error_reply(str(e), "While creating membership and project intance, integrity error happened", "SERVER_FAILURE", 500)
+    return server_failure(e)
+
+def member_error(e: Exception):
+    """
+        Reply for an error of a view that only needs the user to be a project member
+    """
+
+    if isinstance(e, NotProjectMemberError):
+        return not_member(e)
+    if isinstance(e, NotFoundError):
+        return not_found(e)
+    return server_failure(e)
+
+def page_error(e: Exception):
+    """
+        Reply for an error of a paginated view of a project
+    """
+
+    if isinstance(e, BadPayloadError):
+        return bad_pagination(e)
+    return member_error(e)
+
+def owner_error(e: Exception, message: str = "User is not an owner of the project"):
+    """
+        Reply for an error of a view only the project owner can use
+    """
+
+    if isinstance(e, NotProjectOwner):
+        return error_reply(message, str(e), "NOT_OWNER", 403)
+    return member_error(e)
+
+def join_project_error(e: Exception):
+    if isinstance(e, AlreadyExistError):
+        return error_reply("User is already a member", str(e), "ALREADY_MEMBER", 409)
+    if isinstance(e, NotFoundError):
+        return not_found(e)
+    return server_failure(e)
+
+def edit_task_error(e: Exception):
+    if isinstance(e, NotTaskAssigneeError):
+        return error_reply("User is not an owner or the task assignee", str(e), "NOT_ASSIGNEE", 403)
+    return member_error(e)
+
+def bulk_tasks_error(e: Exception):
+    if isinstance(e, DBIntegrityError):
+        return error_reply(str(e), "None of the operations were applied", "SERVER_FAILURE", 500)
+    return member_error(e)
\ No newline at end of file
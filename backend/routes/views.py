@@ -0,0 +1,103 @@
+import logging
+import pydantic
+
+from validation.user import User
+from utils.conditional import cache_headers
+from exceptions import DBOverloadError
+
+logger = logging.getLogger(__name__)
+
+class Reply:
+    """
+        Response built by the helpers the Flask and the Quart views share, a JSON body (none for a 304)
+        with its status, headers, cookies and the ETag of a cacheable read
+    """
+
+    def __init__(self, body=None, status: int = 200, headers: dict = None, etag: str = None):
+        self.body = body
+        self.status = status
+        self.headers = headers or {}
+        self.etag = etag
+        self.cookies = []
+
+    def set_cookie(self, *args, **kwargs):
+        self.cookies.append((args, kwargs))
+
+def validation_errors(e: pydantic.ValidationError):
+    errors = []
+    for err in e.errors():
+        errors.append({
+            "message": err["msg"],
+            "input": err["input"],
+            "loc": err["loc"]
+        })
+    return errors
+
+def error_reply(message: str, details: str, code: str, status: int, headers: dict = None):
+    return Reply({
+        "error": {
+            "message": message,
+            "details": details,
+            "code": code
+        }
+    }, status, headers)
+
+def invalid_input(e: pydantic.ValidationError, code: str = "INVALID_INPUT"):
+    return Reply({
+        "error": {
+            "message": "Input validation failed",
+            "details": "Please make sure your input has required fields with their correct type",
+            "errors": validation_errors(e),
+            "code": code
+        }
+    }, 422)
+
+def read_payload(model, body: bytes, code: str = "INVALID_INPUT"):
+    """
+        Payload `model` parsed from the request body and None, or None and the reply of the validation error
+    """
+
+    try:
+        return model.model_validate_json(body), None
+    except pydantic.ValidationError as e:
+        return None, invalid_input(e, code)
+
+def read_user(user: dict):
+    """
+        User the authorize middleware put on the request and None, or None and the reply if it's corrupted
+    """
+
+    try:
+        return User(**user), None
+    except pydantic.ValidationError as e:
+        logger.error("Invalid user data in token: %s", validation_errors(e))
+        return None, error_reply("Invalid user data", "User data saved at server is corrupted", "SERVER_FAILURE", 500)
+
+def not_found(e: Exception):
+    return error_reply("Value not found", str(e), "NOT_FOUND", 404)
+
+def server_failure(e: Exception):
+    if isinstance(e, DBOverloadError):
+        return error_reply("Server is overloaded", str(e), "SERVER_FAILURE", 500)
+
+    logger.error("Unhandled error", exc_info=e)
+    return error_reply("Something went wrong in the server", "We are working on the error, please try again later", "SERVER_FAILURE", 500)
+
+def _finish(response, reply: Reply):
+    response.headers.update(reply.headers)
+    for args, kwargs in reply.cookies:
+        response.set_cookie(*args, **kwargs)
+    if reply.etag:
+        cache_headers(response, reply.etag)
+    return response
+
+def flask_response(reply: Reply):
+    from flask import jsonify, make_response
+
+    return _finish(make_response(jsonify(reply.body) if reply.body is not None else "", reply.status), reply)
+
+async def quart_response(reply: Reply):
+    # imported here so the WSGI app doesn't need the async extras installed
+    from quart import jsonify, make_response
+
+    return _finish(await make_response(jsonify(reply.body) if reply.body is not None else "", reply.status), reply)
\ No newline at end of file
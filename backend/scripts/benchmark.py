@@ -0,0 +1,58 @@
+import argparse, sys
+
+from env import load_dotenv
+load_dotenv()
+
+from db import Database
+from benchmarks.dataset import DatasetSize, create_database, seed
+from benchmarks.cases import project_cases, auth_cases
+from benchmarks.runner import StatementCounter, run_case, format_results, save_baseline, load_baseline, check_baseline, compare
+
+parser = argparse.ArgumentParser(description="Times the ProjectService and AuthService methods on a seeded database")
+parser.add_argument("--database-url", default="sqlite://",
+                    help="empty database to seed, an in-memory SQLite database by default (use a throwaway PostgreSQL database for real numbers)")
+parser.add_argument("--users", type=int, default=DatasetSize.users)
+parser.add_argument("--projects", type=int, default=DatasetSize.projects)
+parser.add_argument("--members", type=int, default=DatasetSize.members, help="members of every project besides its owner")
+parser.add_argument("--tasks", type=int, default=DatasetSize.tasks, help="tasks of every project")
+parser.add_argument("--iterations", type=int, default=50)
+parser.add_argument("--warmup", type=int, default=5)
+parser.add_argument("--only", default="", help="run only the cases whose name contains this text")
+parser.add_argument("--save", metavar="PATH", help="save the results as a baseline")
+parser.add_argument("--compare", metavar="PATH", help="compare the results to a saved baseline, exits with 1 on a regression")
+parser.add_argument("--threshold", type=float, default=0.2, help="p50 growth counted as a regression (default 0.2 = 20%%)")
+args = parser.parse_args()
+
+size = DatasetSize(users=args.users, projects=args.projects, members=args.members, tasks=args.tasks)
+engine = create_database(args.database_url)
+Database.use(engine)
+dialect = engine.dialect.name
+
+baseline = None
+if args.compare:
+    baseline = load_baseline(args.compare)
+    try:
+        check_baseline(baseline, dialect=dialect, size=size)
+    except ValueError as e:
+        sys.exit(str(e))
+
+dataset = seed(engine, size)
+counter = StatementCounter(engine)
+cases = [case for case in project_cases(dataset, engine) + auth_cases(dataset) if args.only in case.name]
+results = []
+for case in cases:
+    results.append(run_case(case, counter, iterations=args.iterations, warmup=args.warmup))
+    print(f"done {case.name}", file=sys.stderr)
+
+print(f"{dialect}, {size.users} users, {size.projects} projects, {size.members} members and {size.tasks} tasks per project, latency in ms")
+print(format_results(results))
+
+if args.save:
+    save_baseline(args.save, results, dialect=dialect, size=size)
+    print(f"saved baseline to {args.save}")
+
+if baseline is not None:
+    lines, regressed = compare(results, baseline, threshold=args.threshold)
+    print("\n".join(lines))
+    if regressed:
+        sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,46 @@
+import argparse, sys
+
+from env import load_dotenv
+load_dotenv()
+
+from benchmarks.load import AppClient, HttpClient, parse_mix, run_stage, format_stage, stage_summary, DEFAULT_MIX
+
+parser = argparse.ArgumentParser(description="Drives the API with concurrent signed in virtual users and reports latency per endpoint")
+parser.add_argument("--url", help="base URL of a running server, e.g. http://localhost:8000, the app of app.py is called in process when missing")
+parser.add_argument("--concurrency", default="10", help="virtual users, a comma separated list runs one stage per value (e.g. 1,10,50,100)")
+parser.add_argument("--duration", type=float, default=30, help="seconds every stage runs")
+parser.add_argument("--mix", default="", help=f"weights of the operations (default {','.join(f'{name}={weight}' for name, weight in DEFAULT_MIX.items())})")
+parser.add_argument("--email", default="user{i}.s0@seed.local", help="email pattern of the accounts, {i} is the account number (default matches scripts.seed)")
+parser.add_argument("--accounts", type=int, default=100000, help="number of accounts matching the pattern")
+parser.add_argument("--password", default="seed-password")
+parser.add_argument("--seed", type=int, default=0)
+args = parser.parse_args()
+
+try:
+    mix = parse_mix(args.mix)
+except ValueError as e:
+    sys.exit(str(e))
+stages = [int(value) for value in args.concurrency.split(",")]
+
+if args.url:
+    make_client = lambda: HttpClient(args.url)
+else:
+    from app import app
+    make_client = lambda: AppClient(app)
+
+accounts = [(args.email.format(i=i), args.password) for i in range(args.accounts)]
+summary = []
+for concurrency in stages:
+    try:
+        recorder, elapsed = run_stage(make_client, accounts, concurrency=concurrency, duration=args.duration, mix=mix, seed=args.seed)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(format_stage(recorder, elapsed, concurrency))
+    print()
+    summary.append((concurrency, *stage_summary(recorder, elapsed)))
+
+if len(summary) > 1:
+    # throughput that stops growing while p95 keeps rising marks the saturation point
+    print(f"{'users':>6} {'req/s':>9} {'error %':>8} {'p95':>9}")
+    for concurrency, throughput, error_rate, p95 in summary:
+        print(f"{concurrency:>6} {throughput:>9.1f} {error_rate:>8.2%} {p95:>9.2f}")
\ No newline at end of file
@@ -0,0 +1,22 @@
+import sys
+
+from env import load_dotenv
+load_dotenv()
+
+from db import Database
+from migrations import migrate, pending_migrations
+
+database = Database()
+
+if "--status" in sys.argv:
+    pending = pending_migrations(database.engine)
+    if not pending:
+        print("Database is up to date")
+    for migration in pending:
+        print(f"pending {migration.revision}: {migration.description}")
+else:
+    applied = migrate(database.engine)
+    if not applied:
+        print("Database is up to date")
+    for migration in applied:
+        print(f"applied {migration.revision}: {migration.description}")
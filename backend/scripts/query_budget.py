@@ -0,0 +1,58 @@
+import argparse, sys
+
+from env import load_dotenv
+load_dotenv()
+
+from db import Database
+from benchmarks.dataset import DatasetSize, create_database, seed
+from benchmarks.budget import BUDGETS, QueryBudgetExceeded, check_budget, measure
+
+parser = argparse.ArgumentParser(description="Checks that every endpoint stays within its SQL statement budget on a small and a large project")
+parser.add_argument("--only", default="", help="check only the endpoints whose name contains this text")
+parser.add_argument("--verbose", action="store_true", help="print the statements of every request, not only of the failing ones")
+args = parser.parse_args()
+
+# the same requests on a small and a large project, a count that grows with the project is an N+1
+sizes = [
+    DatasetSize(users=10, projects=2, members=2, tasks=5),
+    DatasetSize(users=60, projects=2, members=40, tasks=300),
+]
+budgets = [budget for budget in BUDGETS if args.only in budget.endpoint]
+
+runs = []
+for size in sizes:
+    engine = create_database("sqlite://")
+    Database.use(engine)
+    dataset = seed(engine, size)
+    # imported once a database is in place, the middlewares instrument its engine
+    from app import app
+    runs.append(measure(app, dataset, engine, budgets))
+
+print(f"{'endpoint':<40} {'budget':>6} {'small':>6} {'large':>6}  result")
+failed = False
+for by_size in zip(*runs):
+    small, large = by_size
+    problems = []
+    if any(measurement.status >= 400 for measurement in by_size):
+        problems.append(f"status {'/'.join(str(measurement.status) for measurement in by_size)}")
+    exceeded = []
+    for name, measurement in zip(("small", "large"), by_size):
+        try:
+            check_budget(f"{measurement.endpoint} ({name})", measurement.statements, measurement.budget)
+        except QueryBudgetExceeded as e:
+            exceeded.append(str(e))
+    if exceeded:
+        problems.append("over budget")
+    if len(large.statements) > len(small.statements):
+        problems.append("grows with the project")
+
+    print(f"{small.endpoint:<40} {small.budget:>6} {len(small.statements):>6} {len(large.statements):>6}  {', '.join(problems) or 'ok'}")
+    for message in exceeded:
+        print(f"  {message}")
+    if not exceeded and (problems or args.verbose):
+        for i, statement in enumerate(large.statements, start=1):
+            print(f"    {i}. {' '.join(statement.split())}")
+    failed = failed or bool(problems)
+
+if failed:
+    sys.exit(1)
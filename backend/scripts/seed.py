@@ -0,0 +1,75 @@
+import argparse, sys, time
+
+from env import load_dotenv
+load_dotenv()
+
+from sqlalchemy import create_engine, text
+from db import Database
+from migrations import migrate
+from models import Base
+from utils.password import hash_password
+from benchmarks.population import Population, CopyWriter, InsertWriter, user_rows, project_rows, membership_rows, task_rows
+
+parser = argparse.ArgumentParser(description="Fills the database with a large generated dataset, the same seed always generates the same rows")
+parser.add_argument("--database-url", help="database to fill, the one of the DB_* settings by default")
+parser.add_argument("--users", type=int, default=100000)
+parser.add_argument("--projects", type=int, default=20000)
+parser.add_argument("--memberships", type=int, default=200000)
+parser.add_argument("--tasks", type=int, default=2000000)
+parser.add_argument("--alpha", type=float, default=1.16, help="Pareto shape of project sizes, lower is more skewed (default 1.16)")
+parser.add_argument("--seed", type=int, default=0, help="seed of the generator, also part of every generated id")
+parser.add_argument("--password", default="seed-password", help="password of every generated user")
+parser.add_argument("--batch-size", type=int, default=50000)
+args = parser.parse_args()
+
+try:
+    population = Population(users=args.users, projects=args.projects, memberships=args.memberships, tasks=args.tasks,
+                            alpha=args.alpha, seed=args.seed)
+except ValueError as e:
+    sys.exit(str(e))
+
+engine = create_engine(args.database_url) if args.database_url else Database().engine
+if engine.dialect.name == "sqlite":
+    # the migrations are written for PostgreSQL
+    Base.metadata.create_all(engine)
+else:
+    migrate(engine)
+
+member_counts = population.shares(population.memberships, minimum=1)
+task_counts = population.shares(population.tasks, minimum=0)
+counters = []
+tables = [
+    ("users", lambda: user_rows(population, hash_password(args.password))),
+    ("projects", lambda: project_rows(population)),
+    ("memberships", lambda: membership_rows(population, member_counts)),
+    ("tasks", lambda: task_rows(population, member_counts, task_counts, counters)),
+    ("task_counters", lambda: iter(counters)),
+]
+
+started = time.perf_counter()
+if engine.dialect.name == "postgresql":
+    connection = engine.raw_connection()
+    try:
+        writer = CopyWriter(connection, batch_size=args.batch_size)
+        for table, rows in tables:
+            table_started = time.perf_counter()
+            written = writer.write(table, rows())
+            print(f"{table}: {written} rows in {time.perf_counter() - table_started:.1f}s")
+        connection.commit()
+    finally:
+        connection.close()
+
+    # fresh statistics, otherwise the planner keeps choosing plans for the empty tables
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE"))
+else:
+    with engine.begin() as connection:
+        writer = InsertWriter(connection, batch_size=args.batch_size)
+        for table, rows in tables:
+            table_started = time.perf_counter()
+            written = writer.write(table, rows())
+            print(f"{table}: {written} rows in {time.perf_counter() - table_started:.1f}s")
+
+largest = max(range(population.projects), key=lambda p: task_counts[p])
+print(f"seeded in {time.perf_counter() - started:.1f}s, largest project {population.project_id(largest)} has "
+      f"{task_counts[largest]} tasks and {member_counts[largest]} members, every user's password is '{args.password}'")
\ No newline at end of file
@@ -0,0 +1,132 @@
+import argparse, glob, hashlib, json, os, re, sys
+
+from env import load_dotenv
+load_dotenv()
+
+from config import Env
+
+PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+ROWS = re.compile(r"\(\?\.\.\.\)(?:\s*,\s*\(\?\.\.\.\))+")
+SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+def normalize(statement: str):
+    """
+        Statement with its values, placeholders and lists of values replaced so the same query
+        with other parameters or another number of IN values falls in the same group
+    """
+
+    query = STRING.sub("?", statement)
+    query = PLACEHOLDER.sub("?", query)
+    query = NUMBER.sub("?", query)
+    query = " ".join(query.split())
+    query = LIST.sub("(?...)", query)
+    return ROWS.sub("(?...), ...", query)
+
+def log_files(path: str):
+    # rotated files are path.1 (newest) to path.N (oldest), read them oldest first
+    rotated = [name for name in glob.glob(glob.escape(path) + ".*") if name.rsplit(".", 1)[1].isdigit()]
+    rotated.sort(key=lambda name: int(name.rsplit(".", 1)[1]), reverse=True)
+    return rotated + ([path] if os.path.exists(path) else [])
+
+def read_entries(paths, since: str = None):
+    for path in paths:
+        with open(path) as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if since and entry.get("time", "") < since:
+                    continue
+                yield entry
+
+class Group:
+    def __init__(self, query: str):
+        self.query = query
+        self.fingerprint = hashlib.sha1(query.encode('utf-8')).hexdigest()[:12]
+        self.durations = []
+        self.services = {}
+        self.seq_scans = set()
+        self.slowest = None
+
+    def add(self, entry: dict):
+        duration = entry["duration_ms"]
+        self.durations.append(duration)
+        service = entry.get("service") or "outside a service"
+        self.services[service] = self.services.get(service, 0) + 1
+        if "plan" in entry:
+            self.seq_scans.update(SEQ_SCAN.findall(entry["plan"]))
+        if self.slowest is None or duration > self.slowest["duration_ms"]:
+            self.slowest = entry
+
+    @property
+    def total(self):
+        return sum(self.durations)
+
+    def percentile(self, share: float):
+        ordered = sorted(self.durations)
+        return ordered[min(int(len(ordered) * share), len(ordered) - 1)]
+
+def group_entries(entries):
+    groups = {}
+    for entry in entries:
+        query = normalize(entry["statement"])
+        group = groups.get(query)
+        if group is None:
+            group = groups[query] = Group(query)
+        group.add(entry)
+    return list(groups.values())
+
+def format_group(rank: int, group: Group, plans: bool):
+    lines = [
+        f"#{rank} {group.fingerprint}  count {len(group.durations)}  total {group.total:.1f} ms  "
+        f"p50 {group.percentile(0.5):.1f} ms  p95 {group.percentile(0.95):.1f} ms  max {max(group.durations):.1f} ms",
+        f"  {group.query}",
+    ]
+    for service, count in sorted(group.services.items(), key=lambda item: -item[1]):
+        lines.append(f"  from {service} ({count})")
+    if group.seq_scans:
+        lines.append(f"  sequential scan on {', '.join(sorted(group.seq_scans))}, check the indexes of these tables")
+
+    slowest = group.slowest
+    lines.append(f"  slowest at {slowest.get('time')} with {json.dumps(slowest.get('parameters'))}"
+                 + (f", trace {slowest['trace_id']}" if slowest.get("trace_id") else ""))
+    if plans and "plan" in slowest:
+        lines.extend("    " + line for line in slowest["plan"].splitlines())
+    return "\n".join(lines)
+
+SORT_KEYS = {
+    "total": lambda group: group.total,
+    "count": lambda group: len(group.durations),
+    "max": lambda group: max(group.durations),
+}
+
+parser = argparse.ArgumentParser(description="Summarizes the slow query log by normalized query")
+parser.add_argument("--log", default=Env.SLOW_QUERY_LOG, help="slow query log, its rotated files are read too (default SLOW_QUERY_LOG)")
+parser.add_argument("--since", help="only entries logged at or after this ISO time, e.g. 2024-05-01T12:00")
+parser.add_argument("--sort", choices=sorted(SORT_KEYS), default="total")
+parser.add_argument("--top", type=int, default=20, help="groups printed (default 20)")
+parser.add_argument("--plans", action="store_true", help="print the plan of the slowest entry of every group when it has one")
+args = parser.parse_args()
+
+paths = log_files(args.log)
+if not paths:
+    sys.exit(f"{args.log} not found")
+
+groups = group_entries(read_entries(paths, since=args.since))
+if not groups:
+    print("No slow queries logged")
+    sys.exit(0)
+
+groups.sort(key=SORT_KEYS[args.sort], reverse=True)
+print(f"{sum(len(group.durations) for group in groups)} slow statements in {len(groups)} queries, sorted by {args.sort}\n")
+for rank, group in enumerate(groups[:args.top], start=1):
+    print(format_group(rank, group, plans=args.plans))
+    print()
+
+scanned = sorted({table for group in groups for table in group.seq_scans})
+if scanned:
+    print(f"Sequential scans in sampled plans: {', '.join(scanned)}")
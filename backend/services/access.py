@@ -0,0 +1,141 @@
+from sqlalchemy import select, and_
+from sqlalchemy.orm import aliased
+
+from config import Env
+from models import Project, User, Membership, Task
+from models.membership import Role
+from utils.cache import LRUCache, publish_stats
+from exceptions import NotFoundError
+from exceptions.project import NotProjectMemberError, NotProjectOwner
+
+# (user_id, project_id) -> Role, memberships only change in ProjectService.create_projects, join_project and 
+# delete_project which update it; other workers see those changes once their entry expires
+membership_cache = LRUCache(maxsize=Env.MEMBERSHIP_CACHE_SIZE, ttl=Env.MEMBERSHIP_CACHE_TTL)
+publish_stats("membership", membership_cache)
+
+class AccessContext:
+    """
+        Everything a project scoped request needs to authorize the caller, loaded by `load_access_context`
+    """
+
+    def __init__(self, project_id: str, user_id: str, project: Project = None, role: Role = None, 
+                 task_id: str = None, task: Task = None, task_assignee: User = None, 
+                 assignee_id: str = None, assignee: User = None, assignee_role: Role = None):
+        self.project_id = project_id
+        self.user_id = user_id
+        self.project = project
+        self.role = role
+        self.task_id = task_id
+        self.task = task
+        self.task_assignee = task_assignee
+        self.assignee_id = assignee_id
+        self.assignee = assignee
+        self.assignee_role = assignee_role
+
+    def require_project(self, message: str = None):
+        if not self.project:
+            raise NotFoundError(message or f"Project with id {self.project_id} not found")
+
+    def require_member(self):
+        if not self.role:
+            raise NotProjectMemberError(f"User with id {self.user_id} is not a member of the project with id {self.project_id}")
+
+    def require_owner(self, message: str = None):
+        if self.role != Role.Owner:
+            raise NotProjectOwner(message or f"User with id {self.user_id} is not the owner of the project with id {self.project_id}")
+
+    def require_task(self):
+        if not self.task:
+            raise NotFoundError(f"Task with id {self.task_id} not found")
+
+    def require_assignee(self, message: str = None):
+        if not self.assignee:
+            raise NotFoundError(message or f"User with id {self.assignee_id} is not a valid assignee")
+
+    def require_assignee_member(self):
+        if not self.assignee_role:
+            raise NotProjectMemberError(f"Assignee with id {self.assignee_id} is not a member of the project with id {self.project_id}")
+
+def access_context_statement(project_id: str, user_id: str, task_id: str = None, assignee_id: str = None):
+    """
+        Single statement returning the project, the caller's role and optionally the task with its assignee 
+        and a prospective assignee with their role, every part is outer joined so a missing one comes back as NULL
+    """
+
+    caller = aliased(Membership)
+    statement = select(Project, caller.role).outerjoin(caller, and_(caller.project_id==Project.id, caller.user_id==user_id))
+
+    if task_id:
+        task_assignee = aliased(User)
+        statement = statement.add_columns(Task, task_assignee) \
+                             .outerjoin(Task, and_(Task.id==task_id, Task.project_id==Project.id)) \
+                             .outerjoin(task_assignee, task_assignee.id==Task.assignee)
+    
+    if assignee_id:
+        assignee = aliased(User)
+        assignee_membership = aliased(Membership)
+        statement = statement.add_columns(assignee, assignee_membership.role) \
+                             .outerjoin(assignee, assignee.id==assignee_id) \
+                             .outerjoin(assignee_membership, and_(assignee_membership.project_id==Project.id, assignee_membership.user_id==assignee_id))
+
+    return statement.where(Project.id==project_id)
+
+def access_context_from_row(row, project_id: str, user_id: str, task_id: str = None, assignee_id: str = None):
+    context = AccessContext(project_id=project_id, user_id=user_id, task_id=task_id, assignee_id=assignee_id)
+    if row is None:
+        return context
+    
+    row = list(row)
+    context.project, context.role = row[0], row[1]
+    row = row[2:]
+    if task_id:
+        context.task, context.task_assignee = row[0], row[1]
+        row = row[2:]
+    if assignee_id:
+        context.assignee, context.assignee_role = row[0], row[1]
+
+    return context
+
+def load_access_context(session, project_id: str, user_id: str, task_id: str = None, assignee_id: str = None):
+    statement = access_context_statement(project_id=project_id, user_id=user_id, task_id=task_id, assignee_id=assignee_id)
+    row = session.execute(statement).first()
+    context = access_context_from_row(row, project_id=project_id, user_id=user_id, task_id=task_id, assignee_id=assignee_id)
+    if context.role:
+        membership_cache.set((user_id, project_id), context.role)
+
+    return context
+
+def load_member_role(session, project_id: str, user_id: str):
+    """
+        Role of a project member, from the membership cache when possible. 
+        Raises NotFoundError for an unknown project and NotProjectMemberError for a non member
+    """
+
+    role = membership_cache.get((user_id, project_id))
+    if role is not None:
+        return role
+    
+    context = load_access_context(session, project_id=project_id, user_id=user_id)
+    context.require_project()
+    context.require_member()
+    return context.role
+
+
+async def load_access_context_async(session, project_id: str, user_id: str, task_id: str = None, assignee_id: str = None):
+    statement = access_context_statement(project_id=project_id, user_id=user_id, task_id=task_id, assignee_id=assignee_id)
+    row = (await session.execute(statement)).first()
+    context = access_context_from_row(row, project_id=project_id, user_id=user_id, task_id=task_id, assignee_id=assignee_id)
+    if context.role:
+        membership_cache.set((user_id, project_id), context.role)
+
+    return context
+
+async def load_member_role_async(session, project_id: str, user_id: str):
+    role = membership_cache.get((user_id, project_id))
+    if role is not None:
+        return role
+    
+    context = await load_access_context_async(session, project_id=project_id, user_id=user_id)
+    context.require_project()
+    context.require_member()
+    return context.role
\ No newline at end of file
@@ -0,0 +1,85 @@
+import logging
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError, IntegrityError
+
+from models.user import User
+from db import AsyncDatabase
+from utils.id import generate_id
+from utils.password import hash_password_async, check_password_async, needs_rehash
+from utils.tracing import traced_methods
+from services.auth import EMAIL_PATTERN, upgrade_hash_statement
+from services import serializers
+from exceptions import BadPayloadError, NotFoundError, DBOverloadError, AlreadyExistError
+from exceptions.auth import IncorrectPasswordError, HashingOverloadError
+
+logger = logging.getLogger(__name__)
+
+@traced_methods
+class AsyncAuthService:
+    """
+        Async twin of AuthService, bcrypt runs on the bcrypt threads of utils.password 
+        and the event loop only waits for it
+    """
+
+    def __init__(self):
+        self.session = AsyncDatabase().get_session()
+
+    async def register(self, username: str, email: str, password: str):
+        if not EMAIL_PATTERN.match(email):
+            raise BadPayloadError("'email' field value is not a valid email")
+
+        try:
+            async with self.session() as session:
+                user = (await session.execute(select(User).where(User.email==email))).scalars().first()
+                if user:
+                    raise AlreadyExistError(f"User with email {email} already exist")
+
+            # hashed outside the session so no pooled connection waits on bcrypt
+            password_hash = await hash_password_async(password)
+
+            user = User(generate_id('USER_'), username, email, password_hash)
+            async with self.session() as session:
+                session.add(user)
+                await session.commit()
+
+                return user.id
+        except IntegrityError:
+            raise AlreadyExistError(f"User with email {email} already exist")
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def login(self, email: str, password: str):
+        try:
+            async with self.session() as session:
+                user = (await session.execute(select(User).where(User.email==email))).scalars().first()
+                
+                if not user:
+                    raise NotFoundError(f"User with email {email} does not exist")
+
+                user_details = serializers.user_details(user)
+                password_hash = user.password_hash
+                
+            if not await check_password_async(password, password_hash):
+                raise IncorrectPasswordError()
+
+            if needs_rehash(password_hash):
+                await self.upgrade_password_hash(user_details["id"], password_hash, password)
+            
+            return user_details
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def upgrade_password_hash(self, user_id: str, password_hash: str, password: str):
+        try:
+            new_hash = await hash_password_async(password)
+        except HashingOverloadError:
+            return
+
+        try:
+            async with self.session() as session:
+                await session.execute(upgrade_hash_statement(user_id, password_hash, new_hash))
+                await session.commit()
+        except OperationalError:
+            logger.warning("Upgrading the password hash of %s failed", user_id, exc_info=True)
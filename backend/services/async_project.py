@@ -0,0 +1,392 @@
+import logging
+from datetime import datetime, date
+from sqlalchemy import select, delete, and_
+from sqlalchemy.exc import OperationalError, IntegrityError
+
+from db import AsyncDatabase
+from utils.id import generate_id
+from utils.pagination import page_statement, split_page, decode_change_cursor, DEFAULT_PAGE_SIZE
+from utils.tracing import traced_methods
+from services.access import load_access_context_async, load_member_role_async, membership_cache
+from services.project import join_project_statement
+from services import serializers
+from services.counters import counter_upsert, task_added, task_removed, task_moved, locked_task_statement, summary_statement
+from services.versions import version_statement, bump_version_statement
+from services.changes import changed_tasks_statement, tombstones_statement, merge_changes
+from services.events import publish_project_event_async, publish_bulk_event_async, TASK_CREATED, TASK_DELETED, TASK_EDITED, TASK_STATUS_CHANGED, TASK_ASSIGNED, MEMBER_JOINED, PROJECT_DELETED
+from services.bulk import bulk_lookup_statements, plan_bulk_operations, bulk_write_statements
+from models import Project, User, Membership, Task, TaskTombstone
+from models.membership import Role
+from models.project import TaskStatus
+from exceptions import DBOverloadError, DBIntegrityError, NotFoundError, AlreadyExistError
+from exceptions.project import NotProjectMemberError, NotTaskAssigneeError
+
+logger = logging.getLogger(__name__)
+
+@traced_methods
+class AsyncProjectService:
+    """
+        Async twin of ProjectService for the ASGI app, same checks, errors and return values
+    """
+
+    def __init__(self):
+        self.session = AsyncDatabase().get_session()
+
+    async def update_counters(self, session, project_id: str, deltas):
+        upsert = counter_upsert(session.bind.dialect.name, project_id, deltas)
+        if upsert:
+            await session.execute(*upsert)
+
+    async def lock_task(self, session, task_id: str):
+        task = (await session.execute(locked_task_statement(task_id))).scalars().first()
+        if not task:
+            raise NotFoundError(f"Task with id {task_id} not found")
+        return task
+
+    async def list_projects(self, user_id, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+        try:
+            async with self.session() as session:
+                statement = select(Project, Membership).where(and_(Project.id==Membership.project_id, Membership.user_id==user_id))
+                statement = page_statement(statement, Project.created_at, Project.id, limit=limit, cursor=cursor)
+                rows = (await session.execute(statement)).all()
+                projects, next_cursor = split_page(rows, key=lambda row: (row[0].created_at, row[0].id), limit=limit)
+                
+                return [serializers.project_list_item(project, member.role) for project, member in projects], next_cursor
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def create_projects(self, name: str, description: str, deadline: datetime, user_id: str):
+        project_id = generate_id("PROJECT_")
+        project_code = generate_id(size=5)
+
+        try:
+            async with self.session() as session:
+                project_instance = Project(id=project_id, name=name, description=description, deadline=deadline, code=project_code)
+                user = await session.get(User, user_id)
+                if not user:
+                    raise NotFoundError(f"User with id {user_id} not found")
+                
+                member = Membership(user_id=user.id, project_id=project_id, role=Role.Owner)
+
+                session.add(project_instance)
+                await session.flush()
+                session.add(member)
+                await session.commit()
+                membership_cache.set((user_id, project_id), Role.Owner)
+
+                await session.refresh(project_instance)
+                return serializers.created_project(project_instance)
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+        except IntegrityError:
+            logger.exception("Database rejected the write")
+            raise DBIntegrityError()
+
+    async def get_version(self, project_id: str, user_id: str):
+        """
+            (version, role) of a project for conditional reads, raises like the reads it stands in for
+        """
+
+        try:
+            async with self.session() as session:
+                row = (await session.execute(version_statement(project_id=project_id, user_id=user_id))).first()
+                if not row:
+                    raise NotFoundError(f"Project with id {project_id} not found")
+                
+                version, role = row
+                if not role:
+                    raise NotProjectMemberError(f"User with id {user_id} is not a member of the project with id {project_id}")
+                membership_cache.set((user_id, project_id), role)
+
+                return version, role
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def get_project(self, project_id: str, user_id: str):
+        try:
+            async with self.session() as session:
+                context = await load_access_context_async(session, project_id=project_id, user_id=user_id)
+                context.require_project()
+                context.require_member()
+
+                return serializers.project_details(context.project, context.role)
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def get_tasks(self, project_id: str, user_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+        try:
+            async with self.session() as session:
+                await load_member_role_async(session, project_id=project_id, user_id=user_id)
+                
+                statement = select(Task, User).join(User, User.id==Task.assignee).where(Task.project_id==project_id)
+                statement = page_statement(statement, Task.created_at, Task.id, limit=limit, cursor=cursor)
+                rows = (await session.execute(statement)).all()
+                task_instances, next_cursor = split_page(rows, key=lambda row: (row[0].created_at, row[0].id), limit=limit)
+
+                return [serializers.task_list_item(task, assignee) for task, assignee in task_instances], next_cursor
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def get_changes(self, project_id: str, user_id: str, since: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        version, id = decode_change_cursor(since)
+        try:
+            async with self.session() as session:
+                await load_member_role_async(session, project_id=project_id, user_id=user_id)
+
+                task_rows = (await session.execute(changed_tasks_statement(project_id, version, id, limit))).all()
+                tombstone_rows = (await session.execute(tombstones_statement(project_id, version, id, limit))).all()
+                changed, deleted, next_cursor, has_more = merge_changes(task_rows, tombstone_rows, limit, version, id)
+
+                return {
+                    "changed": [serializers.task_change(task, assignee) for task, assignee in changed], 
+                    "deleted": deleted, 
+                    "next_cursor": next_cursor, 
+                    "has_more": has_more
+                }
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def get_members(self, project_id: str, user_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+        try:
+            async with self.session() as session:
+                await load_member_role_async(session, project_id=project_id, user_id=user_id)
+
+                statement = select(Membership, User).join(User, User.id==Membership.user_id).where(Membership.project_id==project_id)
+                statement = page_statement(statement, Membership.created_at, Membership.user_id, limit=limit, cursor=cursor)
+                rows = (await session.execute(statement)).all()
+                project_members, next_cursor = split_page(rows, key=lambda row: (row[0].created_at, row[0].user_id), limit=limit)
+                
+                return [serializers.member_details(member, user) for member, user in project_members], next_cursor
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def get_summary(self, project_id: str, user_id: str):
+        try:
+            async with self.session() as session:
+                context = await load_access_context_async(session, project_id=project_id, user_id=user_id)
+                context.require_project()
+                context.require_member()
+
+                counters = (await session.execute(summary_statement(project_id))).all()
+                return serializers.project_summary(context.project, counters, today=date.today())
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def delete_project(self, project_id: str, user_id: str):
+        try:
+            async with self.session() as session:
+                context = await load_access_context_async(session, project_id=project_id, user_id=user_id)
+                context.require_project()
+                context.require_member()
+                context.require_owner()
+                
+                await session.execute(delete(Task).where(Task.project_id==project_id))
+                await session.delete(context.project)
+                await session.commit()
+                membership_cache.delete_where(lambda key: key[1]==project_id)
+                await publish_project_event_async(project_id, PROJECT_DELETED, {})
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def join_project(self, project_code: str, user_id: str):
+        try:
+            async with self.session() as session:
+                row = (await session.execute(join_project_statement(project_code=project_code, user_id=user_id))).first()
+                if not row:
+                    raise NotFoundError(f"Project code {project_code} is invalid")
+                
+                project, role = row
+                if role:
+                    raise AlreadyExistError(f"User with id {user_id} is already a member of the project with id {project.id}")
+                
+                member = Membership(user_id=user_id, project_id=project.id, role=Role.Member)
+                session.add(member)
+                await session.execute(bump_version_statement(project.id))
+                await session.commit()
+                membership_cache.set((user_id, project.id), Role.Member)
+                await publish_project_event_async(project.id, MEMBER_JOINED, {"user_id": user_id})
+
+                return serializers.joined_project(project)
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def create_task(self, name: str, description: str, assignee: str, status: TaskStatus, project_id: str, user_id: str):
+        try:
+            async with self.session() as session:
+                context = await load_access_context_async(session, project_id=project_id, user_id=user_id, assignee_id=assignee)
+                context.require_project(f"Project with id {project_id} is not found")
+                context.require_assignee(f"assignee with id {assignee} does not exist")
+                context.require_member()
+                context.require_owner()
+                context.require_assignee_member()
+                
+                version = (await session.execute(bump_version_statement(project_id))).scalar_one()
+                task = Task(id=generate_id("TASK_"), 
+                            name=name, 
+                            description=description, 
+                            assignee=assignee, 
+                            status=status, 
+                            project_id=project_id, 
+                            version=version)
+                session.add(task)
+                await self.update_counters(session, project_id, task_added(assignee, status))
+                await session.commit()
+
+                await session.refresh(task)
+                created_task = serializers.created_task(task)
+                await publish_project_event_async(project_id, TASK_CREATED, created_task)
+                return created_task
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+    
+    async def get_task(self, task_id: str, project_id: str, user_id: str):
+        try:
+            async with self.session() as session:
+                context = await load_access_context_async(session, project_id=project_id, user_id=user_id, task_id=task_id)
+                context.require_project()
+                context.require_task()
+                context.require_member()
+
+                return serializers.task_details(context.task, context.task_assignee)
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+        
+    async def edit_task(self, task_id: str, name: str, description: str, project_id: str, user_id: str):
+        try:
+            async with self.session() as session:
+                context = await load_access_context_async(session, project_id=project_id, user_id=user_id, task_id=task_id)
+                context.require_project()
+                context.require_task()
+                context.require_member()
+
+                task, assignee = context.task, context.task_assignee
+                if context.role != Role.Owner and assignee.id != user_id:
+                    raise NotTaskAssigneeError(f"User with id {user_id} is not a owner nor an assignee for the task with id {task_id}")
+
+                task.version = (await session.execute(bump_version_statement(project_id))).scalar_one()
+                if name != "":
+                    task.name = name
+                if description != "":
+                    task.description = description
+
+                await session.commit()
+
+                edited_task = serializers.task_details(task, assignee)
+                await publish_project_event_async(project_id, TASK_EDITED, edited_task)
+                return edited_task
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+    
+    async def change_status(self, task_id: str, status: TaskStatus, project_id: str, user_id: str):
+        try:
+            async with self.session() as session:
+                context = await load_access_context_async(session, project_id=project_id, user_id=user_id, task_id=task_id)
+                context.require_project()
+                context.require_task()
+                context.require_member()
+
+                assignee = context.task_assignee
+                if context.role != Role.Owner and assignee.id != user_id:
+                    raise NotTaskAssigneeError(f"User with id {user_id} is not a owner nor an assignee for the task with id {task_id}")
+
+                task = await self.lock_task(session, task_id)
+                old_assignee, old_status = task.assignee, task.status
+                task.version = (await session.execute(bump_version_statement(project_id))).scalar_one()
+                task.status = status
+                await self.update_counters(session, project_id, task_moved(old_assignee, old_status, old_assignee, status))
+                await session.commit()
+
+                changed_status = serializers.task_status(task_id, status)
+                await publish_project_event_async(project_id, TASK_STATUS_CHANGED, changed_status)
+                return changed_status
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+        
+    async def change_assignee(self, task_id: str, assignee: str, project_id: str, user_id: str):
+        try:
+            async with self.session() as session:
+                context = await load_access_context_async(session, project_id=project_id, user_id=user_id, task_id=task_id, assignee_id=assignee)
+                context.require_project()
+                context.require_task()
+                context.require_member()
+                context.require_owner(f"User with id {user_id} is not a owner for the task with id {task_id}, Only project owner can change assignee")
+                context.require_assignee()
+                context.require_assignee_member()
+
+                task = await self.lock_task(session, task_id)
+                old_assignee, old_status = task.assignee, task.status
+                task.version = (await session.execute(bump_version_statement(project_id))).scalar_one()
+                task.assignee = assignee
+                await self.update_counters(session, project_id, task_moved(old_assignee, old_status, assignee, old_status))
+                await session.commit()
+
+                updated_task = serializers.task_details(task, context.assignee)
+                await publish_project_event_async(project_id, TASK_ASSIGNED, updated_task)
+                return updated_task
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def delete_task(self, task_id: str, project_id: str, user_id: str):
+        try:
+            async with self.session() as session:
+                context = await load_access_context_async(session, project_id=project_id, user_id=user_id, task_id=task_id)
+                context.require_project()
+                context.require_task()
+                context.require_member()
+                context.require_owner(f"User with id {user_id} is not a owner for the task with id {task_id}, Only project owner can delete tasks")
+
+                task = await self.lock_task(session, task_id)
+                old_assignee, old_status = task.assignee, task.status
+                version = (await session.execute(bump_version_statement(project_id))).scalar_one()
+                await session.delete(task)
+                session.add(TaskTombstone(project_id=project_id, task_id=task_id, version=version))
+                await self.update_counters(session, project_id, task_removed(old_assignee, old_status))
+                await session.commit()
+                await publish_project_event_async(project_id, TASK_DELETED, {"id": task_id})
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    async def bulk_tasks(self, operations: list, project_id: str, user_id: str):
+        try:
+            async with self.session() as session:
+                context = await load_access_context_async(session, project_id=project_id, user_id=user_id)
+                context.require_project()
+                context.require_member()
+
+                tasks_statement, members_statement = bulk_lookup_statements(operations, project_id=project_id)
+                tasks = {row.id: (row.assignee, row.status) for row in (await session.execute(tasks_statement))} if tasks_statement is not None else {}
+                member_ids = set(await session.scalars(members_statement)) if members_statement is not None else set()
+
+                plan = plan_bulk_operations(operations, project_id=project_id, user_id=user_id, role=context.role, 
+                                            tasks=tasks, member_ids=member_ids)
+                if plan.inserts or plan.updates:
+                    version = (await session.execute(bump_version_statement(project_id))).scalar_one()
+                    for statement, rows in bulk_write_statements(plan, version=version):
+                        await session.execute(statement, rows)
+                    await self.update_counters(session, project_id, plan.deltas)
+                await session.commit()
+                await publish_bulk_event_async(project_id, plan.results)
+
+                return plan.results
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+        except IntegrityError:
+            logger.exception("Database rejected the write")
+            raise DBIntegrityError()
\ No newline at end of file
@@ -1,18 +1,32 @@
-import bcrypt, re
-from sqlalchemy.exc import OperationalError
+import logging
+import re
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError, IntegrityError
 
 from models.user import User
 from db import Database
 from utils.id import generate_id
+from utils.password import hash_password, check_password, needs_rehash
+from utils.tracing import traced_methods
+from services import serializers
 from exceptions import BadPayloadError, NotFoundError, DBOverloadError, AlreadyExistError
-from exceptions.auth import IncorrectPasswordError
+from exceptions.auth import IncorrectPasswordError, HashingOverloadError
 
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+def upgrade_hash_statement(user_id: str, password_hash: str, new_hash: str):
+    # only replaces the hash that was checked, a password changed in the meantime is kept
+    return update(User).where(User.id==user_id, User.password_hash==password_hash).values(password_hash=new_hash)
+
+@traced_methods
 class AuthService:
     def __init__(self):
         self.session = Database().get_session()
 
     def register(self, username: str, email: str, password: str):
-        if not re.match(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', email):
+        if not EMAIL_PATTERN.match(email):
             raise BadPayloadError("'email' field value is not a valid email")
 
         with self.session() as session:
@@ -20,9 +34,9 @@ class AuthService:
             if user:
                 raise AlreadyExistError(f"User with email {email} already exist")
 
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        password_hash = hash_password(password)
 
-        user = User(generate_id('USER_'), username, email, password_hash.decode('utf-8'))
+        user = User(generate_id('USER_'), username, email, password_hash)
         
         try:
             with self.session() as session:
@@ -30,8 +44,10 @@ class AuthService:
                 session.commit()
 
                 return user.id
-        except OperationalError as e:
-            print(e)
+        except IntegrityError:
+            raise AlreadyExistError(f"User with email {email} already exist")
+        except OperationalError:
+            logger.exception("Database is unavailable")
             raise DBOverloadError()
 
     def login(self, email: str, password: str):
@@ -42,14 +58,36 @@ class AuthService:
                 if not user:
                     raise NotFoundError(f"User with email {email} does not exist")
                 
-                if not bcrypt.checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8')):
-                    raise IncorrectPasswordError()
-                
-                return {
-                    "id": user.id, 
-                    "email": user.email, 
-                    "name": user.name,
-                }
-        except OperationalError as e:
-            print(e)
-            raise DBOverloadError()
\ No newline at end of file
+                user_details = serializers.user_details(user)
+                password_hash = user.password_hash
+
+            # bcrypt runs after the session is closed so no pooled connection waits on it
+            if not check_password(password, password_hash):
+                raise IncorrectPasswordError()
+
+            # hashes made with an older work factor are upgraded while the plain password is at hand
+            if needs_rehash(password_hash):
+                self.upgrade_password_hash(user_details["id"], password_hash, password)
+            
+            return user_details
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    def upgrade_password_hash(self, user_id: str, password_hash: str, password: str):
+        """
+            Re-hashes a password with the current work factor. The upgrade is skipped, and tried again on a
+            later login, when the bcrypt pool or the database is busy, the login itself already succeeded
+        """
+
+        try:
+            new_hash = hash_password(password)
+        except HashingOverloadError:
+            return
+
+        try:
+            with self.session() as session:
+                session.execute(upgrade_hash_statement(user_id, password_hash, new_hash))
+                session.commit()
+        except OperationalError:
+            logger.warning("Upgrading the password hash of %s failed", user_id, exc_info=True)
\ No newline at end of file
@@ -0,0 +1,161 @@
+from collections import Counter
+from sqlalchemy import select, insert, update
+
+from utils.id import generate_id
+from models import Membership, Task
+from models.membership import Role
+
+class BulkPlan:
+    """
+        Outcome of checking a batch of task operations, the rows to insert, the final column values 
+        for every updated task, the task counter deltas and one result per operation in the order they were sent
+    """
+
+    def __init__(self):
+        self.inserts = []
+        self.updates = {}
+        self.deltas = Counter()
+        self.results = []
+
+    def succeeded(self, index: int, op: str, task_id: str):
+        self.results.append({
+            "index": index, 
+            "op": op, 
+            "task_id": task_id, 
+            "ok": True
+        })
+
+    def failed(self, index: int, op: str, task_id: str, code: str, message: str):
+        self.results.append({
+            "index": index, 
+            "op": op, 
+            "task_id": task_id or None, 
+            "ok": False, 
+            "error": {
+                "message": message, 
+                "code": code
+            }
+        })
+
+    def update(self, task_id: str, **values):
+        self.updates.setdefault(task_id, {"id": task_id}).update(values)
+
+def bulk_lookup_statements(operations, project_id: str):
+    """
+        Statements loading the assignee and status of every referenced task, locked in id order, and every referenced 
+        assignee who is a project member, None when the batch references no task or no assignee
+    """
+
+    task_ids = {operation.task_id for operation in operations if operation.op != "create" and operation.task_id}
+    assignee_ids = {operation.assignee for operation in operations if operation.op in ("create", "assign") and operation.assignee}
+
+    tasks_statement, members_statement = None, None
+    if task_ids:
+        tasks_statement = select(Task.id, Task.assignee, Task.status) \
+                            .where(Task.project_id==project_id, Task.id.in_(task_ids)) \
+                            .order_by(Task.id).with_for_update()
+    if assignee_ids:
+        members_statement = select(Membership.user_id).where(Membership.project_id==project_id, Membership.user_id.in_(assignee_ids))
+
+    return tasks_statement, members_statement
+
+def plan_bulk_operations(operations, project_id: str, user_id: str, role: Role, tasks: dict, member_ids: set):
+    """
+        Applies the same rules as the single task endpoints to every operation, in order, so a task 
+        reassigned earlier in the batch is checked against its new assignee. `tasks` maps every referenced 
+        task id to its (assignee, status). Failed operations are reported and skipped, they don't stop the rest of the batch
+    """
+
+    plan = BulkPlan()
+    is_owner = role == Role.Owner
+    tasks = dict(tasks)
+
+    for index, operation in enumerate(operations):
+        op, task_id = operation.op, operation.task_id
+
+        if op == "create":
+            if not is_owner:
+                plan.failed(index, op, None, "NOT_OWNER", f"User with id {user_id} is not the owner of the project with id {project_id}")
+            elif not operation.name or not operation.status or not operation.assignee:
+                plan.failed(index, op, None, "BAD_REQUEST", "Fields 'name', 'status' and 'assignee' are required to create a task")
+            elif operation.assignee not in member_ids:
+                plan.failed(index, op, None, "NOT_MEMBER", f"Assignee with id {operation.assignee} is not a member of the project with id {project_id}")
+            else:
+                task_id = generate_id("TASK_")
+                plan.inserts.append({
+                    "id": task_id, 
+                    "name": operation.name, 
+                    "description": operation.description, 
+                    "assignee": operation.assignee, 
+                    "status": operation.status, 
+                    "project_id": project_id
+                })
+                tasks[task_id] = (operation.assignee, operation.status)
+                plan.deltas[(operation.assignee, operation.status)] += 1
+                plan.succeeded(index, op, task_id)
+            continue
+
+        if task_id not in tasks:
+            plan.failed(index, op, task_id, "NOT_FOUND", f"Task with id {task_id} not found")
+            continue
+
+        assignee, status = tasks[task_id]
+        if op == "assign":
+            if not is_owner:
+                plan.failed(index, op, task_id, "NOT_OWNER", f"User with id {user_id} is not a owner for the task with id {task_id}, Only project owner can change assignee")
+            elif not operation.assignee:
+                plan.failed(index, op, task_id, "BAD_REQUEST", "Field required 'assignee'")
+            elif operation.assignee not in member_ids:
+                plan.failed(index, op, task_id, "NOT_MEMBER", f"Assignee with id {operation.assignee} is not a member of the project with id {project_id}")
+            else:
+                tasks[task_id] = (operation.assignee, status)
+                plan.deltas[(assignee, status)] -= 1
+                plan.deltas[(operation.assignee, status)] += 1
+                plan.update(task_id, assignee=operation.assignee)
+                plan.succeeded(index, op, task_id)
+            continue
+
+        if not is_owner and assignee != user_id:
+            plan.failed(index, op, task_id, "NOT_ASSIGNEE", f"User with id {user_id} is not a owner nor an assignee for the task with id {task_id}")
+        elif op == "status":
+            if not operation.status:
+                plan.failed(index, op, task_id, "BAD_REQUEST", "Field required 'status'")
+            else:
+                tasks[task_id] = (assignee, operation.status)
+                plan.deltas[(assignee, status)] -= 1
+                plan.deltas[(assignee, operation.status)] += 1
+                plan.update(task_id, status=operation.status)
+                plan.succeeded(index, op, task_id)
+        else:
+            if not operation.name and not operation.description:
+                plan.failed(index, op, task_id, "BAD_REQUEST", "Atleadt one field among 'name' and 'description' need to be present")
+            else:
+                values = {}
+                if operation.name:
+                    values["name"] = operation.name
+                if operation.description:
+                    values["description"] = operation.description
+                plan.update(task_id, **values)
+                plan.succeeded(index, op, task_id)
+
+    return plan
+
+def bulk_write_statements(plan: BulkPlan, version: int):
+    """
+        (statement, parameters) pairs applying the plan, one executemany INSERT for the new tasks and one 
+        executemany UPDATE by primary key per set of changed columns. Every written task is stamped with 
+        `version`, the project version of the batch
+    """
+
+    writes = []
+    if plan.inserts:
+        writes.append((insert(Task), [dict(values, version=version) for values in plan.inserts]))
+
+    groups = {}
+    for values in plan.updates.values():
+        values = dict(values, version=version)
+        groups.setdefault(tuple(sorted(values)), []).append(values)
+    for rows in groups.values():
+        writes.append((update(Task), rows))
+
+    return writes
@@ -0,0 +1,38 @@
+from sqlalchemy import select, tuple_
+
+from utils.pagination import encode_change_cursor
+from models import User, Task, TaskTombstone
+
+def changed_tasks_statement(project_id: str, version: int, id: str, limit: int):
+    """
+        Tasks written after the (version, id) cursor in the order they were committed, one extra row 
+        tells whether more changes follow
+    """
+
+    return select(Task, User).join(User, User.id==Task.assignee) \
+            .where(Task.project_id==project_id, tuple_(Task.version, Task.id) > tuple_(version, id)) \
+            .order_by(Task.version, Task.id).limit(limit+1)
+
+def tombstones_statement(project_id: str, version: int, id: str, limit: int):
+    return select(TaskTombstone.version, TaskTombstone.task_id) \
+            .where(TaskTombstone.project_id==project_id, tuple_(TaskTombstone.version, TaskTombstone.task_id) > tuple_(version, id)) \
+            .order_by(TaskTombstone.version, TaskTombstone.task_id).limit(limit+1)
+
+def merge_changes(task_rows, tombstone_rows, limit: int, version: int, id: str):
+    """
+        Merges both feeds by (version, id) and keeps the first `limit` changes. Returns the changed 
+        (task, assignee) rows, the deleted task ids, the cursor to resume from and whether more changes follow
+    """
+
+    merged = [((task.version, task.id), (task, assignee), None) for task, assignee in task_rows]
+    merged += [((tombstone_version, task_id), None, task_id) for tombstone_version, task_id in tombstone_rows]
+    merged.sort(key=lambda change: change[0])
+
+    has_more = len(merged) > limit
+    merged = merged[:limit]
+    if merged:
+        version, id = merged[-1][0]
+
+    changed = [row for _, row, _ in merged if row is not None]
+    deleted = [task_id for _, _, task_id in merged if task_id is not None]
+    return changed, deleted, encode_change_cursor(version, id), has_more
@@ -0,0 +1,48 @@
+from collections import Counter
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import User, Task, TaskCounter
+
+def task_added(assignee: str, status):
+    return Counter({(assignee, status): 1})
+
+def task_removed(assignee: str, status):
+    return Counter({(assignee, status): -1})
+
+def task_moved(old_assignee: str, old_status, assignee: str, status):
+    deltas = Counter()
+    deltas[(old_assignee, old_status)] -= 1
+    deltas[(assignee, status)] += 1
+    return deltas
+
+def counter_upsert(dialect_name: str, project_id: str, deltas: Counter):
+    """
+        (statement, parameters) adding every non zero (assignee, status) delta to the project's counters, 
+        None when nothing changed. The upsert adds to the stored count in the database so concurrent 
+        writers don't overwrite each other
+    """
+
+    rows = [{"project_id": project_id, "assignee": assignee, "status": status, "count": delta} 
+            for (assignee, status), delta in deltas.items() if delta]
+    if not rows:
+        return None
+
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    statement = insert(TaskCounter)
+    statement = statement.on_conflict_do_update(index_elements=[TaskCounter.project_id, TaskCounter.assignee, TaskCounter.status], 
+                                                set_={"count": TaskCounter.count + statement.excluded.count})
+    return statement, rows
+
+def locked_task_statement(task_id: str):
+    """
+        The task locked for update. The instance already in the session is refreshed with the locked row, so
+        the changes written and the counters moved both start from the values it really had
+    """
+
+    return select(Task).where(Task.id==task_id).with_for_update().execution_options(populate_existing=True)
+
+def summary_statement(project_id: str):
+    return select(TaskCounter.assignee, User.name, TaskCounter.status, TaskCounter.count) \
+            .join(User, User.id==TaskCounter.assignee) \
+            .where(TaskCounter.project_id==project_id, TaskCounter.count!=0)
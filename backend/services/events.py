@@ -0,0 +1,145 @@
+import asyncio, json, logging, threading
+
+from config import Env
+from db import Database
+from utils.broker import LocalBroker, PostgresBroker, MessageTooLargeError
+
+logger = logging.getLogger(__name__)
+
+TASK_CREATED = "task.created"
+TASK_EDITED = "task.edited"
+TASK_STATUS_CHANGED = "task.status"
+TASK_ASSIGNED = "task.assigned"
+TASK_DELETED = "task.deleted"
+TASKS_BULK_CHANGED = "tasks.bulk"
+MEMBER_JOINED = "member.joined"
+PROJECT_DELETED = "project.deleted"
+
+# sent instead of the events a slow client missed, it should fetch the project again
+RESYNC_FRAME = "event: resync\ndata: {}\n\n"
+HEARTBEAT_FRAME = ": keep-alive\n\n"
+RETRY_FRAME = "retry: 3000\n\n"
+# nginx would otherwise buffer the stream and deliver events in batches
+EVENT_STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+# bulk events list the changed task ids, split so every message stays small enough for NOTIFY
+BULK_EVENT_TASK_IDS = 100
+
+_broker = None
+_broker_lock = threading.Lock()
+
+def _connect():
+    import psycopg2
+
+    return psycopg2.connect(host=Env.DB_HOST, port=Env.DB_PORT, user=Env.DB_USER, password=Env.DB_PASS, dbname=Env.DB_NAME)
+
+def get_broker():
+    """
+        Broker selected by EVENT_BROKER, 'local' keeps events inside the process and 'postgres'
+        fans them out to every worker through LISTEN/NOTIFY
+    """
+
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                if Env.EVENT_BROKER == "postgres":
+                    _broker = PostgresBroker(connect=_connect, engine=Database().engine)
+                else:
+                    _broker = LocalBroker()
+    return _broker
+
+def project_channel(project_id: str):
+    return f"project:{project_id}"
+
+def _event_frame(event_type: str, message: dict):
+    return f"event: {event_type}\ndata: {json.dumps(message, default=str)}\n\n"
+
+def _ids_only(data: dict):
+    return {key: value for key, value in data.items() if key == "id" or key.endswith("_id") or key.endswith("_ids")}
+
+def publish_project_event(project_id: str, event_type: str, data: dict):
+    """
+        Publishes a committed change to the streams of the project. The SSE frame is built once here instead of
+        once per subscriber, and a failure is only logged, the write it reports has already succeeded.
+        An event too large for the broker is sent with only its ids and `truncated` set, the client fetches
+        the rest from the changes feed, and as a resync when even that doesn't fit
+    """
+
+    channel = project_channel(project_id)
+    try:
+        broker = get_broker()
+        try:
+            broker.publish(channel, _event_frame(event_type, {"project_id": project_id, "data": data}))
+        except MessageTooLargeError:
+            try:
+                broker.publish(channel, _event_frame(event_type, {"project_id": project_id, "data": _ids_only(data), "truncated": True}))
+            except MessageTooLargeError:
+                broker.publish(channel, RESYNC_FRAME)
+    except Exception:
+        logger.exception("Publishing a project event failed")
+
+def publish_bulk_event(project_id: str, results: list):
+    task_ids = [result["task_id"] for result in results if result["ok"]]
+    for start in range(0, len(task_ids), BULK_EVENT_TASK_IDS):
+        publish_project_event(project_id, TASKS_BULK_CHANGED, {"task_ids": task_ids[start:start + BULK_EVENT_TASK_IDS]})
+
+async def publish_project_event_async(project_id: str, event_type: str, data: dict):
+    # a broker may block on the network, keep it off the event loop
+    await asyncio.to_thread(publish_project_event, project_id, event_type, data)
+
+async def publish_bulk_event_async(project_id: str, results: list):
+    await asyncio.to_thread(publish_bulk_event, project_id, results)
+
+def subscribe_project_events(project_id: str):
+    return get_broker().subscribe(project_channel(project_id), maxsize=Env.EVENTS_QUEUE_SIZE)
+
+def subscribe_project_events_async(project_id: str):
+    return get_broker().subscribe_async(project_channel(project_id), maxsize=Env.EVENTS_QUEUE_SIZE)
+
+def _is_project_deleted(frame: str):
+    return frame.startswith(f"event: {PROJECT_DELETED}\n")
+
+def event_stream(subscription):
+    """
+        SSE frames of a subscription, a comment every EVENTS_HEARTBEAT seconds keeps proxies from closing
+        an idle stream and lets the server notice a client that went away
+    """
+
+    try:
+        yield RETRY_FRAME
+        while True:
+            frame = subscription.get(timeout=Env.EVENTS_HEARTBEAT)
+            if subscription.overflowed:
+                subscription.reset()
+                yield RESYNC_FRAME
+                continue
+
+            if frame is None:
+                yield HEARTBEAT_FRAME
+                continue
+
+            yield frame
+            if _is_project_deleted(frame):
+                return
+    finally:
+        subscription.close()
+
+async def async_event_stream(subscription):
+    try:
+        yield RETRY_FRAME
+        while True:
+            frame = await subscription.get(timeout=Env.EVENTS_HEARTBEAT)
+            if subscription.overflowed:
+                subscription.reset()
+                yield RESYNC_FRAME
+                continue
+
+            if frame is None:
+                yield HEARTBEAT_FRAME
+                continue
+
+            yield frame
+            if _is_project_deleted(frame):
+                return
+    finally:
+        subscription.close()
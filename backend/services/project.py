@@ -1,38 +1,63 @@
-from datetime import datetime
-from sqlalchemy import and_
+import logging
+from datetime import datetime, date
+from sqlalchemy import select, delete, and_
 from sqlalchemy.exc import OperationalError, IntegrityError
 
 from db import Database
 from utils.id import generate_id
-from models import Project, User, Membership, Task
+from utils.pagination import paginate, decode_change_cursor, DEFAULT_PAGE_SIZE
+from utils.tracing import traced_methods
+from services.access import load_access_context, load_member_role, membership_cache
+from services import serializers
+from services.counters import counter_upsert, task_added, task_removed, task_moved, locked_task_statement, summary_statement
+from services.versions import version_statement, bump_version_statement
+from services.changes import changed_tasks_statement, tombstones_statement, merge_changes
+from services.events import publish_project_event, publish_bulk_event, TASK_CREATED, TASK_DELETED, TASK_EDITED, TASK_STATUS_CHANGED, TASK_ASSIGNED, MEMBER_JOINED, PROJECT_DELETED
+from services.bulk import bulk_lookup_statements, plan_bulk_operations, bulk_write_statements
+from models import Project, User, Membership, Task, TaskTombstone
 from models.membership import Role
 from models.project import TaskStatus
 from exceptions import DBOverloadError, DBIntegrityError, NotFoundError, AlreadyExistError
-from exceptions.project import NotProjectMemberError, NotProjectOwner, NotTaskAssigneeError
+from exceptions.project import NotProjectMemberError, NotTaskAssigneeError
 
+logger = logging.getLogger(__name__)
+
+def join_project_statement(project_code: str, user_id: str):
+    return select(Project, Membership.role) \
+            .outerjoin(Membership, and_(Membership.project_id==Project.id, Membership.user_id==user_id)) \
+            .where(Project.code==project_code)
+
+@traced_methods
 class ProjectService:
     def __init__(self):
         self.session = Database().get_session()
 
-    def list_projects(self, user_id):
+    def update_counters(self, session, project_id: str, deltas):
+        upsert = counter_upsert(session.get_bind().dialect.name, project_id, deltas)
+        if upsert:
+            session.execute(*upsert)
+
+    def lock_task(self, session, task_id: str):
+        task = session.execute(locked_task_statement(task_id)).scalars().first()
+        if not task:
+            # deleted after the access check
+            raise NotFoundError(f"Task with id {task_id} not found")
+        return task
+
+    def list_projects(self, user_id, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
         project_list = []
         try:
             with self.session() as session:
-                projects = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Membership.user_id==user_id)).all()
+                query = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Membership.user_id==user_id))
+                projects, next_cursor = paginate(query, Project.created_at, Project.id, 
+                                                 key=lambda row: (row[0].created_at, row[0].id), 
+                                                 limit=limit, cursor=cursor)
                 for project, member in projects:
-                    project_list.append({
-                        "id": project.id, 
-                        "name": project.name, 
-                        "description": project.description, 
-                        "deadline": project.deadline, 
-                        "code": project.code, 
-                        "role": member.role.value, 
-                        "created_at": project.created_at.strftime("%Y-%m-%d %I-%M-%S %p")
-                    })
+                    project_list.append(serializers.project_list_item(project, member.role))
                 
-                return project_list
-        except OperationalError as e:
-            print(str(e))
+                return project_list, next_cursor
+        except OperationalError:
+            logger.exception("Database is unavailable")
             raise DBOverloadError()
 
     def create_projects(self, name: str, description: str, deadline: datetime, user_id: str):
@@ -42,345 +67,340 @@ class ProjectService:
         try:
             with self.session() as session:
                 project_instance = Project(id=project_id, name=name, description=description, deadline=deadline, code=project_code)
-                user = session.query(User).filter(User.id==user_id).first()
+                user = session.get(User, user_id)
                 if not user:
                     raise NotFoundError(f"User with id {user_id} not found")
                 
                 member = Membership(user_id=user.id, project_id=project_id, role=Role.Owner)
 
                 session.add(project_instance)
-                session.commit()
-
+                session.flush()
                 session.add(member)
                 session.commit()
+                membership_cache.set((user_id, project_id), Role.Owner)
 
-                return {
-                    "id": project_instance.id, 
-                    "name": project_instance.name, 
-                    "description": project_instance.description, 
-                    "deadline": project_instance.deadline, 
-                    "code": project_instance.code, 
-                    "created_at": project_instance.created_at.strftime("%Y-%m-%d %I:%M:%S %p")
-                }
-        except OperationalError as e:
-            print(str(e))
+                return serializers.created_project(project_instance)
+        except OperationalError:
+            logger.exception("Database is unavailable")
             raise DBOverloadError()
-        except IntegrityError as e:
-            print(str(e))
+        except IntegrityError:
+            logger.exception("Database rejected the write")
             raise DBIntegrityError()
 
-    def get_project(self, project_id: str, user_id: str):
+    def get_version(self, project_id: str, user_id: str):
+        """
+            (version, role) of a project for conditional reads, raises like the reads it stands in for
+        """
+
         try:
             with self.session() as session:
-                project = session.get(Project, project_id)
-                if not project:
+                row = session.execute(version_statement(project_id=project_id, user_id=user_id)).first()
+                if not row:
                     raise NotFoundError(f"Project with id {project_id} not found")
-
-                membership = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Project.id==project_id, Membership.user_id==user_id)).first()
-                if not membership:
-                    raise NotProjectMemberError(f"User with id {user_id} is not a member of the project with id {project_id}")
                 
-                project_details = {
-                    "id": project.id, 
-                    "name": project.name, 
-                    "description": project.description, 
-                    "deadline": project.deadline, 
-                    "created_at": project.created_at.strftime("%Y-%m-%d %I:%M:%S %p"), 
-                    "code": project.code, 
-                    "role": membership[1].role.value, 
-                }
+                version, role = row
+                if not role:
+                    raise NotProjectMemberError(f"User with id {user_id} is not a member of the project with id {project_id}")
+                membership_cache.set((user_id, project_id), role)
 
-                return project_details
-        except OperationalError as e:
-            print(str(e))
+                return version, role
+        except OperationalError:
+            logger.exception("Database is unavailable")
             raise DBOverloadError()
 
-    def get_tasks(self, project_id: str, user_id: str):
+    def get_project(self, project_id: str, user_id: str):
         try:
             with self.session() as session:
-                project = session.get(Project, project_id)
-                if not project:
-                    raise NotFoundError(f"Project with id {project_id} not found")
+                context = load_access_context(session, project_id=project_id, user_id=user_id)
+                context.require_project()
+                context.require_member()
 
-                membership = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Project.id==project_id, Membership.user_id==user_id)).first()
-                if not membership:
-                    raise NotProjectMemberError(f"User with id {user_id} is not a member of the project with id {project_id}")
+                return serializers.project_details(context.project, context.role)
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    def get_tasks(self, project_id: str, user_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+        try:
+            with self.session() as session:
+                load_member_role(session, project_id=project_id, user_id=user_id)
                 
                 tasks = []
-                task_instances = session.query(Task).filter(Task.project_id==project_id).all()
-                for task in task_instances:
-                    assignee = session.query(User).filter(User.id==task.assignee).first()
-                    if not assignee:
-                        raise 
-                    
-                    tasks.append({
-                        "id": task.id, 
-                        "name": task.name, 
-                        "description": task.description, 
-                        "assignee": assignee.id, 
-                        "assignee_email": assignee.email, 
-                        "assignee_name": assignee.name, 
-                        "status": task.status.value, 
-                        "created_at": task.created_at.strftime("%Y-%m-%d %I:%M:%S %p"), 
-                    })
-                return tasks
+                query = session.query(Task, User).join(User, User.id==Task.assignee).filter(Task.project_id==project_id)
+                task_instances, next_cursor = paginate(query, Task.created_at, Task.id, 
+                                                       key=lambda row: (row[0].created_at, row[0].id), 
+                                                       limit=limit, cursor=cursor)
+                for task, assignee in task_instances:
+                    tasks.append(serializers.task_list_item(task, assignee))
+                return tasks, next_cursor
         
-        except OperationalError as e:
-            print(str(e))
+        except OperationalError:
+            logger.exception("Database is unavailable")
             raise DBOverloadError()
 
-    def get_members(self, project_id: str, user_id: str):
-        members_list = []
+    def get_changes(self, project_id: str, user_id: str, since: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        version, id = decode_change_cursor(since)
         try:
             with self.session() as session:
-                project = session.get(Project, project_id)
-                if not project:
-                    raise NotFoundError(f"Project with id {project_id} not found")
+                load_member_role(session, project_id=project_id, user_id=user_id)
 
-                project_membership = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Project.id==project_id, Membership.user_id==user_id)).first()
-                if not project_membership:
-                    raise NotProjectMemberError(f"User with id {user_id} is not a member of the project with id {project_id}")
+                task_rows = session.execute(changed_tasks_statement(project_id, version, id, limit)).all()
+                tombstone_rows = session.execute(tombstones_statement(project_id, version, id, limit)).all()
+                changed, deleted, next_cursor, has_more = merge_changes(task_rows, tombstone_rows, limit, version, id)
 
-                project_members = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Project.id==project_id)).all()
-                for row in project_members:
-                    member = row[1]
-                    user = session.query(User).filter(User.id==member.user_id).first()
-                    if not user:
-                        raise Exception("ERROR: member has no corresponding user in the users table")
-                    
-                    members_list.append({
-                        "user_id": user.id, 
-                        "name": user.name, 
-                        "email": user.email, 
-                        "role": member.role.value, 
-                        "joined_at": member.created_at.strftime("%Y-%m-%d %I:%M:%S %p")
-                    })
-                
-                return members_list, None
-        except OperationalError as e:
-            print(str(e))
+                return {
+                    "changed": [serializers.task_change(task, assignee) for task, assignee in changed], 
+                    "deleted": deleted, 
+                    "next_cursor": next_cursor, 
+                    "has_more": has_more
+                }
+        except OperationalError:
+            logger.exception("Database is unavailable")
             raise DBOverloadError()
 
-    def delete_project(self, project_id: str, user_id: str):
+    def get_members(self, project_id: str, user_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+        members_list = []
         try:
             with self.session() as session:
-                project = session.get(Project, project_id)
-                if not project:
-                    raise NotFoundError(f"Project with id {project_id} not found")
+                load_member_role(session, project_id=project_id, user_id=user_id)
+
+                query = session.query(Membership, User).join(User, User.id==Membership.user_id).filter(Membership.project_id==project_id)
+                project_members, next_cursor = paginate(query, Membership.created_at, Membership.user_id, 
+                                                        key=lambda row: (row[0].created_at, row[0].user_id), 
+                                                        limit=limit, cursor=cursor)
+                for member, user in project_members:
+                    members_list.append(serializers.member_details(member, user))
                 
-                project_membership = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Project.id==project_id, Membership.user_id==user_id)).first()
-                if not project_membership:
-                    raise NotProjectMemberError(f"User with id {user_id} is not a member of the project with id {project_id}")
+                return members_list, next_cursor
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
 
-                if project_membership[1].role != Role.Owner:
-                    raise NotProjectOwner(f"User with id {user_id} is not the owner of the project with id {project_id}")
+    def get_summary(self, project_id: str, user_id: str):
+        try:
+            with self.session() as session:
+                context = load_access_context(session, project_id=project_id, user_id=user_id)
+                context.require_project()
+                context.require_member()
+
+                counters = session.execute(summary_statement(project_id)).all()
+                return serializers.project_summary(context.project, counters, today=date.today())
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+
+    def delete_project(self, project_id: str, user_id: str):
+        try:
+            with self.session() as session:
+                context = load_access_context(session, project_id=project_id, user_id=user_id)
+                context.require_project()
+                context.require_member()
+                context.require_owner()
                 
-                session.delete(project)
+                # tasks aren't owned by the project relationship, without this the ORM would try to orphan them
+                session.execute(delete(Task).where(Task.project_id==project_id))
+                session.delete(context.project)
                 session.commit()
-        except OperationalError as e:
-            print(str(e))
+                membership_cache.delete_where(lambda key: key[1]==project_id)
+                publish_project_event(project_id, PROJECT_DELETED, {})
+        except OperationalError:
+            logger.exception("Database is unavailable")
             raise DBOverloadError()
 
     def join_project(self, project_code: str, user_id: str):
         try:
             with self.session() as session:
-                project = session.query(Project).filter(Project.code==project_code).first()
-                if not project:
+                row = session.execute(join_project_statement(project_code=project_code, user_id=user_id)).first()
+                if not row:
                     raise NotFoundError(f"Project code {project_code} is invalid")
                 
-                project_membership = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Project.id==project.id, Membership.user_id==user_id)).first()
-                if project_membership:
+                project, role = row
+                if role:
                     raise AlreadyExistError(f"User with id {user_id} is already a member of the project with id {project.id}")
                 
                 member = Membership(user_id=user_id, project_id=project.id, role=Role.Member)
                 session.add(member)
+                joined = serializers.joined_project(project)
+                session.execute(bump_version_statement(project.id))
                 session.commit()
+                membership_cache.set((user_id, joined["id"]), Role.Member)
+                publish_project_event(joined["id"], MEMBER_JOINED, {"user_id": user_id})
 
-                return {
-                    "id": project.id, 
-                    "name": project.name, 
-                    "description": project.description
-                }
-        except OperationalError as e:
-            print(str(e))
+                return joined
+        except OperationalError:
+            logger.exception("Database is unavailable")
             raise DBOverloadError()
 
     def create_task(self, name: str, description: str, assignee: str, status: TaskStatus, project_id: str, user_id: str):
         try:
             with self.session() as session:
-                checking = session.query(Project).filter(Project.id==project_id).first()
-                if not checking:
-                    raise NotFoundError(f"Project with id {project_id} is not found")
-                
-                checking = session.query(User).filter(User.id==assignee).first()
-                if not checking:
-                    raise NotFoundError("assignee with id {assignee} does not exist")
-
-                project_membership = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Project.id==project_id, Membership.user_id==assignee)).first()
-                if not project_membership:
-                    raise NotProjectMemberError(f"User with id {user_id} is not a member of the project with id {project_id}")
-                
-                if project_membership[1].role != Role.Owner:
-                    raise NotProjectOwner(f"User with id {user_id} is not the owner of the project with id {project_id}")
+                context = load_access_context(session, project_id=project_id, user_id=user_id, assignee_id=assignee)
+                context.require_project(f"Project with id {project_id} is not found")
+                context.require_assignee(f"assignee with id {assignee} does not exist")
+                context.require_member()
+                context.require_owner()
+                context.require_assignee_member()
                 
+                version = session.execute(bump_version_statement(project_id)).scalar_one()
                 task_id = generate_id("TASK_")
                 task = Task(id=task_id, 
                             name=name, 
                             description=description, 
                             assignee=assignee, 
                             status=status, 
-                            project_id=project_id)
+                            project_id=project_id, 
+                            version=version)
                 session.add(task)
+                self.update_counters(session, project_id, task_added(assignee, status))
                 session.commit()
-                return {
-                    "id": task.id, 
-                    "name": task.name, 
-                    "description": task.description, 
-                    "assignee": assignee, 
-                    "status": task.status.value, 
-                    "created_at": task.created_at.strftime("%Y-%m-%d %I:%M:%S %p"), 
-                    "project_id": project_id
-                }
-        except OperationalError as e:
-            print(str(e))
+
+                created_task = serializers.created_task(task)
+                publish_project_event(project_id, TASK_CREATED, created_task)
+                return created_task
+        except OperationalError:
+            logger.exception("Database is unavailable")
             raise DBOverloadError()
     
     def get_task(self, task_id: str, project_id: str, user_id: str):
         try:
             with self.session() as session:
-                task = session.get(Task, task_id)
-                if not task:
-                    raise NotFoundError(f"Task with id {task_id} not found")
-
-                membership = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Project.id==project_id, Membership.user_id==user_id)).first()
-                if not membership:
-                    raise NotProjectMemberError(f"User with id {user_id} is not a member of the project with id {project_id}")
+                context = load_access_context(session, project_id=project_id, user_id=user_id, task_id=task_id)
+                context.require_project()
+                context.require_task()
+                context.require_member()
 
-                assignee = session.query(User).filter(User.id==task.assignee).first()
-                if not assignee:
-                    raise NotFoundError(f"Assignee with id {task.assignee} not found")
+                return serializers.task_details(context.task, context.task_assignee)
 
-                return {
-                    "id": task.id, 
-                    "name": task.name, 
-                    "description": task.description, 
-                    "assignee": assignee.id, 
-                    "assignee_name": assignee.name, 
-                    "assignee_email": assignee.email,
-                    "status": task.status.value, 
-                    "created_at": task.created_at.strftime("%Y-%m-%d %I:%M:%S %p"), 
-                    "project_id": project_id
-                }
-
-        except OperationalError as e:
-            print(str(e))
+        except OperationalError:
+            logger.exception("Database is unavailable")
             raise DBOverloadError()
         
     def edit_task(self, task_id: str, name: str, description: str, project_id: str, user_id: str):
         try:
             with self.session() as session:
-                task = session.get(Task, task_id)
-                if not task:
-                    raise NotFoundError(f"Task with id {task_id} not found")
-
-                membership = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Project.id==project_id, Membership.user_id==user_id)).first()
-                if not membership:
-                    raise NotProjectMemberError(f"User with id {user_id} is not a member of the project with id {project_id}")
-
-                assignee = session.query(User).filter(User.id==task.assignee).first()
-                if not assignee:
-                    raise NotFoundError(f"Assignee with id {task.assignee} not found")
+                context = load_access_context(session, project_id=project_id, user_id=user_id, task_id=task_id)
+                context.require_project()
+                context.require_task()
+                context.require_member()
 
-                if membership[1].role != Role.Owner or assignee.id != user_id:
+                task, assignee = context.task, context.task_assignee
+                if context.role != Role.Owner and assignee.id != user_id:
                     raise NotTaskAssigneeError(f"User with id {user_id} is not a owner nor an assignee for the task with id {task_id}")
 
+                task.version = session.execute(bump_version_statement(project_id)).scalar_one()
                 if name != "":
                     task.name = name
                 if description != "":
                     task.description = description
 
+                # built before commit, committing expires the instances and reading them again costs a query each
+                edited_task = serializers.task_details(task, assignee)
                 session.commit()
+                publish_project_event(project_id, TASK_EDITED, edited_task)
 
-                return {
-                    "id": task.id, 
-                    "name": task.name, 
-                    "description": task.description, 
-                    "assignee": assignee.id, 
-                    "assignee_name": assignee.name, 
-                    "assignee_email": assignee.email,
-                    "status": task.status.value, 
-                    "created_at": task.created_at.strftime("%Y-%m-%d %I:%M:%S %p"), 
-                    "project_id": project_id
-                }
-        except OperationalError as e:
-            print(str(e))
+                return edited_task
+        except OperationalError:
+            logger.exception("Database is unavailable")
             raise DBOverloadError()
     
     def change_status(self, task_id: str, status: TaskStatus, project_id: str, user_id: str):
         try:
             with self.session() as session:
-                task = session.get(Task, task_id)
-                if not task:
-                    raise NotFoundError(f"Task with id {task_id} not found")
+                context = load_access_context(session, project_id=project_id, user_id=user_id, task_id=task_id)
+                context.require_project()
+                context.require_task()
+                context.require_member()
 
-                membership = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Project.id==project_id, Membership.user_id==user_id)).first()
-                if not membership:
-                    raise NotProjectMemberError(f"User with id {user_id} is not a member of the project with id {project_id}")
-
-                assignee = session.query(User).filter(User.id==task.assignee).first()
-                if not assignee:
-                    raise NotFoundError(f"Assignee with id {task.assignee} not found")
-
-                if membership[1].role != Role.Owner or assignee.id != user_id:
+                assignee = context.task_assignee
+                if context.role != Role.Owner and assignee.id != user_id:
                     raise NotTaskAssigneeError(f"User with id {user_id} is not a owner nor an assignee for the task with id {task_id}")
 
+                task = self.lock_task(session, task_id)
+                old_assignee, old_status = task.assignee, task.status
+                task.version = session.execute(bump_version_statement(project_id)).scalar_one()
                 task.status = status
+                self.update_counters(session, project_id, task_moved(old_assignee, old_status, old_assignee, status))
                 session.commit()
 
-                return {
-                    "id": task.id, 
-                    "status": task.status.value, 
-                }
-        except OperationalError as e:
-            print(str(e))
+                changed_status = serializers.task_status(task_id, status)
+                publish_project_event(project_id, TASK_STATUS_CHANGED, changed_status)
+                return changed_status
+        except OperationalError:
+            logger.exception("Database is unavailable")
             raise DBOverloadError()
         
     def change_assignee(self, task_id: str, assignee: str, project_id: str, user_id: str):
         try:
             with self.session() as session:
-                task = session.get(Task, task_id)
-                if not task:
-                    raise NotFoundError(f"Task with id {task_id} not found")
-
-                membership = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Project.id==project_id, Membership.user_id==user_id)).first()
-                if not membership:
-                    raise NotProjectMemberError(f"User with id {user_id} is not a member of the project with id {project_id}")
+                context = load_access_context(session, project_id=project_id, user_id=user_id, task_id=task_id, assignee_id=assignee)
+                context.require_project()
+                context.require_task()
+                context.require_member()
+                context.require_owner(f"User with id {user_id} is not a owner for the task with id {task_id}, Only project owner can change assignee")
+                context.require_assignee()
+                context.require_assignee_member()
+
+                task = self.lock_task(session, task_id)
+                old_assignee, old_status = task.assignee, task.status
+                task.version = session.execute(bump_version_statement(project_id)).scalar_one()
+                task.assignee = assignee
+                self.update_counters(session, project_id, task_moved(old_assignee, old_status, assignee, old_status))
 
-                if membership[1].role != Role.Owner:
-                    raise NotProjectOwner(f"User with id {user_id} is not a owner for the task with id {task_id}, Only project owner can change assignee")
+                updated_task = serializers.task_details(task, context.assignee)
+                session.commit()
+                publish_project_event(project_id, TASK_ASSIGNED, updated_task)
 
-                assignee_instance = session.get(User, assignee)
-                if not assignee_instance:
-                    raise NotFoundError(f"User with id {assignee} is not a valid assignee")
+                return updated_task
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
 
-                membership = session.query(Project, Membership).filter(and_(Project.id==Membership.project_id, Project.id==project_id, Membership.user_id==assignee)).first()
-                if not membership:
-                    raise NotProjectMemberError(f"Assignee with id {user_id} is not a member of the project with id {project_id}")
+    def delete_task(self, task_id: str, project_id: str, user_id: str):
+        try:
+            with self.session() as session:
+                context = load_access_context(session, project_id=project_id, user_id=user_id, task_id=task_id)
+                context.require_project()
+                context.require_task()
+                context.require_member()
+                context.require_owner(f"User with id {user_id} is not a owner for the task with id {task_id}, Only project owner can delete tasks")
+
+                task = self.lock_task(session, task_id)
+                old_assignee, old_status = task.assignee, task.status
+                version = session.execute(bump_version_statement(project_id)).scalar_one()
+                session.delete(task)
+                session.add(TaskTombstone(project_id=project_id, task_id=task_id, version=version))
+                self.update_counters(session, project_id, task_removed(old_assignee, old_status))
+                session.commit()
+                publish_project_event(project_id, TASK_DELETED, {"id": task_id})
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
 
-                task.assignee = assignee
+    def bulk_tasks(self, operations: list, project_id: str, user_id: str):
+        try:
+            with self.session() as session:
+                context = load_access_context(session, project_id=project_id, user_id=user_id)
+                context.require_project()
+                context.require_member()
+
+                tasks_statement, members_statement = bulk_lookup_statements(operations, project_id=project_id)
+                tasks = {row.id: (row.assignee, row.status) for row in session.execute(tasks_statement)} if tasks_statement is not None else {}
+                member_ids = set(session.scalars(members_statement)) if members_statement is not None else set()
+
+                plan = plan_bulk_operations(operations, project_id=project_id, user_id=user_id, role=context.role, 
+                                            tasks=tasks, member_ids=member_ids)
+                if plan.inserts or plan.updates:
+                    version = session.execute(bump_version_statement(project_id)).scalar_one()
+                    for statement, rows in bulk_write_statements(plan, version=version):
+                        session.execute(statement, rows)
+                    self.update_counters(session, project_id, plan.deltas)
                 session.commit()
+                publish_bulk_event(project_id, plan.results)
 
-                return {
-                    "id": task.id, 
-                    "name": task.name, 
-                    "description": task.description, 
-                    "assignee": assignee_instance.id, 
-                    "assignee_name": assignee_instance.name, 
-                    "assignee_email": assignee_instance.email,
-                    "status": task.status.value, 
-                    "created_at": task.created_at.strftime("%Y-%m-%d %I:%M:%S %p"), 
-                    "project_id": project_id
-                }
-        except OperationalError as e:
-            print(str(e))
-            raise DBOverloadError()
\ No newline at end of file
+                return plan.results
+        except OperationalError:
+            logger.exception("Database is unavailable")
+            raise DBOverloadError()
+        except IntegrityError:
+            logger.exception("Database rejected the write")
+            raise DBIntegrityError()
\ No newline at end of file
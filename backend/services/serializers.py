@@ -0,0 +1,129 @@
+from datetime import date
+from models import Project, User, Membership, Task
+from models.membership import Role
+from models.project import TaskStatus
+from validation.response import UserDetails, ProjectListItem, CreatedProject, ProjectDetails, JoinedProject, MemberDetails, TaskListItem, CreatedTask, TaskDetails, TaskStatusChange, ProjectSummary, TaskChange
+
+DATETIME_FORMAT = "%Y-%m-%d %I:%M:%S %p"
+# kept as it was first released, clients of the project list already parse this format
+PROJECT_LIST_DATETIME_FORMAT = "%Y-%m-%d %I-%M-%S %p"
+
+def user_details(user: User) -> UserDetails:
+    return {
+        "id": user.id, 
+        "email": user.email, 
+        "name": user.name,
+    }
+
+def project_list_item(project: Project, role: Role) -> ProjectListItem:
+    return {
+        "id": project.id, 
+        "name": project.name, 
+        "description": project.description, 
+        "deadline": project.deadline, 
+        "code": project.code, 
+        "role": role.value, 
+        "created_at": project.created_at.strftime(PROJECT_LIST_DATETIME_FORMAT)
+    }
+
+def created_project(project: Project) -> CreatedProject:
+    return {
+        "id": project.id, 
+        "name": project.name, 
+        "description": project.description, 
+        "deadline": project.deadline, 
+        "code": project.code, 
+        "created_at": project.created_at.strftime(DATETIME_FORMAT)
+    }
+
+def project_details(project: Project, role: Role) -> ProjectDetails:
+    return {
+        "id": project.id, 
+        "name": project.name, 
+        "description": project.description, 
+        "deadline": project.deadline, 
+        "created_at": project.created_at.strftime(DATETIME_FORMAT), 
+        "code": project.code, 
+        "role": role.value, 
+    }
+
+def joined_project(project: Project) -> JoinedProject:
+    return {
+        "id": project.id, 
+        "name": project.name, 
+        "description": project.description
+    }
+
+def member_details(member: Membership, user: User) -> MemberDetails:
+    return {
+        "user_id": user.id, 
+        "name": user.name, 
+        "email": user.email, 
+        "role": member.role.value, 
+        "joined_at": member.created_at.strftime(DATETIME_FORMAT)
+    }
+
+def task_list_item(task: Task, assignee: User) -> TaskListItem:
+    return {
+        "id": task.id, 
+        "name": task.name, 
+        "description": task.description, 
+        "assignee": assignee.id, 
+        "assignee_email": assignee.email, 
+        "assignee_name": assignee.name, 
+        "status": task.status.value, 
+        "created_at": task.created_at.strftime(DATETIME_FORMAT), 
+    }
+
+def created_task(task: Task) -> CreatedTask:
+    return {
+        "id": task.id, 
+        "name": task.name, 
+        "description": task.description, 
+        "assignee": task.assignee, 
+        "status": task.status.value, 
+        "created_at": task.created_at.strftime(DATETIME_FORMAT), 
+        "project_id": task.project_id
+    }
+
+def task_details(task: Task, assignee: User) -> TaskDetails:
+    return {
+        "id": task.id, 
+        "name": task.name, 
+        "description": task.description, 
+        "assignee": assignee.id, 
+        "assignee_name": assignee.name, 
+        "assignee_email": assignee.email,
+        "status": task.status.value, 
+        "created_at": task.created_at.strftime(DATETIME_FORMAT), 
+        "project_id": task.project_id
+    }
+
+def task_status(task_id: str, status: TaskStatus) -> TaskStatusChange:
+    return {
+        "id": task_id, 
+        "status": status.value, 
+    }
+
+def project_summary(project: Project, counters, today: date) -> ProjectSummary:
+    status_counts = {status.value: 0 for status in TaskStatus}
+    open_tasks = {}
+    for assignee, assignee_name, status, count in counters:
+        status_counts[status.value] += count
+        if status != TaskStatus.Completed:
+            open_tasks.setdefault(assignee, {"assignee": assignee, "assignee_name": assignee_name, "open": 0})["open"] += count
+
+    return {
+        "project_id": project.id, 
+        "total": sum(status_counts.values()), 
+        "status_counts": status_counts, 
+        "open_by_assignee": sorted(open_tasks.values(), key=lambda item: (-item["open"], item["assignee"])), 
+        "deadline": project.deadline, 
+        "days_to_deadline": (project.deadline.date() - today).days, 
+    }
+
+def task_change(task: Task, assignee: User) -> TaskChange:
+    return {
+        **task_list_item(task, assignee), 
+        "updated_at": task.updated_at.strftime(DATETIME_FORMAT), 
+    }
@@ -0,0 +1,22 @@
+from sqlalchemy import select, update, and_
+
+from models import Project, Membership
+
+def version_statement(project_id: str, user_id: str):
+    """
+        The project's version and the caller's role in one primary key lookup, the project comes back as no row 
+        and a non member as a NULL role
+    """
+
+    return select(Project.version, Membership.role) \
+            .outerjoin(Membership, and_(Membership.project_id==Project.id, Membership.user_id==user_id)) \
+            .where(Project.id==project_id)
+
+def bump_version_statement(project_id: str):
+    """
+        Run in the transaction of every write that changes what project, task or member reads return, 
+        the row lock it takes also orders concurrent writes to the same project. Returns the new version, 
+        which the write stamps on the tasks it changes so the changes feed follows commit order
+    """
+
+    return update(Project).where(Project.id==project_id).values(version=Project.version + 1).returning(Project.version)
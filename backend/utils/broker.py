@@ -0,0 +1,256 @@
+import asyncio, json, logging, os, queue, select, threading, time
+
+logger = logging.getLogger(__name__)
+
+class MessageTooLargeError(ValueError):
+    """
+        Raised by a broker that can't carry a message of this size, the publisher should send a smaller one
+    """
+
+class Subscription:
+    """
+        Messages of one channel for one subscriber, at most `maxsize` are buffered. When a slow subscriber
+        falls behind the newest messages are dropped and `overflowed` is set so it can resync
+    """
+
+    def __init__(self, broker, channel: str, maxsize: int):
+        self.broker = broker
+        self.channel = channel
+        self.maxsize = maxsize
+        self.overflowed = False
+
+    def deliver(self, message: str):
+        raise NotImplementedError()
+
+    def overflow(self):
+        """
+            Sets the overflow flag for messages the subscriber missed without them being dropped here
+        """
+
+        self.overflowed = True
+
+    def reset(self):
+        """
+            Clears the overflow flag and drops what is buffered, called when the subscriber resyncs
+        """
+
+        self.overflowed = False
+        self._drain()
+
+    def _drain(self):
+        raise NotImplementedError()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+class QueueSubscription(Subscription):
+    def __init__(self, broker, channel: str, maxsize: int):
+        super().__init__(broker, channel, maxsize)
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def deliver(self, message: str):
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.overflowed = True
+
+    def _drain(self):
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def get(self, timeout: float):
+        """
+            Next message, None when nothing arrived within `timeout` seconds
+        """
+
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class AsyncQueueSubscription(Subscription):
+    """
+        Subscription read from an event loop, messages published from other threads are handed to the loop
+    """
+
+    def __init__(self, broker, channel: str, maxsize: int, loop: asyncio.AbstractEventLoop):
+        super().__init__(broker, channel, maxsize)
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=maxsize)
+
+    def _put(self, message: str):
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def deliver(self, message: str):
+        try:
+            self._loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # the loop is closed, the stream is gone and the subscription is about to be closed
+            pass
+
+    def overflow(self):
+        try:
+            self._loop.call_soon_threadsafe(super().overflow)
+        except RuntimeError:
+            pass
+
+    def _drain(self):
+        try:
+            while True:
+                self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+
+    async def get(self, timeout: float):
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class Broker:
+    """
+        Publish/subscribe interface between the request handlers that write and the streams that read.
+        Implementations decide how far a message travels, the local one stays inside the process
+    """
+
+    def publish(self, channel: str, message: str):
+        raise NotImplementedError()
+
+    def subscribe(self, channel: str, maxsize: int):
+        raise NotImplementedError()
+
+    def subscribe_async(self, channel: str, maxsize: int):
+        raise NotImplementedError()
+
+    def unsubscribe(self, subscription: Subscription):
+        raise NotImplementedError()
+
+class LocalBroker(Broker):
+    """
+        Fans messages out to the subscribers of this process only, enough for a single worker and for tests
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, message: str):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+
+    def _add(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.setdefault(subscription.channel, set()).add(subscription)
+        return subscription
+
+    def subscribe(self, channel: str, maxsize: int):
+        return self._add(QueueSubscription(self, channel, maxsize))
+
+    def subscribe_async(self, channel: str, maxsize: int):
+        return self._add(AsyncQueueSubscription(self, channel, maxsize, asyncio.get_running_loop()))
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+class PostgresBroker(LocalBroker):
+    """
+        Fans messages out to every worker connected to the database through LISTEN/NOTIFY on one
+        notification channel. Each process runs a listener thread that hands what it receives to
+        its local subscribers, so a message published by any worker reaches all of them
+    """
+
+    NOTIFY_CHANNEL = "collab_events"
+    # payloads of NOTIFY are limited to 8000 bytes
+    MAX_PAYLOAD = 7900
+    # how long the first subscribe of a process waits for the listener to run LISTEN
+    LISTEN_TIMEOUT = 5
+
+    def __init__(self, connect, engine):
+        super().__init__()
+        self._connect = connect
+        self._engine = engine
+        self._listener = None
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+        self._listening = threading.Event()
+        self._listening_deadline = 0
+
+    def publish(self, channel: str, message: str):
+        payload = json.dumps([channel, message], separators=(",", ":"))
+        if len(payload.encode('utf-8')) > self.MAX_PAYLOAD:
+            raise MessageTooLargeError(f"Message for channel {channel} is too large for NOTIFY")
+
+        with self._engine.connect() as connection:
+            connection.exec_driver_sql("SELECT pg_notify(%s, %s)", (self.NOTIFY_CHANNEL, payload))
+            connection.commit()
+
+    def _add(self, subscription: Subscription):
+        self._ensure_listener()
+        return super()._add(subscription)
+
+    def _ensure_listener(self):
+        # threads don't survive a fork, every worker starts its own listener on first subscribe
+        if self._listener_pid != os.getpid() or not self._listener.is_alive():
+            with self._listener_lock:
+                if self._listener_pid != os.getpid() or not self._listener.is_alive():
+                    self._listening = threading.Event()
+                    self._listening_deadline = time.monotonic() + self.LISTEN_TIMEOUT
+                    self._listener = threading.Thread(target=self._listen, args=(self._listening,), name="event-listener", daemon=True)
+                    self._listener_pid = os.getpid()
+                    self._listener.start()
+
+        # a NOTIFY sent before LISTEN ran is lost, so subscribers wait until the listener is ready instead
+        # of missing the events published right after they subscribed, at most LISTEN_TIMEOUT after it started
+        if not self._listening.is_set():
+            self._listening.wait(timeout=max(0, self._listening_deadline - time.monotonic()))
+
+    def _resync(self):
+        with self._lock:
+            subscriptions = [subscription for subscribers in self._subscribers.values() for subscription in subscribers]
+        for subscription in subscriptions:
+            subscription.overflow()
+
+    def _listen(self, listening: threading.Event):
+        while True:
+            connection = None
+            try:
+                connection = self._connect()
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.NOTIFY_CHANNEL}")
+
+                # after a reconnect the streams may have missed events sent while no one was listening
+                if listening.is_set():
+                    self._resync()
+                listening.set()
+
+                while True:
+                    if select.select([connection], [], [], 5) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        channel, message = json.loads(notify.payload)
+                        super().publish(channel, message)
+            except Exception:
+                logger.exception("Listening for notifications failed")
+                time.sleep(1)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
@@ -0,0 +1,88 @@
+import threading, time
+from collections import OrderedDict
+
+from utils.metrics import registry
+
+# name -> cache, published on the collab_cache_* gauges with a `cache` label
+_published = {}
+
+def publish_stats(name: str, cache):
+    """
+        Exposes the size and hit/miss counts of a cache on /metrics, publishing another cache under
+        the same name replaces it
+    """
+
+    _published[name] = cache
+
+def _stat(key: str):
+    def read():
+        return [((name,), cache.stats()[key]) for name, cache in list(_published.items())]
+    return read
+
+registry.gauge("collab_cache_entries", "Entries held by a cache", _stat("size"), labels=("cache",))
+registry.gauge("collab_cache_max_entries", "Entries a cache holds at most", _stat("maxsize"), labels=("cache",))
+registry.gauge("collab_cache_hits", "Lookups answered by a cache since the worker started", _stat("hits"), labels=("cache",))
+registry.gauge("collab_cache_misses", "Lookups a cache could not answer since the worker started", _stat("misses"), labels=("cache",))
+
+class LRUCache:
+    """
+        Thread safe least recently used cache where every entry also expires after a time to live (seconds)
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        if self.maxsize <= 0:
+            return
+        
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data), 
+                "maxsize": self.maxsize, 
+                "hits": self.hits, 
+                "misses": self.misses, 
+            }
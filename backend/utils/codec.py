@@ -0,0 +1,56 @@
+import decimal, json, uuid
+from datetime import date
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(o):
+    # dates keep the RFC 822 format Flask has always returned for them
+    if isinstance(o, date):
+        return http_date(o)
+
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+
+    # the raw body a payload failed to parse from is echoed back in validation errors
+    if isinstance(o, bytes):
+        return o.decode('utf-8', errors='replace')
+
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def encode(obj) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    def decode(data):
+        return orjson.loads(data)
+else:
+    def encode(obj) -> bytes:
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+    def decode(data):
+        return json.loads(data)
+
+class FastJSONProvider(JSONProvider):
+    """
+        JSON provider of the Flask and Quart apps, encodes with orjson when it is installed and falls back
+        to the standard library otherwise. Responses are built from the encoded bytes directly
+    """
+
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs):
+        return encode(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return decode(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(encode(obj), mimetype=self.mimetype)
@@ -0,0 +1,24 @@
+from datetime import date
+from typing import Optional
+
+from models.membership import Role
+
+# browsers may keep the response but must revalidate it, shared caches must not store it
+CACHE_CONTROL = "private, no-cache"
+
+def project_etag(version: int, role: Role, day: Optional[date] = None):
+    """
+        Strong ETag for a read of project data, the role is part of it as project details show it 
+        and `day` is for responses that also change with the date
+    """
+
+    etag = f"{version}-{role.value}"
+    if day:
+        etag = f"{etag}-{day.isoformat()}"
+    return etag
+
+def cache_headers(response, etag: str):
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    response.vary.add("Cookie")
+    return response
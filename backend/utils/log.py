@@ -0,0 +1,176 @@
+import atexit, contextvars, json, logging, os, queue, sys, threading, time, traceback
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from config import Env
+from utils.metrics import registry
+from utils.tracing import current_span
+
+dropped_total = registry.counter("collab_log_dropped_total", "Log records dropped because the log queue was full")
+suppressed_total = registry.counter("collab_log_suppressed_total", "Repeated log records suppressed as duplicates")
+
+# duplicate keys remembered at once, older ones are forgotten when there are more
+MAX_DUPLICATE_KEYS = 1000
+# attributes every LogRecord has, anything else was passed with `extra` and is written as a field
+RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+class RequestContext:
+    __slots__ = ("request_id", "user_id", "endpoint", "method", "path", "started")
+
+    def __init__(self, request_id: str, method: str, path: str):
+        self.request_id = request_id
+        self.user_id = None
+        self.endpoint = None
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+
+_request = contextvars.ContextVar("log_request", default=None)
+
+def current_request():
+    return _request.get()
+
+def bind_request(context: RequestContext):
+    return _request.set(context)
+
+def unbind_request(token):
+    _request.reset(token)
+
+class RequestFilter(logging.Filter):
+    """
+        Adds the request being served, its user, endpoint, latency so far and trace id to every record.
+        Runs on the thread that logs, where the request's context variables are set
+    """
+
+    def filter(self, record):
+        context = _request.get()
+        if context is not None:
+            record.request_id = context.request_id
+            record.user_id = context.user_id
+            record.endpoint = context.endpoint
+            if not hasattr(record, "latency_ms"):
+                record.latency_ms = round((time.perf_counter() - context.started) * 1000, 3)
+        span = current_span()
+        if span is not None:
+            record.trace_id = span.trace.trace_id
+        return True
+
+class DuplicateFilter(logging.Filter):
+    """
+        Lets the first of a run of identical warnings or errors through and drops the repeats for
+        `window` seconds, the next one let through carries how many were suppressed. Records are identical
+        when they come from the same logger and line with the same exception type, so a database outage
+        logs one OperationalError per call site instead of one per failing request. Records of the `exempt`
+        loggers are never suppressed, every failed request keeps its access record
+    """
+
+    def __init__(self, window: float, exempt=("access",)):
+        super().__init__()
+        self.window = window
+        self.exempt = frozenset(exempt)
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING or self.window <= 0 or record.name in self.exempt:
+            return True
+
+        exception = record.exc_info[0].__name__ if record.exc_info and record.exc_info[0] else None
+        key = (record.name, record.lineno, exception)
+        now = time.monotonic()
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and now - seen[0] < self.window:
+                seen[1] += 1
+                suppressed_total.inc()
+                return False
+
+            if len(self._seen) >= MAX_DUPLICATE_KEYS:
+                self._seen.clear()
+            self._seen[key] = [now, 0]
+
+        if seen is not None and seen[1]:
+            record.suppressed = seen[1]
+        return True
+
+class JSONFormatter(logging.Formatter):
+    """
+        One JSON object per record with the time, level, logger, message, request fields and exception
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info and record.exc_info[0]:
+            entry["exception"] = record.exc_info[0].__name__
+            entry["error"] = str(record.exc_info[1])
+            entry["traceback"] = "".join(traceback.format_exception(*record.exc_info))
+        return json.dumps(entry, default=str)
+
+class DroppingQueueHandler(QueueHandler):
+    """
+        Formats on the logging thread and hands the line to the writer thread, a full queue drops
+        the record instead of making the request wait
+    """
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            dropped_total.inc()
+
+class _Writer(logging.StreamHandler):
+    def format(self, record):
+        # already formatted by the queue handler
+        return record.msg
+
+_handler = None
+_listener = None
+_lock = threading.Lock()
+
+def _start_listener():
+    global _listener
+    _handler.queue = queue.Queue(maxsize=Env.LOG_QUEUE_SIZE)
+    _listener = QueueListener(_handler.queue, _Writer(sys.stderr))
+    _listener.start()
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+def _restart_after_fork():
+    # the writer thread doesn't survive a fork, records queued by the parent stay with the parent
+    if _handler is not None:
+        _start_listener()
+
+def setup_logging():
+    """
+        Sends every record of the process through a bounded queue to a background thread writing JSON lines
+        to stderr, so logging never blocks a request on I/O. Safe to call more than once
+    """
+
+    global _handler
+    with _lock:
+        if _handler is not None:
+            return
+
+        _handler = DroppingQueueHandler(queue.Queue())
+        _handler.addFilter(DuplicateFilter(Env.LOG_DUPLICATE_WINDOW))
+        _handler.addFilter(RequestFilter())
+        _handler.setFormatter(JSONFormatter())
+        _start_listener()
+
+        root = logging.getLogger()
+        root.handlers = [_handler]
+        root.setLevel(Env.LOG_LEVEL.upper())
+
+        atexit.register(_stop_listener)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_restart_after_fork)
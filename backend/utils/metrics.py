@@ -0,0 +1,178 @@
+import logging
+import threading
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+# shards of finished threads are folded together once this many are registered
+COMPACT_AT = 64
+
+def _merge(into: dict, shard: dict):
+    for key, value in list(shard.items()):
+        if isinstance(value, list):
+            current = into.get(key)
+            if current is None:
+                into[key] = list(value)
+            else:
+                for index, count in enumerate(value):
+                    current[index] += count
+        else:
+            into[key] = into.get(key, 0) + value
+
+def _escape(value: str):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names, values, extra: str = ""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, registry, name: str, help: str, labels=()):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+
+    def inc(self, *label_values, amount=1):
+        shard = self.registry.shard()
+        key = (self.name, label_values)
+        shard[key] = shard.get(key, 0) + amount
+
+    def render(self, values: dict):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(self.labels, label_values)} {_number(value)}")
+        return lines
+
+class Histogram:
+    def __init__(self, registry, name: str, help: str, buckets, labels=()):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.labels = tuple(labels)
+
+    def observe(self, value: float, *label_values):
+        shard = self.registry.shard()
+        key = (self.name, label_values)
+        counts = shard.get(key)
+        if counts is None:
+            # one count per bucket, one for +Inf, then the sum
+            counts = shard[key] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def render(self, values: dict):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, counts in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, label_values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, label_values)} {_number(counts[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, label_values)} {cumulative}")
+        return lines
+
+class Gauge:
+    """
+        Value read when the metrics are collected, `read` returns a number or a list of (label values, number)
+    """
+
+    def __init__(self, name: str, help: str, read, labels=()):
+        self.name = name
+        self.help = help
+        self.read = read
+        self.labels = tuple(labels)
+
+    def render(self, values: dict):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        try:
+            value = self.read()
+        except Exception:
+            logger.exception("Reading gauge %s failed", self.name)
+            return lines
+
+        samples = value if isinstance(value, list) else [((), value)]
+        for label_values, sample in samples:
+            lines.append(f"{self.name}{_labels(self.labels, label_values)} {_number(sample)}")
+        return lines
+
+class Registry:
+    """
+        Metrics of the process. Every thread updates a shard of its own without taking a lock,
+        the shards are only summed when the metrics are collected
+    """
+
+    def __init__(self):
+        self.metrics = []
+        self._local = threading.local()
+        self._shards = []
+        self._finished = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labels=()):
+        return self._register(Counter(self, name, help, labels))
+
+    def histogram(self, name: str, help: str, buckets, labels=()):
+        return self._register(Histogram(self, name, help, buckets, labels))
+
+    def gauge(self, name: str, help: str, read, labels=()):
+        return self._register(Gauge(name, help, read, labels))
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+                if len(self._shards) >= COMPACT_AT:
+                    self._compact()
+        return shard
+
+    def _compact(self):
+        # a finished thread won't write its shard again, fold it into the totals
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                _merge(self._finished, shard)
+        self._shards = alive
+
+    def collect(self):
+        with self._lock:
+            self._compact()
+            totals = {}
+            _merge(totals, self._finished)
+            for _, shard in self._shards:
+                _merge(totals, shard)
+
+        by_metric = {}
+        for (name, label_values), value in totals.items():
+            by_metric.setdefault(name, {})[label_values] = value
+        return by_metric
+
+    def render(self):
+        """
+            All the metrics in the Prometheus text exposition format
+        """
+
+        values = self.collect()
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render(values.get(metric.name, {})))
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
\ No newline at end of file
@@ -0,0 +1,82 @@
+import base64, json
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import tuple_
+
+from exceptions import BadPayloadError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def encode_cursor(created_at: datetime, id: str):
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('utf-8').rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode('utf-8')))
+        return datetime.fromisoformat(created_at), str(id)
+    except Exception:
+        raise BadPayloadError("'cursor' value is not a valid page cursor")
+
+def encode_change_cursor(version: int, id: str):
+    raw = json.dumps([version, id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('utf-8').rstrip("=")
+
+def decode_change_cursor(cursor: str):
+    """
+        (version, id) of the last change a client has seen, a missing cursor means nothing was seen yet
+    """
+
+    if not cursor:
+        return 0, ""
+    
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        version, id = json.loads(base64.urlsafe_b64decode(padded.encode('utf-8')))
+        return int(version), str(id)
+    except Exception:
+        raise BadPayloadError("'since' value is not a valid changes cursor")
+
+def parse_limit(limit: Optional[str]):
+    if limit is None or limit == "":
+        return DEFAULT_PAGE_SIZE
+    
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise BadPayloadError("'limit' must be an integer")
+    
+    if limit < 1:
+        raise BadPayloadError("'limit' must be greater than 0")
+    
+    return min(limit, MAX_PAGE_SIZE)
+
+def page_statement(statement, created_at_column, id_column, limit: int, cursor: Optional[str]):
+    """
+        Apply keyset pagination on (created_at, id) to a query or select statement, 
+        one extra row is fetched to know whether a next page exists
+    """
+
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        statement = statement.filter(tuple_(created_at_column, id_column) > tuple_(created_at, id))
+
+    return statement.order_by(created_at_column, id_column).limit(limit+1)
+
+def split_page(rows, key, limit: int):
+    """
+        Returns the rows of the page and the cursor of the next page (None on the last page), 
+        `key` maps a row to its (created_at, id)
+    """
+
+    if len(rows) <= limit:
+        return rows, None
+    
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
+
+def paginate(query, created_at_column, id_column, key, limit: int, cursor: Optional[str]):
+    rows = page_statement(query, created_at_column, id_column, limit, cursor).all()
+    return split_page(rows, key, limit)
@@ -0,0 +1,102 @@
+import asyncio, functools, os, bcrypt, threading, time, weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Env
+from exceptions.auth import HashingOverloadError
+from utils.metrics import registry
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(Env.BCRYPT_CONCURRENCY)
+# event loop -> asyncio.Semaphore admitting its bcrypt calls, a semaphore only works on the loop it was first used on
+_loop_slots = weakref.WeakKeyDictionary()
+
+bcrypt_seconds = registry.histogram("collab_bcrypt_seconds", "Time of a bcrypt call including the wait for a free slot",
+                                    (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5), labels=("operation",))
+bcrypt_rejected = registry.counter("collab_bcrypt_rejected_total", "bcrypt calls rejected because no slot freed up in time")
+
+def _get_executor():
+    # created on first use so a worker forked from a preloaded app gets its own threads
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=Env.BCRYPT_CONCURRENCY, thread_name_prefix="bcrypt")
+    return _executor
+
+def _run(fn, *args, queued_at: float = None):
+    """
+        Run a bcrypt call on the calling thread once one of the BCRYPT_CONCURRENCY slots is free, waits at most
+        BCRYPT_QUEUE_TIMEOUT seconds since `queued_at` (default now) for it. bcrypt releases the GIL, so the
+        slots alone bound how many hashes run at once
+    """
+
+    start = time.perf_counter() if queued_at is None else queued_at
+    remaining = Env.BCRYPT_QUEUE_TIMEOUT - (time.perf_counter() - start)
+    slots = _slots
+    if remaining < 0 or not slots.acquire(timeout=remaining):
+        bcrypt_rejected.inc()
+        raise HashingOverloadError()
+    
+    try:
+        return fn(*args)
+    finally:
+        slots.release()
+        bcrypt_seconds.observe(time.perf_counter() - start, fn.__name__)
+
+def _async_slots(loop):
+    slots = _loop_slots.get(loop)
+    if slots is None:
+        slots = _loop_slots[loop] = asyncio.Semaphore(Env.BCRYPT_CONCURRENCY)
+    return slots
+
+async def _run_async(fn, *args):
+    """
+        Waits on the event loop, at most BCRYPT_QUEUE_TIMEOUT seconds, for one of BCRYPT_CONCURRENCY slots before
+        handing the call to the bcrypt threads, so calls beyond the limit are rejected instead of queueing
+        in the executor where the timeout can't see them
+    """
+
+    loop = asyncio.get_running_loop()
+    queued_at = time.perf_counter()
+    slots = _async_slots(loop)
+    try:
+        await asyncio.wait_for(slots.acquire(), timeout=Env.BCRYPT_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        bcrypt_rejected.inc()
+        raise HashingOverloadError()
+
+    try:
+        return await loop.run_in_executor(_get_executor(), functools.partial(_run, fn, *args, queued_at=queued_at))
+    finally:
+        slots.release()
+
+def hash_password(password: str):
+    password_hash = _run(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=Env.BCRYPT_ROUNDS))
+    return password_hash.decode('utf-8')
+
+def check_password(password: str, password_hash: str):
+    return _run(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+async def hash_password_async(password: str):
+    password_hash = await _run_async(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=Env.BCRYPT_ROUNDS))
+    return password_hash.decode('utf-8')
+
+async def check_password_async(password: str, password_hash: str):
+    return await _run_async(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+def needs_rehash(password_hash: str):
+    # bcrypt hashes look like $2b$<cost>$<salt and hash>
+    try:
+        return int(password_hash.split("$")[2]) != Env.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+def _reset_after_fork():
+    global _executor, _slots, _loop_slots
+    _executor = None
+    _slots = threading.BoundedSemaphore(Env.BCRYPT_CONCURRENCY)
+    _loop_slots = weakref.WeakKeyDictionary()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
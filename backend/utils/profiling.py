@@ -0,0 +1,109 @@
+import cProfile, os, re, sys, threading
+from collections import Counter
+from datetime import datetime, timezone
+
+DETERMINISTIC = "deterministic"
+SAMPLING = "sampling"
+MODES = (DETERMINISTIC, SAMPLING)
+EXTENSIONS = {DETERMINISTIC: "pstats", SAMPLING: "collapsed"}
+PROFILE_NAME = re.compile(r"^[\w.-]+\.(pstats|collapsed)$")
+
+class SamplingProfiler:
+    """
+        Samples the stack of one thread every `interval` seconds from a background thread. The request
+        runs at full speed, only the sampler pays, and the counts are written as collapsed stacks
+        ('outer;inner count' lines) that flamegraph.pl and speedscope read
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._thread_id = None
+
+    def enable(self):
+        self._thread_id = threading.get_ident()
+        self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+        self._sampler.start()
+
+    def disable(self):
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def dump_stats(self, path: str):
+        with open(path, "w") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+def create_profiler(mode: str, interval: float):
+    if mode == SAMPLING:
+        return SamplingProfiler(interval)
+    return cProfile.Profile()
+
+def _slug(text: str):
+    return re.sub(r"[^\w]+", "_", text).strip("_")[:80] or "root"
+
+def profile_name(mode: str, method: str, path: str):
+    """
+        File name of the profile of a request started now, made of the time, worker, method and path
+        so the listing is readable without opening the files
+    """
+
+    started = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    return f"{started}-{os.getpid()}-{method}-{_slug(path)}.{EXTENSIONS[mode]}"
+
+def save_profile(profiler, directory: str, name: str):
+    os.makedirs(directory, exist_ok=True)
+    profiler.dump_stats(os.path.join(directory, name))
+
+def list_profiles(directory: str):
+    """
+        Captured profiles, newest first
+    """
+
+    if not os.path.isdir(directory):
+        return []
+
+    profiles = []
+    for name in os.listdir(directory):
+        if not PROFILE_NAME.match(name):
+            continue
+        stat = os.stat(os.path.join(directory, name))
+        profiles.append({
+            "name": name,
+            "format": name.rsplit(".", 1)[1],
+            "size": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat(timespec="seconds"),
+        })
+    profiles.sort(key=lambda profile: profile["name"], reverse=True)
+    return profiles
+
+def prune_profiles(directory: str, keep: int):
+    # names start with the capture time, the oldest sort first
+    for profile in list_profiles(directory)[keep:]:
+        try:
+            os.remove(os.path.join(directory, profile["name"]))
+        except FileNotFoundError:
+            pass
+
+def profile_path(directory: str, name: str):
+    """
+        Path of a captured profile, None when the name isn't one or the file doesn't exist
+    """
+
+    if not PROFILE_NAME.match(name):
+        return None
+    path = os.path.join(directory, name)
+    return path if os.path.isfile(path) else None
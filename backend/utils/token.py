@@ -1,29 +1,43 @@
+import logging
 import jwt
 from datetime import datetime, timedelta, timezone
 
 from config import Env
 from exceptions.auth import JWTError
 
+logger = logging.getLogger(__name__)
+
 TOKEN_NAME = "COLLAB_TOKEN"
-TOKEN_EXIRES = datetime.now(tz=timezone.utc)+timedelta(minutes=30)
+REFRESH_TOKEN_NAME = "COLLAB_REFRESH_TOKEN"
+
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+
+def token_expiry(token_type: str = ACCESS_TOKEN):
+    if token_type == REFRESH_TOKEN:
+        lifetime = timedelta(days=Env.REFRESH_TOKEN_DAYS)
+    else:
+        lifetime = timedelta(minutes=Env.ACCESS_TOKEN_MINUTES)
+
+    return datetime.now(tz=timezone.utc)+lifetime
 
-def generate_token(payload: dict):
+def generate_token(payload: dict, token_type: str = ACCESS_TOKEN, expires: datetime = None):
     try:
         token = jwt.encode(payload={
             **payload, 
-            "exp": TOKEN_EXIRES, 
+            "type": token_type, 
+            "exp": expires or token_expiry(token_type), 
             }, key=Env.SECRET_KEY, algorithm="HS256")
         return token
     except jwt.exceptions.InvalidKeyError:
         raise JWTError("Provided key for JWT encoding is invalid")
-    except Exception as e:
-        print(e)
+    except Exception:
+        logger.exception("Encoding JWT failed")
         raise JWTError("Something went wrong while encoding JWT")
 
-def validate_token(token: str):
+def validate_token(token: str, token_type: str = ACCESS_TOKEN):
     try:
         payload = jwt.decode(jwt=token, key=Env.SECRET_KEY, algorithms="HS256")
-        return payload
     except jwt.exceptions.ExpiredSignatureError:
         raise JWTError("JWT token signature has expired")
     except jwt.exceptions.InvalidSignatureError:
@@ -32,6 +46,12 @@ def validate_token(token: str):
         raise JWTError("JWT token is invalid") 
     except jwt.exceptions.InvalidKeyError:
         raise JWTError("JWT token decoding key is invalid") 
-    except Exception as e:
-        print(e)
-        raise JWTError("Something went wrong while decoding JWT") 
\ No newline at end of file
+    except Exception:
+        logger.exception("Decoding JWT failed")
+        raise JWTError("Something went wrong while decoding JWT") 
+    
+    # tokens issued before refresh tokens existed carry no type and are access tokens
+    if payload.get("type", ACCESS_TOKEN) != token_type:
+        raise JWTError(f"JWT token can't be used as {token_type} token")
+    
+    return payload
@@ -0,0 +1,242 @@
+import contextlib, contextvars, functools, inspect, json, logging, os, queue, random, re, threading, time, urllib.request
+
+from config import Env
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+# statements are cut to this many characters in the exported spans
+MAX_STATEMENT = 2000
+# spans kept per trace, a request looping over thousands of statements would otherwise build a huge trace
+MAX_SPANS = 1000
+
+class Trace:
+    """
+        Spans of one sampled request, exported together once the root span ends
+    """
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.root_id = None
+        self.spans = []
+        self.dropped = 0
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "tags", "timestamp", "_started", "duration")
+
+    def __init__(self, trace: Trace, name: str, parent_id: str = None, kind: str = None, tags: dict = None):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.tags = tags or {}
+        self.timestamp = time.time_ns() // 1000
+        self._started = time.perf_counter()
+        self.duration = None
+
+    def tag(self, key: str, value):
+        self.tags[key] = str(value)
+
+    def finish(self):
+        self.duration = max(int((time.perf_counter() - self._started) * 1_000_000), 1)
+        if self.span_id == self.trace.root_id:
+            if self.trace.dropped:
+                self.tag("dropped_spans", self.trace.dropped)
+        elif len(self.trace.spans) >= MAX_SPANS:
+            self.trace.dropped += 1
+            return
+        self.trace.spans.append(self)
+
+    def child(self, name: str, kind: str = None, tags: dict = None):
+        return Span(self.trace, name, parent_id=self.span_id, kind=kind, tags=tags)
+
+    def traceparent(self):
+        return f"00-{self.trace.trace_id}-{self.span_id}-01"
+
+    def zipkin(self):
+        span = {
+            "traceId": self.trace.trace_id,
+            "id": self.span_id,
+            "name": self.name,
+            "timestamp": self.timestamp,
+            "duration": self.duration,
+            "localEndpoint": {"serviceName": Env.TRACING_SERVICE_NAME},
+            "tags": self.tags,
+        }
+        if self.parent_id:
+            span["parentId"] = self.parent_id
+        if self.kind:
+            span["kind"] = self.kind
+        return span
+
+_current = contextvars.ContextVar("current_span", default=None)
+
+def current_span():
+    return _current.get()
+
+def start_trace(name: str, traceparent: str = None, kind: str = "SERVER"):
+    """
+        Root span of a request, None when the request isn't sampled. A valid incoming `traceparent`
+        continues the caller's trace and follows its sampling decision, otherwise TRACING_SAMPLE_RATE decides
+    """
+
+    match = TRACEPARENT.match(traceparent or "")
+    if match:
+        trace_id, parent_id, flags = match.groups()
+        if not int(flags, 16) & 1:
+            return None
+        root = Span(Trace(trace_id), name, parent_id=parent_id, kind=kind)
+    elif Env.TRACING_SAMPLE_RATE <= 0 or random.random() >= Env.TRACING_SAMPLE_RATE:
+        return None
+    else:
+        root = Span(Trace(os.urandom(16).hex()), name, kind=kind)
+
+    root.trace.root_id = root.span_id
+    return root
+
+def activate(span: Span):
+    return _current.set(span)
+
+def deactivate(token):
+    _current.reset(token)
+
+@contextlib.contextmanager
+def span(name: str, **tags):
+    """
+        Child span of the current one for the duration of a with block, yields None and does nothing
+        when the request isn't sampled
+    """
+
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+
+    child = parent.child(name, tags={key: str(value) for key, value in tags.items()})
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.tag("error", type(e).__name__)
+        raise
+    finally:
+        _current.reset(token)
+        child.finish()
+
+def traced(name: str):
+    """
+        Decorator running a function, or a coroutine function, inside a span called `name`
+    """
+
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def traced_methods(cls):
+    """
+        Class decorator giving every public method of a service a span named '<class>.<method>'
+    """
+
+    for name, member in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.isfunction(member):
+            setattr(cls, name, traced(f"{cls.__name__}.{name}")(member))
+    return cls
+
+class Exporter:
+    """
+        Sends finished traces from a background thread so requests never wait on the exporter.
+        Traces are dropped when TRACING_QUEUE_SIZE of them are already waiting
+    """
+
+    def __init__(self):
+        self._queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def export(self, trace: Trace):
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait([span.zipkin() for span in trace.spans])
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_worker(self):
+        # threads don't survive a fork, every worker starts its own on first export
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=Env.TRACING_QUEUE_SIZE)
+            threading.Thread(target=self._work, name="trace-exporter", daemon=True).start()
+            self._pid = os.getpid()
+
+    def _work(self):
+        while True:
+            spans = self._queue.get()
+            try:
+                self.send(spans)
+            except Exception:
+                logger.exception("Exporting a trace failed")
+
+    def send(self, spans: list):
+        raise NotImplementedError()
+
+class FileExporter(Exporter):
+    """
+        Appends every trace to a file as one line holding a Zipkin v2 JSON span list
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+
+    def send(self, spans: list):
+        with open(self.path, "a") as file:
+            file.write(json.dumps(spans, separators=(",", ":")) + "\n")
+
+class ZipkinExporter(Exporter):
+    """
+        Posts every trace to a Zipkin compatible collector, e.g. http://localhost:9411/api/v2/spans
+    """
+
+    def __init__(self, endpoint: str):
+        super().__init__()
+        self.endpoint = endpoint
+
+    def send(self, spans: list):
+        request = urllib.request.Request(self.endpoint, data=json.dumps(spans).encode('utf-8'),
+                                         headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=5):
+            pass
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+def get_exporter():
+    """
+        Exporter selected by TRACING_EXPORTER, 'file' writes TRACING_FILE and 'zipkin' posts to TRACING_ENDPOINT
+    """
+
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                if Env.TRACING_EXPORTER == "zipkin":
+                    _exporter = ZipkinExporter(Env.TRACING_ENDPOINT)
+                else:
+                    _exporter = FileExporter(Env.TRACING_FILE)
+    return _exporter
\ No newline at end of file
@@ -1,34 +1,54 @@
 from datetime import datetime
+from typing import List, Literal, Optional
 from pydantic import BaseModel
 
 from models.project import TaskStatus
+from utils.tracing import span
 
-class UserCreatePayload(BaseModel):
+class Payload(BaseModel):
+    @classmethod
+    def model_validate_json(cls, json_data, **kwargs):
+        # request bodies are decoded and validated in one step, traced as one span
+        with span(f"validate {cls.__name__}"):
+            return super().model_validate_json(json_data, **kwargs)
+
+class UserCreatePayload(Payload):
     username: str
     email: str
     password: str
 
-class UserLoginPayload(BaseModel):
+class UserLoginPayload(Payload):
     email: str
     password: str
 
-class CreateProjectPayload(BaseModel):
+class CreateProjectPayload(Payload):
     name: str
     description: str = ""
     deadline: datetime
 
-class CreateTaskPayload(BaseModel):
+class CreateTaskPayload(Payload):
     name: str
     description: str = ""
     assignee: str
     status: TaskStatus
 
-class EditTaskPayload(BaseModel):
+class EditTaskPayload(Payload):
     name: str = ""
     description: str = ""
 
-class ChangeStatusPayload(BaseModel):
+class ChangeStatusPayload(Payload):
     status: TaskStatus
 
-class ChangeAssigneePayload(BaseModel):
-    assignee: str
\ No newline at end of file
+class ChangeAssigneePayload(Payload):
+    assignee: str
+
+class BulkTaskOperation(Payload):
+    op: Literal["create", "edit", "status", "assign"]
+    task_id: str = ""
+    name: str = ""
+    description: str = ""
+    assignee: str = ""
+    status: Optional[TaskStatus] = None
+
+class BulkTasksPayload(Payload):
+    operations: List[BulkTaskOperation]
\ No newline at end of file
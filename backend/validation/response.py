@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import Dict, List, TypedDict
+
+class UserDetails(TypedDict):
+    id: str
+    email: str
+    name: str
+
+class ProjectListItem(TypedDict):
+    id: str
+    name: str
+    description: str
+    deadline: datetime
+    code: str
+    role: str
+    created_at: str
+
+class CreatedProject(TypedDict):
+    id: str
+    name: str
+    description: str
+    deadline: datetime
+    code: str
+    created_at: str
+
+class ProjectDetails(TypedDict):
+    id: str
+    name: str
+    description: str
+    deadline: datetime
+    created_at: str
+    code: str
+    role: str
+
+class JoinedProject(TypedDict):
+    id: str
+    name: str
+    description: str
+
+class MemberDetails(TypedDict):
+    user_id: str
+    name: str
+    email: str
+    role: str
+    joined_at: str
+
+class TaskListItem(TypedDict):
+    id: str
+    name: str
+    description: str
+    assignee: str
+    assignee_email: str
+    assignee_name: str
+    status: str
+    created_at: str
+
+class CreatedTask(TypedDict):
+    id: str
+    name: str
+    description: str
+    assignee: str
+    status: str
+    created_at: str
+    project_id: str
+
+class TaskDetails(TypedDict):
+    id: str
+    name: str
+    description: str
+    assignee: str
+    assignee_name: str
+    assignee_email: str
+    status: str
+    created_at: str
+    project_id: str
+
+class TaskStatusChange(TypedDict):
+    id: str
+    status: str
+
+class OpenTasks(TypedDict):
+    assignee: str
+    assignee_name: str
+    open: int
+
+class ProjectSummary(TypedDict):
+    project_id: str
+    total: int
+    status_counts: Dict[str, int]
+    open_by_assignee: List[OpenTasks]
+    deadline: datetime
+    days_to_deadline: int
+
+class TaskChange(TaskListItem):
+    updated_at: str
\ No newline at end of file